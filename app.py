@@ -1,39 +1,43 @@
+import os
+import time
 import streamlit as st
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime
-import plotly.express as px
-import requests
 
+from my_project import assets, metrics
+from my_project.cache import inventory_cache
+from my_project import recipe_index
 from my_project.db.database import (
     initialize_db,
     insert_food_item,
-    get_all_food_items,
     delete_food_item,
     check_user_credentials,
-    add_user
+    add_user,
+    count_food_items_by_status,
+    get_expiry_histogram,
+    get_food_items_page,
+    count_food_items,
+    search_food_items,
+    get_notifications,
+    mark_notifications_read,
+    NOTIFY_EXPIRED,
+    get_waste_trend,
+    REASON_CONSUMED,
+    REASON_WASTED,
+)
+# The logic lives in my_project.inventory; names re-exported for older imports
+from my_project.inventory import (  # noqa: F401
+    calculate_statistics,
+    check_status,
+    compute_status,
+    grouped_statistics,
+    load_inventory,
+    load_typed_inventory,
+    sql_statistics,
 )
 
-# ------------------- LOGIC FUNCTIONS -------------------
-def calculate_statistics(df):
-    total_items = len(df)
-    expired_items = len(df[df["Status"] == "❌ Expired"])
-    ok_items = len(df[df["Status"].isin(["✅ OK", "⚠️ Expiring Soon"])])
-    if "price_per_unit" in df.columns:
-        lost_value = (df[df["Status"] == "❌ Expired"]["quantity"] * df[df["Status"] == "❌ Expired"]["price_per_unit"]).sum()
-    else:
-        lost_value = expired_items * 2.5  # fallback
-    return total_items, expired_items, ok_items, lost_value
-
-
-def check_status(exp_date_str):
-    today = datetime.today().date()
-    exp = datetime.strptime(exp_date_str, "%Y-%m-%d").date()
-    if exp < today:
-        return "❌ Expired"
-    elif (exp - today).days <= 3:
-        return "⚠️ Expiring Soon"
-    else:
-        return "✅ OK"
+RERUN_START = time.perf_counter()
 
 # ------------------- INITIALIZE DB -------------------
 initialize_db()
@@ -47,23 +51,11 @@ if "user" not in st.session_state:
 
 # ------------------- LOGIN / SIGNUP -------------------
 if not st.session_state.user:
-    st.markdown("""
-        <style>
-        .stApp {
-            background-image: url("https://i.pinimg.com/1200x/e0/28/8d/e0288dc89489bea01db65c12a176e8a8.jpg");
-            background-size: cover;
-            background-position: center;
-        }
-        div[data-testid="stVerticalBlock"]:has(#login-marker) {
-            background-color: rgba(255, 255, 255, 0.92);
-            padding: 40px;
-            border-radius: 16px;
-            box-shadow: 0 8px 20px rgba(0,0,0,0.30);
-            max-width: 520px;
-            margin: 60px auto;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(assets.page_style(), unsafe_allow_html=True)
+    # Served by Streamlit's media endpoint like the banner, so the browser caches it
+    if assets.background():
+        with st.container(key="login_background"):
+            st.image(assets.background(), use_container_width=True)
 
     with st.container():
         st.markdown('<span id="login-marker"></span>', unsafe_allow_html=True)
@@ -96,70 +88,13 @@ if not st.session_state.user:
     st.stop()
 
 # ------------------- GLOBAL CSS -------------------
-st.markdown("""
-<style>
-[data-testid="stAppViewBlockContainer"], [data-testid="block-container"] {
-    padding: 0 !important;
-    max-width: 100% !important;
-}
-html, body, [data-testid="stAppViewContainer"] { overflow-x: hidden; }
-
-.full-bleed {
-    position: relative;
-    left: 50%;
-    right: 50%;
-    margin-left: -50vw;
-    margin-right: -50vw;
-    width: 100vw;
-}
-
-#banner img {
-    width: 100%;
-    height: 300px;
-    object-fit: cover;
-    border-radius: 0 !important;
-}
-
-.st-emotion-cache-1ldf560 > div:first-child,
-[data-testid="stSidebar"] > div:first-child {
-    background-color: #f6e3c3;
-}
-
-.ok-box, .soon-box, .expired-box {
-    border: 1px solid;
-    border-radius: 5px;
-    padding: 10px;
-    margin-bottom: 5px;
-}
-.ok-box { border-color: #2e6c46; background-color: rgba(46,108,70,0.2); }
-.soon-box { border-color: #ad8600; background-color: rgba(173,134,0,0.2); }
-.expired-box { border-color: #a60000; background-color: rgba(166,0,0,0.2); }
-
-.status-badge { padding: 2px 6px; border-radius: 5px; font-weight: bold; text-align: center; color: #fff; }
-.status-badge.ok { background-color: #2e6c46; }
-.status-badge.soon { background-color: #ad8600; }
-.status-badge.expired { background-color: #a60000; }
-
-.stats-box {
-    border: 2px solid #fffce4;
-    background-color: #fffce4;
-    border-radius: 5px;
-    padding: 15px;
-    margin-top: 15px;
-}
-html[data-theme="dark"] .stats-box {
-    border: 2px solid #faca2b;
-    background-color: #faca2b;
-}
-</style>
-""", unsafe_allow_html=True)
+st.markdown(assets.page_style(), unsafe_allow_html=True)
 
 # ------------------- BANNER -------------------
-st.markdown("""
-<div id="banner" class="full-bleed">
-    <img src="https://i.pinimg.com/1200x/e0/28/8d/e0288dc89489bea01db65c12a176e8a8.jpg" alt="Food banner"/>
-</div>
-""", unsafe_allow_html=True)
+# Optimized local copy of banner_wasted.jpg, served by Streamlit's media endpoint
+if assets.banner():
+    with st.container(key="banner"):
+        st.image(assets.banner(), use_container_width=True)
 
 # ------------------- HEADER & LOGOUT -------------------
 c1, c2 = st.columns([7,1])
@@ -200,147 +135,269 @@ with st.sidebar.form("add_food"):
             insert_food_item(st.session_state.user, name, category, purchase_date, expiration_date, quantity, unit, price_per_unit)
             success_popup(name)
 
-# ------------------- SIDEBAR: FILTERS -------------------
-with st.sidebar:
-    st.header("🔍 Filter Items")
-    status_options = ["✅ OK", "⚠️ Expiring Soon", "❌ Expired"]
-    selected_status = st.multiselect("Select one or more statuses", options=status_options, default=[])
-
-# ------------------- DISPLAY FOOD ITEMS -------------------
-st.subheader("📋 Food List")
-items = get_all_food_items(st.session_state.user)
-
-if not items:
-    st.info("No items yet. Use the sidebar to add some!")
-    df = pd.DataFrame(columns=["ID","User","Name","Category","Purchase Date",
-                               "Expiration Date","Quantity","Unit","Price per Unit","Status"])
-else:
-    # Include price_per_unit column from DB
-    df = pd.DataFrame(
-        items,
-        columns=["ID","User","Name","Category","Purchase Date","Expiration Date",
-                 "Quantity","Unit","Price per Unit"]
-    )
-    # Add status column
-    df["Status"] = df["Expiration Date"].apply(check_status)
-
-# Filter by selected status
-filtered_df = df.copy()
-if selected_status:
-    filtered_df = filtered_df[filtered_df["Status"].isin(selected_status)]
-
-if not filtered_df.empty:
-    st.dataframe(
-        filtered_df[["Name","Category","Purchase Date","Expiration Date","Quantity","Unit","Price per Unit","Status"]],
-        hide_index=True
-    )
-
-# Filter items expiring soon (for recipes)
-expiring_soon = df[df["Status"] == "⚠️ Expiring Soon"]
-
+# ------------------- SIDEBAR: NOTIFICATIONS -------------------
+# Written once a day by the expiry scanner (`python -m my_project scan`)
+notifications = get_notifications(st.session_state.user)
+if notifications:
+    with st.sidebar.expander(f"🔔 Notifications ({len(notifications)})"):
+        for _, _, item_name, kind, item_exp, _, _ in notifications:
+            if kind == NOTIFY_EXPIRED:
+                st.markdown(f"❌ **{item_name}** expired on {item_exp}")
+            else:
+                st.markdown(f"⚠️ **{item_name}** expires on {item_exp}")
+        if st.button("Mark all as read", key="notifications_read"):
+            mark_notifications_read(st.session_state.user)
+            st.rerun()
+
+# ------------------- SECTION TIMING -------------------
+# Add ?debug=timing to the URL (or set WASTED_DEBUG_TIMING=1) to see how long
+# each section took on its last run. Sections are fragments, so a widget
+# inside one reruns only that section. Timings also go to the metrics
+# histograms (WASTED_METRICS=1), and slow sections are profiled when
+# WASTED_PROFILE_DIR is set.
+SHOW_TIMINGS = st.query_params.get("debug") == "timing" or bool(os.environ.get("WASTED_DEBUG_TIMING"))
+
+@contextmanager
+def timed_section(name):
+    start = time.perf_counter()
+    with metrics.profiled(name):
+        yield
+    elapsed = time.perf_counter() - start
+    metrics.observe("app_section_seconds", elapsed, section=name)
+    st.session_state.setdefault("section_timings", {})[name] = elapsed
+    if SHOW_TIMINGS:
+        st.caption(f"⏱️ {name}: {elapsed * 1000:.1f} ms")
+
+# ------------------- DELETE CONFIRMATION -------------------
+REMOVAL_REASONS = {"🍽️ Eaten / used": REASON_CONSUMED, "🗑️ Thrown away": REASON_WASTED}
 
-    # ------------------- DELETE CONFIRMATION -------------------
 @st.dialog("Confirm Deletion")
-def confirm_delete(item_id, name):
+def confirm_delete(item_id, name, status):
     st.warning(f"Are you sure you want to delete '{name}'?")
+    reason = st.radio("What happened to it?", list(REMOVAL_REASONS),
+                      index=1 if status == "❌ Expired" else 0, horizontal=True)
     c1, c2 = st.columns(2)
     if c1.button("✅ Yes, delete"):
-        delete_food_item(item_id, st.session_state.user)
+        delete_food_item(item_id, st.session_state.user, reason=REMOVAL_REASONS[reason])
         st.success(f"'{name}' has been deleted!")
-        st.rerun()
+        st.rerun()  # full rerun: the statistics changed too
     if c2.button("❌ Cancel"):
         st.rerun()
 
-    # ------------------- DELETE ITEMS -------------------
-st.subheader("🗑️ Delete Items in the Fridge")
-col1, col2 = st.columns(2)
-for idx, row in filtered_df.iterrows():
-    status_class = "ok" if "✅ OK" in row["Status"] else "soon" if "⚠️ Expiring Soon" in row["Status"] else "expired"
-    box_class = f"{status_class}-box"
-    target_col = col1 if idx % 2 == 0 else col2
-    with target_col:
-        st.markdown(f"""
-        <div class="{box_class}">
-            <div style="display:flex; justify-content: space-between; align-items: center;">
-                <span style="font-weight:bold;">{row['Name']}</span>
-                <div class="status-badge {status_class}">{row['Status'].split(' ')[1]}</div>
-            </div>
-            <br>
-            <strong>Category:</strong> {row['Category']}<br>
-            <strong>Expiration Date:</strong> {row['Expiration Date']}<br>
-            <strong>Quantity:</strong> {row['Quantity']} {row['Unit']}
-        </div>
-        """, unsafe_allow_html=True)
-        if st.button("🗑️ Delete", key=f"del_{row['ID']}"):
-            confirm_delete(row["ID"], row["Name"])
+# ------------------- FOOD LIST & DELETE ITEMS -------------------
+CARDS_PER_PAGE = 20
+STATUS_OPTIONS = ["✅ OK", "⚠️ Expiring Soon", "❌ Expired"]
+TABLE_COLUMNS = ["Name", "Category", "Purchase Date", "Expiration Date", "Quantity", "Unit", "Price per Unit", "Status"]
+
+@st.fragment
+def food_list_section(user):
+    with timed_section("food list"):
+        st.subheader("📋 Food List")
+        # The filter lives inside the fragment so changing it reruns only this section
+        selected_status = st.multiselect("🔍 Filter by status", options=STATUS_OPTIONS, default=[])
+
+        search = st.text_input("Search by name", key="card_search", placeholder="e.g. milk")
+
+        # Keyset pagination: remember the last id of every page we walked through,
+        # and start over whenever the search or the status filter changes. The
+        # table and the cards show the same page, so a rerun costs the same
+        # however many items the fridge holds.
+        card_filters = (search.strip(), tuple(selected_status))
+        if st.session_state.get("card_filters") != card_filters:
+            st.session_state.card_filters = card_filters
+            st.session_state.card_cursors = [None]
+        cursors = st.session_state.card_cursors
+
+        page = get_food_items_page(user, limit=CARDS_PER_PAGE + 1, after_id=cursors[-1],
+                                   search=search, statuses=selected_status)
+        while not page and len(cursors) > 1:
+            # The last items of this page were deleted: step back
+            cursors.pop()
+            page = get_food_items_page(user, limit=CARDS_PER_PAGE + 1, after_id=cursors[-1],
+                                       search=search, statuses=selected_status)
+        has_next = len(page) > CARDS_PER_PAGE
+        page = page[:CARDS_PER_PAGE]
+        total_cards = count_food_items(user, search=search, statuses=selected_status) if page else 0
+        if search.strip() and not page:
+            # Nothing contains the search: show the closest names instead (typos, e.g. "yoghurt")
+            page = [row for row in search_food_items(user, search, limit=CARDS_PER_PAGE)
+                    if not selected_status or row[-1] in selected_status]
+            if page:
+                st.caption("No item name contains this search. Closest matches:")
+
+        if not page and not search.strip() and not selected_status:
+            st.info("No items yet. Use the sidebar to add some!")
+
+        if page:
+            table = pd.DataFrame([row[2:] for row in page], columns=TABLE_COLUMNS)
+            for column in ("Purchase Date", "Expiration Date"):
+                table[column] = pd.to_datetime(table[column], errors="coerce")
+            st.dataframe(
+                table,
+                hide_index=True,
+                column_config={
+                    "Purchase Date": st.column_config.DateColumn(format="YYYY-MM-DD"),
+                    "Expiration Date": st.column_config.DateColumn(format="YYYY-MM-DD"),
+                }
+            )
+
+        st.subheader("🗑️ Delete Items in the Fridge")
+        col1, col2 = st.columns(2)
+        for idx, (item_id, _, item_name, item_category, _, item_exp, item_qty, item_unit, _, item_status) in enumerate(page):
+            status_class = "ok" if "✅ OK" in item_status else "soon" if "⚠️ Expiring Soon" in item_status else "expired"
+            box_class = f"{status_class}-box"
+            target_col = col1 if idx % 2 == 0 else col2
+            with target_col:
+                st.markdown(f"""
+                <div class="{box_class}">
+                    <div style="display:flex; justify-content: space-between; align-items: center;">
+                        <span style="font-weight:bold;">{item_name}</span>
+                        <div class="status-badge {status_class}">{item_status.split(' ')[1]}</div>
+                    </div>
+                    <br>
+                    <strong>Category:</strong> {item_category}<br>
+                    <strong>Expiration Date:</strong> {item_exp}<br>
+                    <strong>Quantity:</strong> {item_qty} {item_unit}
+                </div>
+                """, unsafe_allow_html=True)
+                if st.button("🗑️ Delete", key=f"del_{item_id}"):
+                    confirm_delete(item_id, item_name, item_status)
+
+        if total_cards > CARDS_PER_PAGE:
+            p1, p2, p3 = st.columns([1, 2, 1])
+            # Callbacks move the cursor before the (fragment-only) rerun
+            p1.button("⬅️ Previous", disabled=len(cursors) == 1, key="cards_prev", on_click=cursors.pop)
+            p2.markdown(f"<div style='text-align:center;'>Page {len(cursors)} of {-(-total_cards // CARDS_PER_PAGE)}</div>",
+                        unsafe_allow_html=True)
+            p3.button("Next ➡️", disabled=not has_next, key="cards_next",
+                      on_click=cursors.append, args=(page[-1][0],))
+        elif search and not page:
+            st.info("No items match your search.")
+
+food_list_section(st.session_state.user)
 
 # ------------------- MEAL INSPIRATION -------------------
-st.markdown("<hr>", unsafe_allow_html=True)
-st.subheader("🍽️ Meal Inspiration")
-expiring_soon = df[df["Status"] == "⚠️ Expiring Soon"]
-
-if st.button("What Can I Cook Today?"):
-    ingredients = expiring_soon["Name"].tolist()
-    if ingredients:
-        st.info("Searching recipes for: " + ", ".join(ingredients))
-        spoonacular_key = "f05378d894eb4eb8b187551e2a492c49"
-        query_ingredients = ",".join(ingredients)
-        url = f"https://api.spoonacular.com/recipes/findByIngredients?ingredients={query_ingredients}&number=1&ranking=1&apiKey={spoonacular_key}"
-
-        with st.spinner("Finding recipe..."):
-            try:
-                response = requests.get(url)
-                recipes = response.json()
-                if recipes:
-                    recipe = recipes[0]
-                    st.markdown(f"### 👨‍🍳 {recipe['title']}")
-                    if recipe.get("image"):
-                        st.image(recipe["image"], width=400)
-
-                    steps_url = f"https://api.spoonacular.com/recipes/{recipe['id']}/analyzedInstructions?apiKey={spoonacular_key}"
-                    steps_resp = requests.get(steps_url).json()
-                    if steps_resp and steps_resp[0].get("steps"):
-                        st.markdown("*Steps:*")
-                        for step in steps_resp[0]["steps"]:
-                            st.markdown(f"*{step['number']}.* {step['step']}")
-                    else:
-                        st.info("No detailed instructions available.")
-                else:
-                    st.warning("No recipes found with those ingredients.")
-            except Exception as e:
-                st.error(f"Error fetching recipe: {e}")
-    else:
-        st.success("No items are expiring soon — nothing urgent to cook!")
+@st.fragment
+def meal_inspiration_section(user):
+    with timed_section("meal inspiration"):
+        st.markdown("<hr>", unsafe_allow_html=True)
+        st.subheader("🍽️ Meal Inspiration")
+
+        if st.button("What Can I Cook Today?"):
+            df = inventory_cache.get(user, load_typed_inventory)
+            expiring = df["Status"] == "⚠️ Expiring Soon"
+            ingredients = df.loc[expiring, "Name"].tolist()
+            if ingredients:
+                st.info("Searching recipes for: " + ", ".join(ingredients))
+
+                with st.spinner("Finding recipe..."):
+                    try:
+                        others = df.loc[~expiring & (df["Status"] != "❌ Expired"), "Name"].tolist()
+                        recipes = recipe_index.suggest(ingredients, others)
+                        if recipes:
+                            recipe = recipes[0]
+                            st.markdown(f"### 👨‍🍳 {recipe['title']}")
+                            if recipe.get("image"):
+                                st.image(recipe["image"], width=400)
+                            if recipe.get("usedIngredients"):
+                                st.markdown("*You have:* " + ", ".join(recipe["usedIngredients"]))
+                            if recipe.get("missedIngredients"):
+                                st.markdown("*You need:* " + ", ".join(recipe["missedIngredients"]))
+
+                            if recipe["steps"]:
+                                st.markdown("*Steps:*")
+                                for step in recipe["steps"]:
+                                    st.markdown(f"*{step['number']}.* {step['step']}")
+                            else:
+                                st.info("No detailed instructions available.")
+                        else:
+                            st.warning("No recipes found with those ingredients.")
+                    except Exception as e:
+                        st.error(f"Error fetching recipe: {e}")
+            else:
+                st.success("No items are expiring soon — nothing urgent to cook!")
+
+meal_inspiration_section(st.session_state.user)
 
 # ------------------- ANALYSIS -------------------
-st.markdown("<hr>", unsafe_allow_html=True)
-st.subheader("📈 General Analysis")
-c1, c2 = st.columns(2)
-
-with c1:
-    st.subheader("🥧 Status Overview")
-    status_counts = df["Status"].value_counts()
-    status_colors = {"❌ Expired":"#ffcccc","⚠️ Expiring Soon":"#fff2cc","✅ OK":"#ccffcc"}
-    fig = px.pie(
-        names=status_counts.index,
-        values=status_counts.values,
+STATUS_COLORS = {"❌ Expired":"#ffcccc","⚠️ Expiring Soon":"#fff2cc","✅ OK":"#ccffcc"}
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def status_pie(status_counts):
+    """Pie chart for a tuple of (status, count) pairs; identical counts reuse the figure."""
+    import plotly.express as px  # only needed once the analysis is opened
+
+    names = [status for status, count in status_counts if count > 0]
+    values = [count for status, count in status_counts if count > 0]
+    return px.pie(
+        names=names,
+        values=values,
         title="Food Status Distribution",
-        color=status_counts.index,
-        color_discrete_map=status_colors
+        color=names,
+        color_discrete_map=STATUS_COLORS
     )
-    st.plotly_chart(fig, use_container_width=True)
 
-with c2:
-    total_items, expired_items, ok_items, lost_value = calculate_statistics(df)
-    st.markdown(f"""
-    <div class="stats-box">
-        <h3 style="margin-top:0;">📊 Waste Statistics</h3>
-        <strong>Total Items:</strong> {total_items}<br>
-        <strong>Expired Items:</strong> {expired_items}<br>
-        <strong>OK / Expiring Soon Items:</strong> {ok_items}<br>
-    </div>
-    """, unsafe_allow_html=True)
-    if expired_items > 0:
-        st.warning(f"💸 Estimated Economic Loss: *€{lost_value:.2f}*")
-    else:
-        st.info("No food waste detected! 🎉")
+def _user_statistics(user):
+    return calculate_statistics(inventory_cache.get(user, load_typed_inventory))
+
+FORECAST_DAYS = 14
+
+def _expiry_forecast(user):
+    return get_expiry_histogram(user, horizon=FORECAST_DAYS)
+
+@st.fragment
+def analysis_section(user):
+    with timed_section("analysis"):
+        st.markdown("<hr>", unsafe_allow_html=True)
+        st.subheader("📈 General Analysis")
+        # Charts, statistics and plotly are only built once the section is
+        # opened; toggling reruns just this fragment
+        if not st.toggle("Show charts and statistics", key="show_analysis"):
+            return
+        c1, c2 = st.columns(2)
+
+        with c1:
+            st.subheader("🥧 Status Overview")
+            status_counts = inventory_cache.get(user, count_food_items_by_status, kind="status_counts")
+            st.plotly_chart(status_pie(tuple(status_counts.items())), use_container_width=True)
+
+        with c2:
+            st.subheader("🔮 Expiry Forecast")
+            # Counted per day in SQL on the expiry index, not per item in Python
+            forecast = inventory_cache.get(user, _expiry_forecast, kind="expiry_forecast")
+            forecast_df = pd.DataFrame(forecast, columns=["Days left", "Items expiring"]).set_index("Days left")
+            st.bar_chart(forecast_df, color="#e0a800")
+            st.caption(f"Items expiring in the next {FORECAST_DAYS} days (0 = today)")
+
+        total_items, expired_items, ok_items, lost_value = inventory_cache.get(
+            user, _user_statistics, kind="statistics")
+        st.markdown(f"""
+        <div class="stats-box">
+            <h3 style="margin-top:0;">📊 Waste Statistics</h3>
+            <strong>Total Items:</strong> {total_items}<br>
+            <strong>Expired Items:</strong> {expired_items}<br>
+            <strong>OK / Expiring Soon Items:</strong> {ok_items}<br>
+        </div>
+        """, unsafe_allow_html=True)
+        if expired_items > 0:
+            st.warning(f"💸 Estimated Economic Loss: *€{lost_value:.2f}*")
+        else:
+            st.info("No food waste detected! 🎉")
+
+        # History comes from the per-month aggregates kept by the waste ledger
+        trend = inventory_cache.get(user, get_waste_trend, kind="waste_trend")
+        if trend:
+            st.subheader("📅 Waste Over Time")
+            trend_df = pd.DataFrame(trend, columns=["Month", "Consumed items", "Consumed (€)",
+                                                    "Wasted items", "Wasted (€)"]).set_index("Month")
+            st.bar_chart(trend_df[["Consumed (€)", "Wasted (€)"]], color=["#2e6c46", "#a60000"])
+            st.caption(f"Thrown away so far: {int(trend_df['Wasted items'].sum())} items, "
+                       f"€{trend_df['Wasted (€)'].sum():.2f}")
+
+analysis_section(st.session_state.user)
+
+# ------------------- METRICS -------------------
+metrics.observe("app_rerun_seconds", time.perf_counter() - RERUN_START)
+if st.query_params.get("debug") == "metrics":
+    with st.expander("📏 Metrics"):
+        st.code(metrics.prometheus_text() if metrics.enabled else "Metrics are off: start with WASTED_METRICS=1")
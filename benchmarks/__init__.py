@@ -0,0 +1,2 @@
+# Performance benchmarks for the Wasted data paths.
+# Run them from the repository root, e.g. `python -m benchmarks.bench_pool`.
@@ -0,0 +1,88 @@
+"""Load test for the async database layer: p50/p99 latency under many clients.
+
+Runs a few hundred concurrent asyncio clients against AsyncDatabase, each
+doing a mix of inserts, page reads, status counts and deletes, once with
+write batching disabled (one transaction per write) and once with it enabled.
+
+    python -m benchmarks.bench_async --clients 300 --ops 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from my_project.db import database
+from my_project.db.aio import AsyncDatabase
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list (q in 0..100)."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _client(db, user, ops, latencies, rng):
+    async def timed(kind, coro):
+        start = time.perf_counter()
+        result = await coro
+        latencies[kind].append(time.perf_counter() - start)
+        return result
+
+    await asyncio.sleep(rng.random() * 0.01)  # do not start in lockstep
+    for i in range(ops):
+        await timed("write", db.insert_food_item(user, f"item-{i}", "Dairy", "2025-08-01", "2025-08-10",
+                                                 1.0, "pcs", 1.0))
+        page = await timed("read", db.get_food_items_page(user, limit=20))
+        await timed("read", db.count_food_items_by_status(user))
+        if i % 2:
+            await timed("write", db.delete_food_item(page[0][0], user))
+
+
+async def _load(clients, ops, batch_window, max_batch, seed):
+    latencies = {"read": [], "write": []}
+    rng = random.Random(seed)
+    async with AsyncDatabase(batch_window=batch_window, max_batch=max_batch) as db:
+        start = time.perf_counter()
+        await asyncio.gather(*[_client(db, f"user{c}", ops, latencies, rng) for c in range(clients)])
+        elapsed = time.perf_counter() - start
+        stats = db.stats()
+    return elapsed, latencies, stats
+
+
+def run(mode, clients, ops, directory, seed=0):
+    """Run the load in the given mode; return (elapsed, latencies, writer stats)."""
+    saved = (database.db_path, database.create_connection)
+    database.db_path = os.path.join(directory, f"{mode}.db")
+    database.create_connection = database._default_create_connection
+    batch_window, max_batch = (0.0, 1) if mode == "unbatched" else (0.002, 256)
+    try:
+        database.initialize_db()
+        return asyncio.run(_load(clients, ops, batch_window, max_batch, seed))
+    finally:
+        database.close_pool()
+        database.db_path, database.create_connection = saved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=300, help="concurrent asyncio clients")
+    parser.add_argument("--ops", type=int, default=20, help="iterations per client")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ("unbatched", "batched"):
+            elapsed, latencies, stats = run(mode, args.clients, args.ops, directory)
+            total = sum(len(v) for v in latencies.values())
+            print(f"{mode:>9}: {total / elapsed:8.0f} ops/sec, {stats['batches']} commits "
+                  f"(mean batch {stats['mean_batch']:.1f})")
+            for kind, values in latencies.items():
+                print(f"           {kind:5s} p50 {1000 * statistics.median(values):8.2f} ms   "
+                      f"p99 {1000 * percentile(values, 99):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
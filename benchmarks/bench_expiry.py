@@ -0,0 +1,106 @@
+"""Status counts and expiry forecasts: per-row Python, a full scan and range queries.
+
+Fills a temporary database (by default one user with 200,000 items) and
+times, for one reference date, the status counts and a 14-day histogram of
+items by days to expiry computed three ways: check_status over every row in
+Python, one SQL pass over all the user's rows, and the range queries on
+idx_food_items_user_expiry used by count_food_items_by_status and
+get_expiry_histogram.
+
+    python -m benchmarks.bench_expiry --rows 200000 --users 1
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter
+from datetime import date, datetime
+
+from benchmarks import datagen
+from my_project.db import database
+
+HORIZON = 14
+
+
+def _median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return 1000 * statistics.median(timings)
+
+
+def _python_counts(user, today):
+    # What check_status does: parse every expiration date of every row
+    counts = Counter()
+    for row in database.get_all_food_items(user):
+        days = (datetime.strptime(row[5], "%Y-%m-%d").date() - today).days
+        if days < 0:
+            counts[database.STATUS_EXPIRED] += 1
+        elif days <= database.EXPIRING_SOON_DAYS:
+            counts[database.STATUS_EXPIRING_SOON] += 1
+        else:
+            counts[database.STATUS_OK] += 1
+        if days <= HORIZON:
+            counts[days] += 1
+    return counts
+
+
+def _scan_counts(user, today):
+    params = database._status_params(user, today, database.EXPIRING_SOON_DAYS)
+    params["horizon"] = HORIZON
+    with database.connection(user) as conn:
+        conn.execute("""
+            SELECT COALESCE(SUM(expiration_day < :today), 0),
+                   COALESCE(SUM(expiration_day BETWEEN :today AND :today + :soon_days), 0),
+                   COALESCE(SUM(expiration_day > :today + :soon_days OR expiration_day IS NULL), 0)
+            FROM food_items WHERE user = :user
+        """, params).fetchone()
+        return conn.execute("""
+            SELECT expiration_day - :today, COUNT(*) FROM food_items
+            WHERE user = :user GROUP BY 1 HAVING expiration_day - :today BETWEEN 0 AND :horizon
+        """, params).fetchall()
+
+
+def _range_counts(user, today):
+    database.count_food_items_by_status(user, today)
+    return database.get_expiry_histogram(user, today, HORIZON)
+
+
+def run(rows, users, repeat, directory):
+    """Return [(case, ms)]."""
+    saved = (database.db_path, database.create_connection)
+    try:
+        database.db_path = os.path.join(directory, "expiry.db")
+        database.create_connection = database._default_create_connection
+        user = datagen.populate(rows, users, login_users=0)[0]
+        today = date.today()
+        cases = {
+            "check_status per row (Python)": _python_counts,
+            "SQL over all rows": _scan_counts,
+            "range queries on the expiry index": _range_counts,
+        }
+        return [(case, _median_ms(lambda: func(user, today), repeat)) for case, func in cases.items()]
+    finally:
+        database.close_pool()
+        database.db_path, database.create_connection = saved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run(args.rows, args.users, args.repeat, tmp)
+    print(f"{args.rows} items, {args.users} users: status counts + {HORIZON}-day histogram for one user")
+    for case, ms in results:
+        print(f"  {case:36s} {ms:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Time to first render of the app, in Streamlit's AppTest.
+
+Fills a temporary database with one user's items, then runs app.py in fresh
+processes, on the login page and logged in as that user, and reports, as
+medians:
+
+- cold: the first run in a new process (the app's own imports included),
+- session: the first run of a new session in a warm process, which is what a
+  visitor waits for on a running server,
+- rerun: a rerun of that session, e.g. after clicking a button,
+
+plus the inline HTML/CSS the page sends, the bytes of images served by the
+app and the number of remote URLs the browser still has to fetch. Pass
+``--baseline REV`` to measure app.py of an older git revision as well.
+
+    python -m benchmarks.bench_first_render --items 200 --baseline HEAD~1
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_URL = re.compile(r"https?://[^\s\"')]+")
+
+
+def _child(app, db_path, user, reruns, page):
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.testing.v1 import AppTest
+    from my_project.db import database
+
+    database.db_path = db_path
+    media = []
+    load_and_get_id = MemoryMediaFileStorage.load_and_get_id
+
+    def recording(self, path_or_data, *args, **kwargs):
+        media.append(len(path_or_data) if isinstance(path_or_data, bytes) else os.path.getsize(path_or_data))
+        return load_and_get_id(self, path_or_data, *args, **kwargs)
+
+    MemoryMediaFileStorage.load_and_get_id = recording
+
+    def session():
+        at = AppTest.from_file(app, default_timeout=120)
+        if page == "app":
+            at.session_state["user"] = user
+        start = time.perf_counter()
+        at.run()
+        return at, time.perf_counter() - start
+
+    at, cold = session()
+    del media[:]
+    at, first = session()
+    if at.exception:
+        raise SystemExit(f"{app} failed: {at.exception[0].value}")
+    html = [m.value for m in at.markdown] + [e.proto.imgs[0].url for e in at.get("imgs")]
+    result = {
+        "cold": cold,
+        "session": first,
+        "html_bytes": sum(len(value.encode()) for value in html if not value.startswith("/")),
+        "media_bytes": sum(media),
+        "remote_urls": len({url for value in html for url in _URL.findall(value)}),
+    }
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+    result["rerun"] = statistics.median(timings)
+    print(json.dumps(result))
+
+
+def measure(app, db_path, user, processes, reruns, page="app"):
+    """Median of each figure over `processes` fresh processes; `page` is "app" or "login"."""
+    runs = []
+    for _ in range(processes):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_first_render", "--child", app, db_path, user, str(reruns),
+             page],
+            cwd=ROOT, env=dict(os.environ, PYTHONPATH=ROOT), capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def main(argv=None):
+    if argv is None and sys.argv[1:2] == ["--child"]:
+        app, db_path, user, reruns, page = sys.argv[2:]
+        _child(app, db_path, user, int(reruns), page)
+        return
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=5)
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--baseline", help="git revision whose app.py is measured too")
+    args = parser.parse_args(argv)
+
+    from benchmarks import datagen
+    from my_project.db import database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.db_path = os.path.join(tmp, "render.db")
+        database.create_connection = database._default_create_connection
+        user = datagen.populate(args.items, 1, login_users=0)[0]
+        database.close_pool()
+        apps = {"current": os.path.join(ROOT, "app.py")}
+        if args.baseline:
+            apps = {args.baseline: os.path.join(tmp, "baseline_app.py"), **apps}
+            with open(apps[args.baseline], "w") as f:
+                f.write(subprocess.run(["git", "show", f"{args.baseline}:app.py"], cwd=ROOT,
+                                       capture_output=True, text=True, check=True).stdout)
+        print(f"{args.items} items, medians of {args.processes} processes")
+        for page in ("login", "app"):
+            print(f" {page} page")
+            for name, app in apps.items():
+                r = measure(app, database.db_path, user, args.processes, args.reruns, page)
+                print(f"  {name:10s} cold {1000 * r['cold']:7.0f} ms   new session {1000 * r['session']:6.0f} ms"
+                      f"   rerun {1000 * r['rerun']:6.0f} ms   inline HTML {r['html_bytes'] / 1024:5.1f} KB"
+                      f"   images {r['media_bytes'] / 1024:6.1f} KB   remote URLs {r['remote_urls']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Memory per item of the inventory frames: load_inventory versus load_typed_inventory.
+
+Fills a temporary database with one user's items, loads them both ways and
+reports the bytes per item the frame keeps (pandas deep memory usage), the
+peak allocated while loading (tracemalloc) and the load time.
+
+    python -m benchmarks.bench_inventory_memory --items 1000 10000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import datagen
+from my_project import inventory
+from my_project.db import database
+
+USER = datagen.user_names(1)[0]
+LOADERS = {"load_inventory": inventory.load_inventory, "load_typed_inventory": inventory.load_typed_inventory}
+
+
+def measure(loader, items):
+    """Return (retained bytes per item, peak bytes per item, seconds) for one load."""
+    loader(USER)  # warm up: imports, page cache
+    start = time.perf_counter()
+    loader(USER)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        df = loader(USER)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return int(df.memory_usage(deep=True).sum()) / items, peak / items, elapsed
+
+
+def run(items, directory):
+    """Return {loader name: measure(...)} for a user with `items` items."""
+    saved = (database.db_path, database.create_connection)
+    try:
+        database.db_path = os.path.join(directory, f"memory-{items}.db")
+        database.create_connection = database._default_create_connection
+        datagen.populate(items, 1, login_users=0)
+        return {name: measure(loader, items) for name, loader in LOADERS.items()}
+    finally:
+        database.close_pool()
+        database.db_path, database.create_connection = saved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for items in args.items:
+            results = run(items, tmp)
+            print(f"{items} items")
+            for name, (retained, peak, seconds) in results.items():
+                print(f"  {name:22s} {retained:7.0f} B/item kept, {peak:7.0f} B/item peak, {seconds * 1000:8.1f} ms")
+            ratio = results["load_inventory"][0] / results["load_typed_inventory"][0]
+            print(f"  typed frame is {ratio:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Logins/sec at different scrypt cost settings, with and without the login cache.
+
+Several threads (sessions) log in concurrently; the KDF runs in the bounded
+pool from my_project.db.passwords.
+
+    python -m benchmarks.bench_logins --sessions 8 --logins 20
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from my_project.db import database, passwords
+
+
+def _rate(sessions, logins):
+    def session(s):
+        for _ in range(logins):
+            assert database.check_user_credentials(f"user{s}", "secret")
+
+    threads = [threading.Thread(target=session, args=(s,)) for s in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sessions * logins / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--logins", type=int, default=20, help="logins per session")
+    parser.add_argument("--costs", type=lambda s: [int(x) for x in s.split(",")],
+                        default=[2 ** 12, 2 ** 14, 2 ** 15], help="comma separated scrypt N values")
+    args = parser.parse_args(argv)
+
+    saved = (database.db_path, passwords.SCRYPT_N)
+    print(f"{args.sessions} sessions, KDF pool of {passwords.KDF_WORKERS} workers")
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            database.db_path = os.path.join(tmp, "bench.db")
+            database.initialize_db()
+            for n in args.costs:
+                passwords.SCRYPT_N = n
+                passwords.login_cache.clear()
+                for s in range(args.sessions):
+                    database.add_user(f"user{s}", "secret")
+                    with database.connection() as conn:
+                        conn.execute("UPDATE users SET password_hash = ? WHERE username = ?",
+                                     (passwords.hash_password("secret"), f"user{s}"))
+                cache = passwords.login_cache
+                passwords.login_cache = passwords.LoginCache(ttl=-1)  # entries expire at once
+                try:
+                    uncached = _rate(args.sessions, args.logins)
+                finally:
+                    passwords.login_cache = cache
+                cached = _rate(args.sessions, args.logins)
+                print(f"N={n:>6}: {uncached:9.1f} logins/sec uncached, {cached:11.1f} with the login cache")
+        finally:
+            database.close_pool()
+            database.db_path, passwords.SCRYPT_N = saved
+
+
+if __name__ == "__main__":
+    main()
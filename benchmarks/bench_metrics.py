@@ -0,0 +1,76 @@
+"""Overhead of the metrics instrumentation, disabled and enabled.
+
+Times a trivial function bare, wrapped with metrics.timed while metrics are
+off, and wrapped while they are on; then the same for a real instrumented
+database call (get_data_version, a primary-key lookup).
+
+    python -m benchmarks.bench_metrics --calls 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from my_project import metrics
+from my_project.db import database
+
+
+def _per_call_ns(func, calls):
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def run(calls):
+    """Return {case: ns per call}."""
+    def noop():
+        return None
+
+    wrapped = metrics.timed("bench_seconds")(noop)
+    results = {}
+    saved = metrics.enabled
+    try:
+        metrics.enable(False)
+        results["noop bare"] = _per_call_ns(noop, calls)
+        results["noop timed, disabled"] = _per_call_ns(wrapped, calls)
+        metrics.enable(True)
+        results["noop timed, enabled"] = _per_call_ns(wrapped, calls)
+
+        db_calls = max(1, calls // 20)
+        bare = database.get_data_version.__wrapped__
+        metrics.enable(False)
+        results["get_data_version bare"] = _per_call_ns(lambda: bare("user0"), db_calls)
+        results["get_data_version, disabled"] = _per_call_ns(lambda: database.get_data_version("user0"), db_calls)
+        metrics.enable(True)
+        results["get_data_version, enabled"] = _per_call_ns(lambda: database.get_data_version("user0"), db_calls)
+    finally:
+        metrics.enable(saved)
+        metrics.reset()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    saved = (database.db_path, database.create_connection)
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            database.db_path = os.path.join(tmp, "bench.db")
+            database.create_connection = database._default_create_connection
+            database.initialize_db()
+            results = run(args.calls)
+        finally:
+            database.close_pool()
+            database.db_path, database.create_connection = saved
+    for case, ns in results.items():
+        print(f"  {case:30s} {ns:10.0f} ns/call")
+    overhead = results["get_data_version, disabled"] - results["get_data_version bare"]
+    print(f"disabled overhead on a DB call: {overhead:.0f} ns "
+          f"({overhead / results['get_data_version bare']:.2%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compare per-call connections against the shared connection pool.
+
+Simulates many concurrent Streamlit sessions (one thread each) running the
+usual mix of inserts, reads, logins and deletes, and prints ops/sec for the
+original connect/close-per-call behaviour and for the pooled layer.
+
+    python -m benchmarks.bench_pool --sessions 16 --ops 200
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from my_project.db import database
+
+
+def _session(user, ops, errors):
+    try:
+        for i in range(ops):
+            database.insert_food_item(user, f"item-{i}", "Dairy", "2025-08-01", "2025-08-10", 1.0, "pcs", 1.0)
+            items = database.get_all_food_items(user)
+            database.check_user_credentials(user, "secret")
+            if i % 2:
+                database.delete_food_item(items[0][0], user)
+    except sqlite3.OperationalError as e:
+        errors.append(e)
+
+
+def run(mode, sessions, ops, directory):
+    """Run the workload in the given mode and return (ops/sec, errors)."""
+    path = os.path.join(directory, f"{mode}.db")
+    saved = (database.db_path, database.create_connection)
+    database.db_path = path
+    if mode == "per-call":
+        # Same as the original implementation: a brand new connection per call
+        database.create_connection = lambda: sqlite3.connect(path)
+    else:
+        database.create_connection = database._default_create_connection
+    try:
+        database.initialize_db()
+        for s in range(sessions):
+            database.add_user(f"user{s}", "secret")
+
+        errors = []
+        threads = [threading.Thread(target=_session, args=(f"user{s}", ops, errors)) for s in range(sessions)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        database.close_pool()
+        database.db_path, database.create_connection = saved
+
+    # Each loop iteration runs 3 statements plus a delete every other time
+    total_ops = sessions * (ops * 3 + ops // 2)
+    return total_ops / elapsed, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=16, help="concurrent sessions (threads)")
+    parser.add_argument("--ops", type=int, default=200, help="iterations per session")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = {}
+        for mode in ("per-call", "pooled"):
+            rate, errors = run(mode, args.sessions, args.ops, directory)
+            results[mode] = rate
+            print(f"{mode:>9}: {rate:10.0f} ops/sec  ({len(errors)} lock errors)")
+    print(f"  speedup: {results['pooled'] / results['per-call']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
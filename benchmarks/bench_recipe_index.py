@@ -0,0 +1,68 @@
+"""Lookup latency of the local recipe index on a large synthetic dataset.
+
+Builds an index of synthetic recipes over an ingredient vocabulary with a
+skewed (Zipf-like) popularity, then times `search` for random fridges.
+
+    python -m benchmarks.bench_recipe_index --recipes 100000 --fridge 50 --expiring 5
+"""
+import argparse
+import random
+import statistics
+import string
+import time
+
+from my_project.recipe_index import RecipeIndex
+
+
+def _word(n):
+    letters = []
+    n += 26 * 26  # at least three letters, so nothing looks like a plural or a stopword
+    while n:
+        n, r = divmod(n, 26)
+        letters.append(string.ascii_lowercase[r])
+    return "".join(letters) + "o"
+
+
+def synthetic_recipes(count, vocabulary=2000, seed=0):
+    rng = random.Random(seed)
+    names = [f"{_word(i)} {_word(i * 7 + 3)}" if i % 3 == 0 else _word(i) for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    recipes = [{"id": i, "title": f"Recipe {i}",
+                "ingredients": rng.choices(names, weights, k=rng.randint(5, 12)),
+                "steps": ["Cook."]}
+               for i in range(count)]
+    return recipes, names, weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=100000)
+    parser.add_argument("--fridge", type=int, default=50, help="items in the fridge")
+    parser.add_argument("--expiring", type=int, default=5, help="of which expiring soon")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    recipes, names, weights = synthetic_recipes(args.recipes)
+    start = time.perf_counter()
+    index = RecipeIndex(recipes)
+    print(f"built an index of {len(index)} recipes in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(1)
+    fridges = []
+    for _ in range(args.queries):
+        fridge = list(dict.fromkeys(rng.choices(names, weights, k=args.fridge * 2)))[:args.fridge]
+        fridges.append((fridge[:args.expiring], fridge[args.expiring:]))
+
+    for label in ("cold", "warm"):  # warm: item names already matched
+        timings = []
+        for expiring, others in fridges:
+            start = time.perf_counter()
+            index.search(expiring, others, number=5)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"  {label}: median {1e6 * statistics.median(timings):8.0f} us, "
+              f"p99 {1e6 * timings[int(0.99 * (len(timings) - 1))]:8.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Latency and cache hit rate of the recipe client against a local stub server.
+
+The stub adds a fixed delay to every response to mimic the remote API. The
+workload replays ingredient sets drawn from a small pool, the way reruns and
+repeated clicks ask for the same expiring items again.
+
+    python -m benchmarks.bench_recipes --delay 0.15 --lookups 50
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from my_project.recipes import RecipeClient
+from test.stubs import StubRecipeServer
+
+PANTRY = ["milk", "eggs", "ham", "spinach", "rice", "tomato", "cheese", "apple", "yogurt", "bread"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--delay", type=float, default=0.15, help="stub latency per request (s)")
+    parser.add_argument("--lookups", type=int, default=50, help="number of suggest() calls")
+    parser.add_argument("--distinct", type=int, default=8, help="distinct ingredient sets")
+    parser.add_argument("--candidates", type=int, default=3, help="recipes per search")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    pool = [rng.sample(PANTRY, rng.randint(1, 4)) for _ in range(args.distinct)]
+    workload = [rng.choice(pool) for _ in range(args.lookups)]
+
+    with StubRecipeServer(delay=args.delay) as server, tempfile.TemporaryDirectory() as cache_dir:
+        client = RecipeClient(api_key="bench", base_url=server.url, cache_dir=cache_dir)
+        cold, warm = [], []
+        seen = set()
+        for ingredients in workload:
+            key = tuple(sorted(ingredients))
+            start = time.perf_counter()
+            client.suggest(ingredients, number=args.candidates)
+            (warm if key in seen else cold).append(time.perf_counter() - start)
+            seen.add(key)
+        stats = client.stats()
+        client.close()
+
+    sequential = args.delay * (1 + args.candidates)
+    print(f"cold lookups: {len(cold):4d}  median {1000 * statistics.median(cold):8.1f} ms"
+          f"  (sequential calls would take ~{1000 * sequential:.0f} ms)")
+    if warm:
+        print(f"warm lookups: {len(warm):4d}  median {1000 * statistics.median(warm):8.3f} ms")
+    print(f"hit rate: {stats['hit_rate']:.1%}  upstream requests: {stats['requests']}"
+          f"  mean upstream latency: {stats['mean_latency_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
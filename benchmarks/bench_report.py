@@ -0,0 +1,66 @@
+"""Throughput of the batch waste report with 1, 2, 4 and 8 worker processes.
+
+Fills a temporary database, then times `report.generate_report` end to end
+(process start-up included) for each worker count, next to the serial path
+the app would take: get_all_food_items and calculate_statistics per user.
+
+    python -m benchmarks.bench_report --rows 1000000 --users 20000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks import datagen
+from my_project import inventory, report
+from my_project.db import database
+
+
+def serial(users):
+    for user in users:
+        inventory.calculate_statistics(inventory.load_inventory(user))
+
+
+def run(rows, users, worker_counts, chunk_size, directory):
+    """Return {case: users per second}."""
+    saved = (database.db_path, database.create_connection)
+    results = {}
+    try:
+        database.db_path = os.path.join(directory, "report.db")
+        database.create_connection = database._default_create_connection
+        names = datagen.populate(rows, users, login_users=0)
+
+        sample = names[:max(1, min(users, 500))]  # the serial path is slow: time a sample
+        start = time.perf_counter()
+        serial(sample)
+        results["serial, one user at a time"] = len(sample) / (time.perf_counter() - start)
+
+        for workers in worker_counts:
+            start = time.perf_counter()
+            done = sum(len(rows) for rows in report.generate_report(workers, chunk_size))
+            results[f"{workers} worker(s)"] = done / (time.perf_counter() - start)
+    finally:
+        database.close_pool()
+        database.db_path, database.create_connection = saved
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chunk-size", type=int, default=report.CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run(args.rows, args.users, args.workers, args.chunk_size, tmp)
+    print(f"{args.rows} items, {args.users} users, {os.cpu_count()} CPUs")
+    base = results.get(f"{args.workers[0]} worker(s)")
+    for case, rate in results.items():
+        speedup = f"  x{rate / base:.2f}" if base and "worker" in case else ""
+        print(f"  {case:28s} {rate:12,.0f} users/s{speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Item search: the food_items_fts trigram index versus LIKE '%x%'.
+
+Fills a temporary database (by default one user with a million items, the
+worst case for a scan) and times, per query, a LIKE scan and the FTS5 index
+over every row, then search_food_items for the user next to the LIKE-based
+get_food_items_page search.
+
+    python -m benchmarks.bench_search --rows 1000000 --users 1
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks import datagen
+from my_project.db import database
+
+
+def _median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return 1000 * statistics.median(timings)
+
+
+def run(rows, users, repeat, directory):
+    """Return [(query, case, ms)]."""
+    saved = (database.db_path, database.create_connection)
+    results = []
+    try:
+        database.db_path = os.path.join(directory, "search.db")
+        database.create_connection = database._default_create_connection
+        user = datagen.populate(rows, users, login_users=0)[0]
+        queries = {
+            "common": "yogurt",
+            "rare": str(rows - 1),  # names end with their row number
+            "typo": "yoghurt 1",
+        }
+        with database.connection(user) as conn:
+            for label, query in queries.items():
+                like = f"%{query}%"
+                match = database._fts_phrase(query)
+                cases = {
+                    "LIKE, all rows": lambda: conn.execute(
+                        "SELECT id FROM food_items WHERE name LIKE ? LIMIT 20", (like,)).fetchall(),
+                    "FTS5, all rows": lambda: conn.execute(
+                        "SELECT rowid FROM food_items_fts WHERE food_items_fts MATCH ? LIMIT 20", (match,)).fetchall(),
+                }
+                for case, func in cases.items():
+                    results.append((f"{label} {query!r}", case, _median_ms(func, repeat)))
+        for label, query in queries.items():
+            cases = {
+                "get_food_items_page (LIKE)": lambda: database.get_food_items_page(user, search=query),
+                "search_food_items": lambda: database.search_food_items(user, query),
+            }
+            for case, func in cases.items():
+                results.append((f"{label} {query!r}", case, _median_ms(func, repeat)))
+    finally:
+        database.close_pool()
+        database.db_path, database.create_connection = saved
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        results = run(args.rows, args.users, args.repeat, tmp)
+    print(f"{args.rows} items, {args.users} users ({time.perf_counter() - start:.0f}s including setup)")
+    for query, case, ms in results:
+        print(f"  {query:28s} {case:28s} {ms:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
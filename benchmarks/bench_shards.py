@@ -0,0 +1,67 @@
+"""Write throughput with one database file versus users sharded over several.
+
+Many concurrent sessions (one thread each, one user each) insert and delete
+items one transaction at a time. With a single file every commit waits for
+SQLite's one write lock; with shards, sessions of users in different shards
+commit in parallel.
+
+    python -m benchmarks.bench_shards --sessions 32 --ops 200 --shards 1 4 8
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from my_project.db import database, shards
+
+
+def _session(user, ops):
+    for i in range(ops):
+        database.insert_food_item(user, f"item-{i}", "Dairy", "2025-08-01", "2025-08-10", 1.0, "pcs", 1.0)
+        if i % 2:
+            database.delete_food_item(database.get_all_food_items(user)[0][0], user)
+
+
+def run(count, sessions, ops, directory):
+    """Return write transactions per second with `count` shards (1: the single file)."""
+    saved = (database.db_path, database.create_connection)
+    database.create_connection = database._default_create_connection
+    try:
+        if count == 1:
+            database.db_path = os.path.join(directory, "single.db")
+        else:
+            shard_dir = os.path.join(directory, f"shards-{count}")
+            shards.ShardMap(shard_dir, count).save()
+            database.configure_shards(shard_dir)
+        database.initialize_db()
+        threads = [threading.Thread(target=_session, args=(f"user{s}", ops)) for s in range(sessions)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        database.configure_shards(None)
+        database.db_path, database.create_connection = saved
+    return sessions * (ops + ops // 2) / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=32, help="concurrent sessions (threads)")
+    parser.add_argument("--ops", type=int, default=200, help="inserts per session")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = None
+        for count in args.shards:
+            rate = run(count, args.sessions, args.ops, directory)
+            baseline = baseline or rate
+            print(f"{count:3d} shard(s): {rate:10.0f} writes/sec  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
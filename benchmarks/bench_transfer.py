@@ -0,0 +1,58 @@
+"""Rows/sec of one-at-a-time inserts against the streaming bulk importer.
+
+    python -m benchmarks.bench_transfer --rows 20000
+"""
+import argparse
+import csv
+import io
+import os
+import tempfile
+import time
+
+from my_project import transfer
+from my_project.db import database
+
+
+def _rows(count):
+    for i in range(count):
+        yield {"user": f"user{i % 50}", "name": f"item{i}", "category": "Other",
+               "purchase_date": "2025-08-01", "expiration_date": f"2025-09-{i % 28 + 1:02d}",
+               "quantity": 1 + i % 5, "unit": "pcs", "price_per_unit": 1.25}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--single-rows", type=int, default=2000, help="rows for the one-at-a-time baseline")
+    args = parser.parse_args(argv)
+
+    saved = database.db_path
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            database.db_path = os.path.join(tmp, "bench.db")
+            database.initialize_db()
+
+            start = time.perf_counter()
+            for row in _rows(args.single_rows):
+                database.insert_food_item(*[row[f] for f in transfer.FIELDS])
+            single = args.single_rows / (time.perf_counter() - start)
+            print(f"insert_food_item: {single:12,.0f} rows/sec")
+
+            path = os.path.join(tmp, "items.csv")
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=transfer.FIELDS)
+                writer.writeheader()
+                writer.writerows(_rows(args.rows))
+            with open(path, newline="") as f:
+                report = transfer.import_items(f, "csv")
+            print(f"  import (csv): {report.rows_per_sec:12,.0f} rows/sec  ({report})")
+
+            report = transfer.export_items(io.StringIO(), "jsonl")
+            print(f"export (jsonl): {report.rows_per_sec:12,.0f} rows/sec  ({report})")
+        finally:
+            database.close_pool()
+            database.db_path = saved
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Bursty writes from many sessions: one transaction per write versus write-behind.
+
+Every session (one thread, one user) adds items and deletes every other one,
+reading its own items back after each write like the app's rerun does. Runs
+once with synchronous writes and once with the write-behind queue, and
+prints throughput, p50/p99 latency of write + read-back and lock errors.
+
+    python -m benchmarks.bench_write_behind --sessions 32 --ops 100
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from benchmarks.bench_async import percentile
+from my_project.db import database
+
+
+def _session(user, ops, latencies, errors):
+    for i in range(ops):
+        start = time.perf_counter()
+        try:
+            database.insert_food_item(user, f"item-{i}", "Dairy", "2025-08-01", "2025-08-10", 1.0, "pcs", 1.0)
+            page = database.get_food_items_page(user, limit=20)
+            if i % 2:
+                database.delete_food_item(page[0][0], user)
+                database.count_food_items(user)
+        except sqlite3.OperationalError:
+            errors.append(user)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def run(mode, sessions, ops, batch_window, max_batch, directory):
+    """Return (elapsed seconds, latencies, lock errors, writer stats or None)."""
+    saved = (database.db_path, database.create_connection)
+    database.db_path = os.path.join(directory, f"{mode}.db")
+    database.create_connection = database._default_create_connection
+    latencies, errors = [], []
+    try:
+        database.initialize_db()
+        if mode == "write-behind":
+            database.enable_write_behind(batch_window, max_batch)
+        threads = [threading.Thread(target=_session, args=(f"user{s}", ops, latencies, errors))
+                   for s in range(sessions)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        database.flush_write_behind()
+        elapsed = time.perf_counter() - start
+        stats = database.write_behind_stats() if mode == "write-behind" else None
+    finally:
+        database.disable_write_behind()
+        database.close_pool()
+        database.db_path, database.create_connection = saved
+    return elapsed, latencies, errors, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--ops", type=int, default=100, help="items added per session")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    writes = args.sessions * (args.ops + args.ops // 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("synchronous", "write-behind"):
+            elapsed, latencies, errors, stats = run(mode, args.sessions, args.ops, args.batch_window_ms / 1000,
+                                                    args.max_batch, tmp)
+            line = (f"  {mode:13s} {writes / elapsed:8.0f} writes/s   write+read p50 "
+                    f"{1000 * percentile(latencies, 50):7.2f} ms  p99 {1000 * percentile(latencies, 99):7.2f} ms"
+                    f"   lock errors {len(errors)}")
+            if stats:
+                line += f"   {stats['mean_batch']:.1f} writes/transaction"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Synthetic users and inventories for benchmarks.
+
+    python -m benchmarks.datagen /tmp/wasted.db --rows 100000 --users 1000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from my_project.db import database, passwords
+from my_project.transfer import batched
+
+CATEGORIES = ["Dairy", "Vegetables", "Meat", "Fruit", "Drinks", "Fish", "Other"]
+UNITS = ["pcs", "kg", "g", "L", "pack"]
+NAMES = ["Milk", "Yogurt", "Cheese", "Butter", "Carrots", "Spinach", "Tomatoes", "Chicken", "Beef",
+         "Ham", "Apples", "Bananas", "Orange juice", "Water", "Salmon", "Tuna", "Eggs", "Bread", "Rice"]
+PASSWORD = "secret"
+
+
+def user_names(users):
+    return [f"user{u:06d}" for u in range(users)]
+
+
+def generate_items(rows, users, seed=0, today=None):
+    """Yield `rows` insert_food_items tuples spread over `users` users.
+
+    Expiration dates fall between 30 days ago and 60 days ahead of `today`,
+    so every status is represented.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    names = user_names(users)
+    for i in range(rows):
+        purchase = today - timedelta(days=rng.randint(0, 40))
+        expiration = today + timedelta(days=rng.randint(-30, 60))
+        yield (
+            names[i % users],
+            f"{rng.choice(NAMES)} {i}",
+            rng.choice(CATEGORIES),
+            purchase.isoformat(),
+            expiration.isoformat(),
+            round(rng.uniform(0.1, 5), 2),
+            rng.choice(UNITS),
+            round(rng.uniform(0.2, 20), 2),
+        )
+
+
+def populate(rows, users, seed=0, login_users=10, batch_size=50000):
+    """Fill the current database (database.db_path) and return the user names.
+
+    Only the first `login_users` users get a password: scrypt is slow on
+    purpose, and a handful is enough to time logins.
+    """
+    database.initialize_db()
+    names = user_names(users)
+    for batch in batched(generate_items(rows, users, seed), batch_size):
+        database.insert_food_items(batch)
+    # One hash reused for every login user keeps setup fast
+    password_hash = passwords.hash_password(PASSWORD)
+    with database.connection() as conn:
+        conn.executemany("INSERT OR IGNORE INTO users (username, password_hash) VALUES (?, ?)",
+                         ((name, password_hash) for name in names[:login_users]))
+    return names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("db", help="SQLite file to create or extend")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    database.db_path = args.db
+    start = time.perf_counter()
+    populate(args.rows, args.users, args.seed)
+    database.close_pool()
+    print(f"{args.rows} items for {args.users} users written to {args.db} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
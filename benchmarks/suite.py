@@ -0,0 +1,179 @@
+"""Benchmark suite for the Wasted data paths, with JSON results and regression checks.
+
+Generates a synthetic database in a temp directory, times the database
+functions and the DataFrame/statistics pipeline of my_project.inventory, and
+writes the results as JSON. A saved result can be compared with a new run; any
+benchmark whose median got slower than the tolerance allows is reported and
+the exit code is 1.
+
+    python -m benchmarks.suite --rows 100000 --users 1000 --output base.json
+    python -m benchmarks.suite --rows 100000 --users 1000 --compare base.json --tolerance 0.2
+    python -m benchmarks.suite --compare base.json --against new.json
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from my_project import inventory
+from my_project.db import database, passwords
+from benchmarks import datagen
+
+
+def measure(func, repeat, setup=None):
+    """Time `func` `repeat` times and return summary statistics in seconds."""
+    timings = []
+    for i in range(repeat):
+        args = setup(i) if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "repeat": repeat,
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+        "ops_per_sec": 1 / median if median else None,
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ------------------- BENCHMARKS -------------------
+def run_suite(rows, users, repeat, seed=0):
+    names = datagen.populate(rows, users, seed)
+    user = names[0]
+    results = {}
+
+    counter = iter(range(10 ** 9))
+    results["insert_food_item"] = measure(
+        lambda: database.insert_food_item(user, f"bench {next(counter)}", "Dairy", "2025-08-01", "2025-08-10",
+                                          1.0, "pcs", 1.0),
+        repeat)
+    results["get_all_food_items"] = measure(lambda: database.get_all_food_items(user), repeat)
+
+    ids = [row[0] for row in database.get_all_food_items(user)]
+    results["delete_food_item"] = measure(lambda item_id: database.delete_food_item(item_id, user),
+                                          min(repeat, len(ids)), setup=lambda i: (ids[i],))
+
+    results["check_user_credentials"] = measure(
+        lambda: database.check_user_credentials(user, datagen.PASSWORD), max(1, repeat // 10),
+        setup=lambda i: passwords.login_cache.clear() or ())
+    results["check_user_credentials_cached"] = measure(
+        lambda: database.check_user_credentials(user, datagen.PASSWORD), repeat)
+
+    results["load_inventory"] = measure(lambda: inventory.load_inventory(user), repeat)
+    results["load_typed_inventory"] = measure(lambda: inventory.load_typed_inventory(user), repeat)
+    df = inventory.load_inventory(user)
+    results["compute_status"] = measure(lambda: inventory.compute_status(df["Expiration Date"]), repeat)
+    results["calculate_statistics"] = measure(lambda: inventory.calculate_statistics(df), repeat)
+    results["count_food_items_by_status"] = measure(lambda: database.count_food_items_by_status(user), repeat)
+    results["get_expiry_histogram"] = measure(lambda: database.get_expiry_histogram(user, horizon=14), repeat)
+
+    all_rows = database.get_food_items_with_status(user)
+    for name in names[1:]:
+        all_rows += database.get_food_items_with_status(name)
+    everyone = pd.DataFrame(all_rows, columns=df.columns)
+    results["grouped_statistics_all_users"] = measure(lambda: inventory.grouped_statistics(everyone), max(1, repeat // 10))
+    results["sql_statistics_all_users"] = measure(lambda: inventory.sql_statistics(), max(1, repeat // 10))
+    return results
+
+
+# ------------------- COMPARISON -------------------
+def compare(baseline, current, tolerance):
+    """Return (name, base median, new median, ratio, regressed) for shared benchmarks."""
+    rows = []
+    for name, base in baseline["results"].items():
+        new = current["results"].get(name)
+        if new is None:
+            continue
+        ratio = new["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        rows.append((name, base["median_s"], new["median_s"], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def print_results(result):
+    meta = result["meta"]
+    print(f"{meta['rows']} rows / {meta['users']} users, commit {meta['commit']}, sqlite {meta['sqlite']}")
+    for name, r in result["results"].items():
+        print(f"  {name:32s} median {1000 * r['median_s']:10.3f} ms  ({r['ops_per_sec'] or 0:12,.1f} ops/sec)")
+
+
+def print_comparison(rows, tolerance):
+    print(f"comparison (tolerance {tolerance:.0%}):")
+    for name, base, new, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ("faster" if ratio < 1 else "ok")
+        print(f"  {name:32s} {1000 * base:10.3f} ms -> {1000 * new:10.3f} ms  x{ratio:5.2f}  {flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="synthetic items (1k to 1M)")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results to compare against")
+    parser.add_argument("--against", metavar="RESULTS", help="compare BASELINE with this file instead of a new run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown, e.g. 0.1 for 10%%")
+    args = parser.parse_args(argv)
+
+    if args.against:
+        with open(args.against) as f:
+            current = json.load(f)
+    else:
+        saved = (database.db_path, database.create_connection)
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                database.db_path = os.path.join(tmp, "bench.db")
+                database.create_connection = database._default_create_connection
+                results = run_suite(args.rows, args.users, args.repeat, args.seed)
+            finally:
+                database.close_pool()
+                database.db_path, database.create_connection = saved
+        current = {
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "platform": platform.platform(),
+                "rows": args.rows,
+                "users": args.users,
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        print_results(current)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, current, args.tolerance)
+        print_comparison(rows, args.tolerance)
+        if any(regressed for *_, regressed in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,12 @@
 import logging
 
-logging.basicConfig(level=logging.DEBUG)
+# A library must not configure logging on import: the CLI (or the host
+# application, e.g. Streamlit) decides levels and handlers.
 logger = logging.getLogger('my_project')
+logger.addHandler(logging.NullHandler())
 
 class MyClass:
     def my_method(self):
         return "Hello World"
 
-logger.info("my_project loaded")
-
+logger.debug("my_project loaded")
@@ -1,11 +1,13 @@
 # __main__.py
 
-import os
+import sys
 
-print("Launching Streamlit app...")
-os.system("streamlit run app.py")
+from my_project.cli import main
 
 
 # this is the main module of your app
 # it is only required if your project must be runnable
 # this is the script to be executed whenever some users writes `python -m my_project` on the command line, eg.
+# `python -m my_project` runs the Streamlit app; see `python -m my_project --help` for the other commands
+if __name__ == "__main__":  # worker processes (spawn) import this module too
+    sys.exit(main())
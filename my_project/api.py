@@ -0,0 +1,235 @@
+"""Headless JSON HTTP API over the inventory, built on the standard library.
+
+Endpoints (all GET, HTTP Basic auth with the app's username and password):
+
+    /api/items    one page of items: ?limit=&cursor=&search=&status=expired,expiring_soon,ok
+    /api/status   item counts per status: ?day=YYYY-MM-DD&soon_days=
+    /api/forecast items per days to expiry: ?day=&horizon=&bucket=&past=
+    /api/stats    totals and per-category statistics
+    /api/health   liveness check (no auth)
+    /metrics      Prometheus metrics of this process (no auth)
+
+Responses carry a weak ETag derived from the user's data version and the
+current date, so a polling client sending If-None-Match gets 304 Not Modified
+after a primary-key lookup instead of a scan. Bodies are gzip-compressed when
+the client accepts it. Run with ``python -m my_project serve``.
+"""
+import gzip
+import json
+import base64
+import hashlib
+import logging
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from my_project import metrics
+from my_project.db import database
+from my_project.inventory import STAT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE = 50
+MAX_PAGE = 500
+GZIP_MIN_BYTES = 1024
+MAX_HORIZON = 366
+
+STATUS_KEYS = {
+    database.STATUS_OK: "ok",
+    database.STATUS_EXPIRING_SOON: "expiring_soon",
+    database.STATUS_EXPIRED: "expired",
+}
+_STATUS_BY_KEY = {key: status for status, key in STATUS_KEYS.items()}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_param(query, name, default, minimum=0, maximum=None):
+    value = query.get(name, [None])[-1]
+    if value in (None, ""):
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer") from None
+    if maximum is None and number < minimum:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be >= {minimum}")
+    if maximum is not None and not minimum <= number <= maximum:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be between {minimum} and {maximum}")
+    return number
+
+
+def _date_param(query, name):
+    value = query.get(name, [None])[-1]
+    if value in (None, ""):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be a YYYY-MM-DD date") from None
+
+
+# ------------------- ENDPOINTS -------------------
+def _item(row):
+    item_id, _user, name, category, purchase_date, expiration_date, quantity, unit, price, status = row
+    return {"id": item_id, "name": name, "category": category, "purchase_date": purchase_date,
+            "expiration_date": expiration_date, "quantity": quantity, "unit": unit,
+            "price_per_unit": price, "status": STATUS_KEYS[status]}
+
+
+def items_endpoint(user, query):
+    limit = _int_param(query, "limit", DEFAULT_PAGE, minimum=1, maximum=MAX_PAGE)
+    after_id = _int_param(query, "cursor", None)
+    search = query.get("search", [None])[-1]
+    statuses = None
+    if query.get("status"):
+        keys = [k for k in query["status"][-1].split(",") if k]
+        unknown = [k for k in keys if k not in _STATUS_BY_KEY]
+        if unknown:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"unknown status {unknown[0]!r}")
+        statuses = [_STATUS_BY_KEY[k] for k in keys]
+    # One extra row tells whether there is a next page without a COUNT(*)
+    rows = database.get_food_items_page(user, limit + 1, after_id, search, statuses)
+    page = rows[:limit]
+    return {
+        "items": [_item(row) for row in page],
+        "next_cursor": str(page[-1][0]) if len(rows) > limit else None,
+    }
+
+
+def status_endpoint(user, query):
+    today = _date_param(query, "day")
+    soon_days = _int_param(query, "soon_days", database.EXPIRING_SOON_DAYS, maximum=MAX_HORIZON)
+    counts = database.count_food_items_by_status(user, today, soon_days)
+    return {STATUS_KEYS[status]: count for status, count in counts.items()}
+
+
+def forecast_endpoint(user, query):
+    today = _date_param(query, "day") or date.today()
+    horizon = _int_param(query, "horizon", 14, maximum=MAX_HORIZON)
+    bucket_days = _int_param(query, "bucket", 1, minimum=1, maximum=MAX_HORIZON)
+    past_days = _int_param(query, "past", 0, maximum=MAX_HORIZON)
+    buckets = database.get_expiry_histogram(user, today, horizon, bucket_days, past_days)
+    return {
+        "day": today.isoformat(),
+        "bucket_days": bucket_days,
+        "buckets": [{"days": days, "items": items} for days, items in buckets],
+    }
+
+
+def stats_endpoint(user, query):
+    categories = []
+    totals = dict.fromkeys(STAT_COLUMNS, 0)
+    for _user, category, *values in database.aggregate_food_items(user):
+        entry = dict(zip(STAT_COLUMNS, values))
+        categories.append(dict(category=category, **entry))
+        for name in STAT_COLUMNS:
+            totals[name] += entry[name]
+    return {"totals": totals, "categories": categories}
+
+
+ROUTES = {
+    "/api/items": items_endpoint,
+    "/api/status": status_endpoint,
+    "/api/forecast": forecast_endpoint,
+    "/api/stats": stats_endpoint,
+}
+
+
+# ------------------- HTTP -------------------
+def make_etag(user, path, query_string, today=None):
+    """Weak ETag that changes whenever the user's data (or the date) changes."""
+    version = database.get_data_version(user)
+    day = database.to_day_number(today or date.today())
+    key = hashlib.sha1(f"{user}\0{path}\0{query_string}".encode()).hexdigest()[:16]
+    return f'W/"{version}-{day}-{key}"'
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "WastedAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            if url.path == "/api/health":
+                self._send_json(HTTPStatus.OK, {"status": "ok"})
+                return
+            if url.path == "/metrics":
+                self._send(HTTPStatus.OK, metrics.prometheus_text().encode(),
+                           {"Content-Type": "text/plain; version=0.0.4"})
+                return
+            endpoint = ROUTES.get(url.path)
+            if endpoint is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"no such endpoint {url.path!r}")
+            user = self._authenticate()
+            etag = make_etag(user, url.path, url.query)
+            if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+                metrics.count("api_not_modified_total", endpoint=url.path)
+                self._send(HTTPStatus.NOT_MODIFIED, b"", {"ETag": etag})
+                return
+            with metrics.timer("api_request_seconds", endpoint=url.path):
+                payload = endpoint(user, parse_qs(url.query))
+            self._send_json(HTTPStatus.OK, payload, {"ETag": etag, "Cache-Control": "private, no-cache"})
+        except ApiError as e:
+            headers = {"WWW-Authenticate": 'Basic realm="wasted"'} if e.status == HTTPStatus.UNAUTHORIZED else {}
+            self._send_json(e.status, {"error": str(e)}, headers)
+        except Exception:
+            logger.exception("error handling %s", self.path)
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "internal error"})
+
+    def _authenticate(self):
+        header = self.headers.get("Authorization", "")
+        scheme, _, encoded = header.partition(" ")
+        if scheme.lower() == "basic":
+            try:
+                username, _, password = base64.b64decode(encoded).decode().partition(":")
+            except (ValueError, UnicodeDecodeError):
+                username = password = ""
+            if username and database.check_user_credentials(username, password):
+                return username
+        raise ApiError(HTTPStatus.UNAUTHORIZED, "valid credentials required")
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        headers = dict(headers or {}, **{"Content-Type": "application/json"})
+        if len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        self._send(status, body, headers)
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Vary", "Accept-Encoding, Authorization")
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=8000):
+        super().__init__((host, port), ApiHandler)
+
+
+def serve(host="127.0.0.1", port=8000):
+    """Serve the API until interrupted."""
+    database.initialize_db()
+    with ApiServer(host, port) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,117 @@
+"""Static assets of the app: the banner image and the stylesheet.
+
+The banner comes from the repository's ``banner_wasted.jpg`` (1920x1118,
+1.6 MB). It is cropped to BANNER_ASPECT, resized to BANNER_WIDTH and
+recompressed as a progressive JPEG once, then kept in ASSET_CACHE (the file
+name carries the source's size and mtime and the settings, so a new source
+rebuilds it) and memoized in the process. Pillow is optional: without it the
+original file is used as is.
+
+The login page background is a smaller, uncropped copy built the same way.
+Both are shown with ``st.image``, so the browser fetches and caches them from
+Streamlit's media endpoint instead of receiving them inside the page. Their
+widths stay within Streamlit's maximum content width, so ``st.image`` serves
+the bytes unchanged instead of resizing them on every rerun.
+
+``page_style`` returns ``my_project/static/style.css``, without comments and
+indentation, as one ``<style>`` block built once per process.
+"""
+import io
+import os
+import re
+import hashlib
+import logging
+import functools
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BANNER_SOURCE = os.environ.get("WASTED_BANNER", os.path.join(ROOT, "banner_wasted.jpg"))
+ASSET_CACHE = os.environ.get("WASTED_ASSET_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "wasted"))
+STYLESHEET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "style.css")
+
+BANNER_WIDTH = 1460  # streamlit.elements.lib.image_utils.MAXIMUM_CONTENT_WIDTH
+BANNER_ASPECT = 3.0  # shown 300px high across the page, so the top and bottom are never visible
+BANNER_QUALITY = 80
+BACKGROUND_WIDTH = 960  # behind the login form, which covers most of it
+BACKGROUND_QUALITY = 60
+
+
+# ------------------- IMAGES -------------------
+def optimize_image(source, width, quality, aspect=None):
+    """JPEG bytes of `source` at most `width` wide, built once and cached on disk.
+
+    With `aspect` (width / height), taller images are cropped around the
+    centre first. Returns the source bytes unchanged if Pillow is missing.
+    """
+    stat = os.stat(source)
+    key = hashlib.sha1(f"{os.path.abspath(source)}:{stat.st_size}:{stat.st_mtime_ns}:"
+                       f"{width}:{quality}:{aspect}".encode()).hexdigest()[:16]
+    name, _ = os.path.splitext(os.path.basename(source))
+    cached = os.path.join(ASSET_CACHE, f"{name}-{key}.jpg")
+    try:
+        with open(cached, "rb") as f:
+            return f.read()
+    except OSError:
+        pass
+
+    data = _recompress(source, width, quality, aspect)
+    if data is None:
+        with open(source, "rb") as f:
+            return f.read()
+    try:
+        os.makedirs(ASSET_CACHE, exist_ok=True)
+        partial = f"{cached}.{os.getpid()}.tmp"
+        with open(partial, "wb") as f:
+            f.write(data)
+        os.replace(partial, cached)  # concurrent builders never see half a file
+    except OSError as e:
+        logger.warning("could not cache %s: %s", cached, e)
+    return data
+
+
+def _recompress(source, width, quality, aspect):
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.info("Pillow is not installed: using %s unoptimized", source)
+        return None
+
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        if aspect and image.width / image.height < aspect:
+            height = round(image.width / aspect)
+            top = (image.height - height) // 2
+            image = image.crop((0, top, image.width, top + height))
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=quality, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+@functools.lru_cache(maxsize=None)
+def banner():
+    """The page banner as JPEG bytes, None if BANNER_SOURCE is missing."""
+    if not os.path.exists(BANNER_SOURCE):
+        logger.warning("banner image %s not found", BANNER_SOURCE)
+        return None
+    return optimize_image(BANNER_SOURCE, BANNER_WIDTH, BANNER_QUALITY, BANNER_ASPECT)
+
+
+@functools.lru_cache(maxsize=None)
+def background():
+    """The login page background as JPEG bytes, None if BANNER_SOURCE is missing."""
+    if not os.path.exists(BANNER_SOURCE):
+        return None
+    return optimize_image(BANNER_SOURCE, BACKGROUND_WIDTH, BACKGROUND_QUALITY)
+
+
+# ------------------- STYLESHEET -------------------
+@functools.lru_cache(maxsize=None)
+def page_style():
+    """The app's CSS as a single <style> block."""
+    with open(STYLESHEET, encoding="utf-8") as f:
+        css = re.sub(r"/\*.*?\*/", "", f.read(), flags=re.S)
+    css = "".join(line.strip() + "\n" for line in css.splitlines() if line.strip())
+    return f"<style>\n{css}</style>"
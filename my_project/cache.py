@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from my_project.db import database
+
+
+# ------------------- INVENTORY CACHE -------------------
+class InventoryCache:
+    """LRU cache of per-user data, shared by all Streamlit sessions.
+
+    Every entry remembers the user's data version (see
+    `database.get_data_version`) and the day it was built. An insert or
+    delete bumps only that user's version, so only that user's entries are
+    reloaded; everyone else keeps hitting the cache. Entries also expire at
+    midnight, since statuses are relative to today.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user, loader, kind="items"):
+        """Return `loader(user)`, reusing the cached value while it is current."""
+        key = (user, kind)
+        stamp = (database.get_data_version(user), date.today())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = loader(user)
+        with self._lock:
+            self._entries[key] = (stamp, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, user=None):
+        """Drop the entries of one user, or everything when `user` is None."""
+        with self._lock:
+            if user is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == user]:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Module-level instance: Streamlit re-runs app.py but keeps imported modules,
+# so this cache is shared across reruns and sessions of the same server.
+inventory_cache = InventoryCache()
@@ -0,0 +1,209 @@
+import argparse
+import os
+import sys
+
+# Heavy modules (database, transfer, streamlit) are imported inside the
+# command handlers so `python -m my_project --help` stays fast.
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+# ------------------- COMMANDS -------------------
+def run_app(args):
+    print("Launching Streamlit app...")
+    return os.system(f'streamlit run "{APP_PATH}"')
+
+
+def _open(path, mode):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+def import_command(args):
+    from my_project import transfer
+    from my_project.db.database import initialize_db
+
+    fmt = args.format or transfer.detect_format(args.file)
+    initialize_db()
+    f = _open(args.file, "r")
+    try:
+        report = transfer.import_items(f, fmt, user=args.user, batch_size=args.batch_size, strict=args.strict)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    print(f"Imported {report}", file=sys.stderr)
+    for line, message in report.errors:
+        print(f"  record {line}: {message}", file=sys.stderr)
+    return 0
+
+
+def export_command(args):
+    from my_project import transfer
+    from my_project.db.database import initialize_db
+
+    fmt = args.format or ("csv" if args.file == "-" else transfer.detect_format(args.file))
+    initialize_db()
+    f = _open(args.file, "w")
+    try:
+        report = transfer.export_items(f, fmt, user=args.user)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    print(f"Exported {report}", file=sys.stderr)
+    return 0
+
+
+def scan_command(args):
+    import asyncio
+    import logging
+    from datetime import datetime
+    from my_project import scanner
+    from my_project.db.database import initialize_db
+
+    initialize_db()
+    options = {"batch_size": args.batch_size, "pause": args.pause}
+    if args.once:
+        day = datetime.strptime(args.day, "%Y-%m-%d").date() if args.day else None
+        events = scanner.scan(day, **options)
+        print(f"{events} new notifications", file=sys.stderr)
+        return 0
+    logging.getLogger("my_project.scanner").setLevel(logging.INFO)
+    try:
+        asyncio.run(scanner.run_forever(hour=args.hour, **options))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def report_command(args):
+    from datetime import datetime
+    from my_project import report
+    from my_project.db.database import initialize_db
+
+    fmt = args.format or ("csv" if args.file == "-" else os.path.splitext(args.file)[1].lstrip(".").lower())
+    if fmt not in report.FORMATS:
+        raise ValueError(f"cannot tell the report format of {args.file!r}, use --format")
+    if fmt == "parquet" and args.file == "-":
+        raise ValueError("Parquet output needs a file")
+    day = datetime.strptime(args.day, "%Y-%m-%d").date() if args.day else None
+    initialize_db()
+
+    def progress(done, total):
+        print(f"\r{done}/{total} users ({done / max(total, 1):.0%})", end="", file=sys.stderr, flush=True)
+
+    if fmt == "parquet":
+        f = open(args.file, "wb")
+    else:
+        f = _open(args.file, "w")
+    try:
+        chunks = report.generate_report(args.workers, args.chunk_size, day, progress=None if args.quiet else progress)
+        rows = report.write_report(f, fmt, chunks)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"Reported {rows} users", file=sys.stderr)
+    return 0
+
+
+def serve_command(args):
+    from my_project import api, metrics
+
+    if args.metrics:
+        metrics.enable()
+    print(f"Serving the JSON API on http://{args.host}:{args.port}/api/", file=sys.stderr)
+    api.serve(args.host, args.port)
+    return 0
+
+
+def shard_command(args):
+    from my_project.db import shards
+
+    pins = {}
+    if os.path.exists(os.path.join(args.dir, shards.DIRECTORY_FILE)):
+        pins = shards.ShardMap.load(args.dir).pins
+    for pin in args.pin:
+        user, _, shard = pin.rpartition("=")
+        if not user or not shard.isdigit():
+            raise ValueError(f"--pin expects USER=SHARD, got {pin!r}")
+        pins[user] = int(shard)
+    shard_map = shards.ShardMap(args.dir, args.count, pins)
+
+    def progress(user, source, target, items):
+        print(f"  {user}: {items} items {os.path.basename(source)} -> {os.path.basename(target)}", file=sys.stderr)
+
+    moved = shards.rebalance(shard_map, args.source, progress=progress if args.verbose else None)
+    print(f"{moved} users moved into {args.count} shards; run with WASTED_SHARD_DIR={args.dir}", file=sys.stderr)
+    return 0
+
+
+# ------------------- PARSER -------------------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m my_project", description="Wasted: track your fridge.")
+    parser.set_defaults(handler=run_app)
+    commands = parser.add_subparsers(title="commands", metavar="COMMAND")
+
+    commands.add_parser("app", help="run the Streamlit app (default)").set_defaults(handler=run_app)
+
+    formats = ("csv", "json", "jsonl")
+    p = commands.add_parser("import", help="bulk import food items from CSV/JSON")
+    p.add_argument("file", help="input file, or - for stdin (then --format is required)")
+    p.add_argument("--format", choices=formats, help="defaults to the file extension")
+    p.add_argument("--user", help="owner of every imported item (overrides the user column)")
+    p.add_argument("--batch-size", type=int, default=1000, help="rows validated and inserted per transaction")
+    p.add_argument("--strict", action="store_true", help="abort on the first invalid row")
+    p.set_defaults(handler=import_command)
+
+    p = commands.add_parser("export", help="export food items to CSV/JSON")
+    p.add_argument("file", help="output file, or - for stdout")
+    p.add_argument("--format", choices=formats, help="defaults to the file extension (csv for stdout)")
+    p.add_argument("--user", help="only export this user's items")
+    p.set_defaults(handler=export_command)
+
+    p = commands.add_parser("scan", help="run the background expiry scanner")
+    p.add_argument("--once", action="store_true", help="scan once and exit instead of running daily")
+    p.add_argument("--day", help="with --once: scan as of this YYYY-MM-DD date (default today)")
+    p.add_argument("--hour", type=int, default=6, help="local hour of the daily scan")
+    p.add_argument("--batch-size", type=int, default=500, help="items per write transaction")
+    p.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    p.set_defaults(handler=scan_command)
+
+    p = commands.add_parser("report", help="waste statistics for every user, computed in parallel")
+    p.add_argument("file", help="output file, or - for stdout")
+    p.add_argument("--format", choices=("csv", "jsonl", "parquet"), help="defaults to the file extension")
+    p.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    p.add_argument("--chunk-size", type=int, default=500, help="users per worker task")
+    p.add_argument("--day", help="report as of this YYYY-MM-DD date (default today)")
+    p.add_argument("--quiet", action="store_true", help="no progress output")
+    p.set_defaults(handler=report_command)
+
+    p = commands.add_parser("serve", help="run the JSON HTTP API")
+    p.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--metrics", action="store_true", help="collect metrics (served at /metrics)")
+    p.set_defaults(handler=serve_command)
+
+    p = commands.add_parser("shard", help="split the database into shards or rebalance them (app stopped)")
+    p.add_argument("--dir", required=True, help="shard directory (created if missing)")
+    p.add_argument("--count", type=int, required=True, help="number of shard files")
+    p.add_argument("--source", action="append", default=[],
+                   help="extra database file to move users from, e.g. the single-file database")
+    p.add_argument("--pin", action="append", default=[], metavar="USER=SHARD",
+                   help="keep a user in a given shard instead of the hashed one")
+    p.add_argument("--verbose", action="store_true", help="print every moved user")
+    p.set_defaults(handler=shard_command)
+
+    return parser
+
+
+def main(argv=None):
+    import logging
+    logging.basicConfig(level=os.environ.get("WASTED_LOG_LEVEL", "WARNING").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
@@ -0,0 +1,99 @@
+"""Async counterparts of the database functions, for asyncio front ends and APIs.
+
+Reads run on a small pool of reader threads (each using pooled WAL
+connections, so they never wait for writers). Writes go to a single
+BatchWriter thread, which serializes them and commits the writes that arrive
+within a few milliseconds of each other in one transaction. Password hashing
+runs before the write is queued, so the writer never waits for the KDF.
+With sharded storage there is one writer per shard, since each file has its
+own write lock.
+
+    async with AsyncDatabase() as db:
+        await db.insert_food_item("alice", "Milk", "Dairy", "2025-08-01", "2025-08-10", 1, "l", 1.2)
+        items = await db.get_all_food_items("alice")
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from my_project.db import database, passwords
+from my_project.db.writer import BatchWriter, BATCH_WINDOW, MAX_BATCH
+
+READERS = 4
+
+
+class AsyncDatabase:
+    """Non-blocking access to the inventory database from an event loop."""
+
+    def __init__(self, readers=READERS, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-reader")
+        self.writers = {
+            shard: BatchWriter(functools.partial(database.connection, shard=shard), batch_window, max_batch,
+                               name="db-writer" if shard is None else f"db-writer-{shard}")
+            for shard in database.shard_keys()
+        }
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def read(self, func, *args, **kwargs):
+        """Run any read-only function of my_project.db.database on a reader thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, functools.partial(func, *args, **kwargs))
+
+    async def write(self, user, op, *args, **kwargs):
+        """Queue `op(conn, *args)` on the writer of `user`'s shard and wait until it has committed."""
+        writer = self.writers[database.shard_of(user)]
+        return await asyncio.wrap_future(writer.submit(op, *args, **kwargs))
+
+    def stats(self):
+        """Writer statistics summed over the shards."""
+        batches = sum(w.batches for w in self.writers.values())
+        writes = sum(w.writes for w in self.writers.values())
+        return {"batches": batches, "writes": writes, "mean_batch": writes / batches if batches else 0.0}
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        for writer in self.writers.values():
+            await loop.run_in_executor(None, writer.close)
+        self._readers.shutdown(wait=True)
+
+    # ------------------- FOOD ITEMS -------------------
+    async def insert_food_item(self, user, name, category, purchase_date, expiration_date,
+                               quantity, unit, price_per_unit):
+        await self.write(user, database._insert_food_item, user, name, category, purchase_date, expiration_date,
+                         quantity, unit, price_per_unit)
+
+    async def delete_food_item(self, item_id, user, reason=None, today=None):
+        return await self.write(user, database._delete_food_item, item_id, user, reason, today)
+
+    async def get_all_food_items(self, user):
+        return await self.read(database.get_all_food_items, user)
+
+    async def get_food_items_with_status(self, user, today=None, soon_days=database.EXPIRING_SOON_DAYS):
+        return await self.read(database.get_food_items_with_status, user, today, soon_days)
+
+    async def count_food_items_by_status(self, user, today=None, soon_days=database.EXPIRING_SOON_DAYS):
+        return await self.read(database.count_food_items_by_status, user, today, soon_days)
+
+    async def get_expiry_histogram(self, user, today=None, horizon=14, bucket_days=1, past_days=0):
+        return await self.read(database.get_expiry_histogram, user, today, horizon, bucket_days, past_days)
+
+    async def get_food_items_page(self, user, limit=20, after_id=None, search=None, statuses=None,
+                                  today=None, soon_days=database.EXPIRING_SOON_DAYS):
+        return await self.read(database.get_food_items_page, user, limit, after_id, search, statuses,
+                               today, soon_days)
+
+    async def get_data_version(self, user):
+        return await self.read(database.get_data_version, user)
+
+    # ------------------- USERS -------------------
+    async def add_user(self, username, password):
+        password_hash = await self.read(passwords.hash_password, password)
+        await self.write(username, database._insert_user, username, password_hash)
+
+    async def check_user_credentials(self, username, password):
+        return await self.read(database.check_user_credentials, username, password)
@@ -1,6 +1,21 @@
 import sqlite3
 import os
-import hashlib
+import atexit
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from my_project import metrics
+from my_project.db import passwords
+from my_project.db.pool import ConnectionPool
+from my_project.db.migrations import migrate
+from my_project.db.shards import ShardMap
+from my_project.db.writer import BatchWriter, WriterClosedError, BATCH_WINDOW, MAX_BATCH
+
+logger = logging.getLogger(__name__)
 
 # ------------------- DATABASE PATH -------------------
 db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "food_items.db")
@@ -11,10 +26,202 @@ def create_connection():
     conn = sqlite3.connect(db_path)
     return conn
 
+_default_create_connection = create_connection
+
+# ------------------- SHARDING -------------------
+# None: everything lives in the db_path file (the default). A ShardMap spreads
+# users over several files; see my_project.db.shards.
+shard_map = ShardMap.load(os.environ["WASTED_SHARD_DIR"]) if os.environ.get("WASTED_SHARD_DIR") else None
+
+def configure_shards(directory=None):
+    """Route users to the shard files of `directory`, or back to db_path with None."""
+    global shard_map
+    _close_writers()
+    close_pool()
+    shard_map = ShardMap.load(directory) if directory else None
+
+def shard_of(user):
+    """Shard index holding `user` (None in single-file mode)."""
+    return shard_map.shard_for(user) if shard_map is not None else None
+
+def shard_keys():
+    """Every shard index, or [None] in single-file mode."""
+    return list(range(shard_map.count)) if shard_map is not None else [None]
+
+def _path_for(user, shard):
+    if shard_map is None:
+        return db_path
+    if shard is None:
+        if user is None:
+            raise ValueError("sharded storage: a user or a shard is needed to pick the database file")
+        shard = shard_map.shard_for(user)
+    return shard_map.path(shard)
+
+def _map_shards(func):
+    """[func(shard) for shard in shard_keys()], querying the shards in parallel."""
+    keys = shard_keys()
+    if len(keys) == 1:
+        return [func(keys[0])]
+    with ThreadPoolExecutor(max_workers=min(8, len(keys))) as executor:
+        return list(executor.map(func, keys))
+
+# ------------------- CONNECTION POOL -------------------
+_pools = {}
+_pool_lock = threading.Lock()
+
+def get_pool(path=None):
+    """Return the shared connection pool for `path` (default: the current db_path)."""
+    path = path or db_path
+    with _pool_lock:
+        pool = _pools.get(path)
+        if pool is None or pool.closed:
+            # db_path or the shard layout may have changed: close pools of files no longer in use
+            live = set(shard_map.paths()) if shard_map is not None else {db_path}
+            for stale in [p for p in _pools if p not in live]:
+                _pools.pop(stale).close()
+            pool = _pools[path] = ConnectionPool(path)
+        return pool
+
+def close_pool():
+    """Close every pooled connection (called automatically at exit)."""
+    with _pool_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+atexit.register(close_pool)
+
+@contextmanager
+def connection(user=None, shard=None):
+    """Yield a connection inside a transaction.
+
+    Connections come from the shared pool of the file that holds `user` (or
+    the given `shard`); in single-file mode both are ignored. If
+    create_connection has been replaced (as the tests do), a fresh connection
+    is opened from it and closed afterwards, exactly like the original
+    per-call behaviour. With write-behind on, the user's queued writes are
+    committed first (read-your-writes).
+    """
+    if _pending and user is not None:
+        _wait_for_writes(user)
+    if create_connection is not _default_create_connection:
+        conn = create_connection()
+        try:
+            with conn:
+                yield from _traced(conn)
+        finally:
+            conn.close()
+    else:
+        with get_pool(_path_for(user, shard)).connection() as conn:
+            yield from _traced(conn)
+
+def _count_statement(sql):
+    metrics.count("db_statements_total")
+
+def _traced(conn):
+    """Yield `conn`, counting its SQL statements while metrics are enabled."""
+    if not metrics.enabled:
+        yield conn
+        return
+    conn.set_trace_callback(_count_statement)
+    try:
+        yield conn
+    finally:
+        conn.set_trace_callback(None)
+
+# ------------------- WRITE-BEHIND -------------------
+# Optional. insert_food_item and delete_food_item then queue their write and
+# return at once; one writer thread per database file (my_project.db.writer)
+# commits the queued writes in batches: whatever arrives within
+# `batch_window` seconds, up to `max_batch` writes, in one transaction. Reads
+# of a user wait for that user's queued writes, so a session always sees its
+# own changes. Queued writes are committed at exit.
+_write_behind = None    # (batch_window, max_batch) while enabled
+_writers = {}           # shard -> BatchWriter
+_pending = {}           # user -> Future of their latest queued write
+_write_behind_lock = threading.Lock()
+
+def enable_write_behind(batch_window=BATCH_WINDOW, max_batch=MAX_BATCH):
+    """Queue inserts and deletes on writer threads instead of committing in the caller."""
+    global _write_behind
+    _close_writers()
+    _write_behind = (batch_window, max_batch)
+
+def disable_write_behind():
+    """Commit every queued write and go back to one transaction per call."""
+    global _write_behind
+    _write_behind = None
+    _close_writers()
+
+def flush_write_behind():
+    """Block until every write queued so far has been committed."""
+    for writer in list(_writers.values()):
+        try:
+            writer.flush()
+        except WriterClosedError:
+            pass
+
+def write_behind_stats():
+    """{"batches": ..., "writes": ..., "mean_batch": ...} over the writer threads."""
+    batches = sum(w.batches for w in list(_writers.values()))
+    writes = sum(w.writes for w in list(_writers.values()))
+    return {"batches": batches, "writes": writes, "mean_batch": writes / batches if batches else 0.0}
+
+def _close_writers():
+    with _write_behind_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()  # commits what is queued
+
+atexit.register(disable_write_behind)  # registered after close_pool, so it runs first
+
+def _write(user, op, *args):
+    """Run op(conn, *args) in a transaction now, or queue it with write-behind on.
+
+    Returns op's result, or with write-behind a Future for it.
+    """
+    options = _write_behind
+    if options is not None:
+        shard = shard_of(user)
+        with _write_behind_lock:
+            writer = _writers.get(shard)
+            if writer is None:
+                writer = _writers[shard] = BatchWriter(
+                    functools.partial(connection, shard=shard), *options, name=f"write-behind-{shard}")
+            try:
+                future = writer.submit(op, *args)
+            except WriterClosedError:
+                future = None  # disabled meanwhile: write synchronously
+            else:
+                _pending[user] = future
+        if future is not None:
+            future.add_done_callback(functools.partial(_write_done, user))
+            return future
+    with connection(user) as conn:
+        return op(conn, *args)
+
+def _write_done(user, future):
+    with _write_behind_lock:
+        if _pending.get(user) is future:
+            del _pending[user]
+    if future.exception() is not None:
+        logger.error("queued write for %s failed: %s", user, future.exception())
+
+def _wait_for_writes(user):
+    future = _pending.get(user)
+    if future is not None:
+        future.exception()  # waits; a failed write is logged by _write_done, not raised here
+
 # ------------------- INITIALIZE DATABASE -------------------
 def initialize_db():
-    """Create tables if they do not exist yet."""
-    conn = create_connection()
+    """Create tables if they do not exist yet (in every shard when sharded)."""
+    for shard in shard_keys():
+        with connection(shard=shard) as conn:
+            create_schema(conn)
+
+def create_schema(conn):
+    """Create the tables and apply pending migrations on an open connection."""
     c = conn.cursor()
 
     # Food items table
@@ -41,58 +248,523 @@ def initialize_db():
         )
     ''')
 
-    conn.commit()
-    conn.close()
+    # Indexes, derived columns and later schema changes
+    migrate(conn)
+
+# ------------------- DATE HELPERS -------------------
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def to_iso_date(value):
+    """Normalize a date, datetime or ISO string to 'YYYY-MM-DD'."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def to_day_number(value):
+    """Convert a date or ISO string to days since 1970-01-01 (the *_day columns)."""
+    if isinstance(value, str):
+        value = datetime.strptime(value[:10], "%Y-%m-%d").date()
+    elif isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal() - EPOCH_ORDINAL
+
+def from_day_number(day):
+    """Inverse of to_day_number."""
+    return date.fromordinal(day + EPOCH_ORDINAL)
 
 # ------------------- CRUD FOOD ITEMS -------------------
+ITEM_COLUMNS = "id, user, name, category, purchase_date, expiration_date, quantity, unit, price_per_unit"
+
 def insert_food_item(user, name, category, purchase_date, expiration_date, quantity, unit, price_per_unit):
-    conn = create_connection()
-    c = conn.cursor()
-    c.execute("""
+    """Insert one food item (queued when write-behind is on: returns a Future)."""
+    return _write(user, _insert_food_item, user, name, category, purchase_date, expiration_date,
+                  quantity, unit, price_per_unit)
+
+def _insert_food_item(conn, user, name, category, purchase_date, expiration_date, quantity, unit, price_per_unit):
+    conn.execute("""
         INSERT INTO food_items 
         (user, name, category, purchase_date, expiration_date, quantity, unit, price_per_unit)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (user, name, category, purchase_date, expiration_date, quantity, unit, price_per_unit))
-    conn.commit()
-    conn.close()
+    """, (user, name, category, to_iso_date(purchase_date), to_iso_date(expiration_date),
+          quantity, unit, price_per_unit))
+    _bump_data_version(conn, user)
+
+def insert_food_items(items):
+    """Insert many food items in a single transaction with executemany.
+
+    `items` is any iterable (including a generator) of tuples in the
+    insert_food_item argument order. Returns the number of inserted rows.
+    When sharded, the items are grouped per shard, one transaction each.
+    """
+    if shard_map is None:
+        return _insert_food_items(items)
+    by_shard = {}
+    for item in items:
+        by_shard.setdefault(shard_map.shard_for(item[0]), []).append(item)
+    return sum(_insert_food_items(rows, shard) for shard, rows in by_shard.items())
+
+def _insert_food_items(items, shard=None):
+    users = set()
+
+    def rows():
+        for user, name, category, purchase_date, expiration_date, quantity, unit, price_per_unit in items:
+            users.add(user)
+            yield (user, name, category, to_iso_date(purchase_date), to_iso_date(expiration_date),
+                   quantity, unit, price_per_unit)
+
+    with connection(shard=shard) as conn:
+        count = conn.executemany("""
+            INSERT INTO food_items
+            (user, name, category, purchase_date, expiration_date, quantity, unit, price_per_unit)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows()).rowcount
+        for user in users:
+            _bump_data_version(conn, user)
+    return count
+
+def iter_food_items(user=None, batch_size=1000):
+    """Yield food items (ITEM_COLUMNS) one by one, fetching `batch_size` rows at a time.
+
+    Meant for exports: memory stays bounded however large the table is.
+    The connection is held until the generator is exhausted or closed.
+    Without a user, sharded storage yields one shard after the other.
+    """
+    where, params = ("WHERE user = ?", (user,)) if user is not None else ("", ())
+    shards = [shard_of(user)] if user is not None else shard_keys()
+    for shard in shards:
+        with connection(shard=shard) as conn:
+            cursor = conn.execute(f"SELECT {ITEM_COLUMNS} FROM food_items {where} ORDER BY id", params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
 
 def get_all_food_items(user):
     """Retrieve all food items for a given user."""
-    conn = create_connection()
-    c = conn.cursor()
-    c.execute("SELECT * FROM food_items WHERE user = ?", (user,))
-    rows = c.fetchall()
-    conn.close()
-    return rows
-
-def delete_food_item(item_id, user):
-    """Delete a specific food item for a user."""
-    conn = create_connection()
-    c = conn.cursor()
-    c.execute("DELETE FROM food_items WHERE id = ? AND user = ?", (item_id, user))
-    conn.commit()
-    conn.close()
+    with connection(user) as conn:
+        return conn.execute(f"SELECT {ITEM_COLUMNS} FROM food_items WHERE user = ?", (user,)).fetchall()
+
+def delete_food_item(item_id, user, reason=None, today=None):
+    """Delete a specific food item for a user, recording why in the waste ledger.
+
+    `reason` is REASON_CONSUMED or REASON_WASTED; when omitted, items past
+    their expiration date count as wasted. Returns True if an item was deleted
+    (with write-behind on, a Future for that).
+    """
+    return _write(user, _delete_food_item, item_id, user, reason, today)
+
+def _delete_food_item(conn, item_id, user, reason=None, today=None):
+    today = to_day_number(today or date.today())
+    row = conn.execute("""
+        SELECT name, category, quantity, unit, price_per_unit, expiration_day
+        FROM food_items WHERE id = ? AND user = ?
+    """, (item_id, user)).fetchone()
+    if row is None:
+        return False
+    deleted = conn.execute("DELETE FROM food_items WHERE id = ? AND user = ?", (item_id, user)).rowcount
+    if deleted:
+        _record_item_event(conn, user, item_id, row, reason, today)
+        _bump_data_version(conn, user)
+    return bool(deleted)
+
+# ------------------- WASTE LEDGER -------------------
+REASON_CONSUMED = "consumed"
+REASON_WASTED = "wasted"
+
+def _record_item_event(conn, user, item_id, item, reason, today):
+    """Append to item_events and update monthly_waste inside the caller's transaction."""
+    name, category, quantity, unit, price_per_unit, expiration_day = item
+    if reason is None:
+        reason = REASON_WASTED if expiration_day is not None and expiration_day < today else REASON_CONSUMED
+    if reason not in (REASON_CONSUMED, REASON_WASTED):
+        raise ValueError(f"unknown reason {reason!r}")
+    value = (quantity or 0) * (price_per_unit or 0)
+    conn.execute("""
+        INSERT INTO item_events
+        (user, item_id, name, category, reason, quantity, unit, value, expiration_day, event_day)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (user, item_id, name, category, reason, quantity, unit, value, expiration_day, today))
+    wasted = reason == REASON_WASTED
+    conn.execute("""
+        INSERT INTO monthly_waste (user, month, consumed_items, consumed_value, wasted_items, wasted_value)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user, month) DO UPDATE SET
+            consumed_items = consumed_items + excluded.consumed_items,
+            consumed_value = consumed_value + excluded.consumed_value,
+            wasted_items = wasted_items + excluded.wasted_items,
+            wasted_value = wasted_value + excluded.wasted_value
+    """, (user, from_day_number(today).strftime("%Y-%m"),
+          int(not wasted), 0.0 if wasted else value, int(wasted), value if wasted else 0.0))
+
+def get_waste_trend(user, since_month=None, until_month=None):
+    """Monthly (month, consumed_items, consumed_value, wasted_items, wasted_value) rows.
+
+    Read from the monthly_waste aggregates, so the cost depends on the
+    number of months, not on how many items were ever removed. Months are
+    'YYYY-MM' strings; the bounds are inclusive.
+    """
+    with connection(user) as conn:
+        return conn.execute("""
+            SELECT month, consumed_items, consumed_value, wasted_items, wasted_value
+            FROM monthly_waste
+            WHERE user = ? AND month >= ? AND month <= ?
+            ORDER BY month
+        """, (user, since_month or "0000-00", until_month or "9999-99")).fetchall()
+
+def get_item_events(user, limit=100):
+    """Most recent removals from the ledger: (item_id, name, category, reason, value, event date)."""
+    with connection(user) as conn:
+        rows = conn.execute("""
+            SELECT item_id, name, category, reason, value, event_day FROM item_events
+            WHERE user = ? ORDER BY id DESC LIMIT ?
+        """, (user, limit)).fetchall()
+    return [row[:5] + (from_day_number(row[5]),) for row in rows]
+
+# ------------------- DATA VERSIONS -------------------
+def _bump_data_version(conn, user):
+    """Increment a user's data version inside the caller's transaction."""
+    conn.execute("""
+        INSERT INTO data_versions (user, version) VALUES (?, 1)
+        ON CONFLICT (user) DO UPDATE SET version = version + 1
+    """, (user,))
+
+def get_data_version(user):
+    """Return a counter that changes whenever the user's items change."""
+    with connection(user) as conn:
+        row = conn.execute("SELECT version FROM data_versions WHERE user = ?", (user,)).fetchone()
+    return row[0] if row else 0
+
+# ------------------- EXPIRY STATUS -------------------
+STATUS_OK = "✅ OK"
+STATUS_EXPIRING_SOON = "⚠️ Expiring Soon"
+STATUS_EXPIRED = "❌ Expired"
+STATUSES = (STATUS_OK, STATUS_EXPIRING_SOON, STATUS_EXPIRED)
+EXPIRING_SOON_DAYS = 3
+
+# Same thresholds as check_status in app.py: expired before today, expiring
+# soon within EXPIRING_SOON_DAYS days (inclusive), OK afterwards.
+_STATUS_CASE = f"""
+    CASE
+        WHEN expiration_day < :today THEN '{STATUS_EXPIRED}'
+        WHEN expiration_day <= :today + :soon_days THEN '{STATUS_EXPIRING_SOON}'
+        ELSE '{STATUS_OK}'
+    END
+"""
+
+def _status_params(user, today, soon_days):
+    return {"user": user, "today": to_day_number(today or date.today()), "soon_days": soon_days}
+
+def get_food_items_with_status(user, today=None, soon_days=EXPIRING_SOON_DAYS):
+    """Retrieve a user's food items with their status computed in SQL.
+
+    Rows are the ITEM_COLUMNS followed by the status label, relative to
+    `today` (defaults to the current date).
+    """
+    with connection(user) as conn:
+        return conn.execute(
+            f"SELECT {ITEM_COLUMNS}, {_STATUS_CASE} AS status FROM food_items WHERE user = :user",
+            _status_params(user, today, soon_days),
+        ).fetchall()
+
+FOOD_ITEM_COLUMNS = ("id", "name", "category", "purchase_day", "expiration_day",
+                     "quantity", "unit", "price_per_unit", "status")
+
+def get_food_item_columns(user, today=None, soon_days=EXPIRING_SOON_DAYS):
+    """Retrieve a user's food items column by column: {column: tuple of values}.
+
+    Columns are FOOD_ITEM_COLUMNS. Dates are day numbers (see to_day_number),
+    the status is its index in STATUSES, and the user column is left out.
+    """
+    with connection(user) as conn:
+        rows = conn.execute(f"""
+            SELECT id, name, category, purchase_day, expiration_day, quantity, unit, price_per_unit,
+                CASE
+                    WHEN expiration_day < :today THEN {STATUSES.index(STATUS_EXPIRED)}
+                    WHEN expiration_day <= :today + :soon_days THEN {STATUSES.index(STATUS_EXPIRING_SOON)}
+                    ELSE {STATUSES.index(STATUS_OK)}
+                END
+            FROM food_items WHERE user = :user
+        """, _status_params(user, today, soon_days)).fetchall()
+    return dict(zip(FOOD_ITEM_COLUMNS, zip(*rows) if rows else [()] * len(FOOD_ITEM_COLUMNS)))
+
+def count_food_items_by_status(user, today=None, soon_days=EXPIRING_SOON_DAYS):
+    """Return {status: count} for a user's items as of `today`.
+
+    `today` may be any date, past or future, and `soon_days` any horizon.
+    Expired and expiring-soon items are range counts on
+    idx_food_items_user_expiry, so only the rows in those ranges are read.
+    """
+    if soon_days < 0:
+        raise ValueError("soon_days must not be negative")
+    with connection(user) as conn:
+        expired, soon, total = conn.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM food_items WHERE user = :user AND expiration_day < :today),
+                (SELECT COUNT(*) FROM food_items
+                 WHERE user = :user AND expiration_day BETWEEN :today AND :today + :soon_days),
+                (SELECT COUNT(*) FROM food_items WHERE user = :user)
+        """, _status_params(user, today, soon_days)).fetchone()
+    return {STATUS_OK: total - expired - soon, STATUS_EXPIRING_SOON: soon, STATUS_EXPIRED: expired}
+
+def get_expiry_histogram(user, today=None, horizon=14, bucket_days=1, past_days=0):
+    """Count a user's items by days to expiry: [(first day of bucket, items)].
+
+    Buckets of `bucket_days` days cover -past_days to `horizon` days from
+    `today` (any date), empty buckets included. Day 0 expires on `today`,
+    day -2 expired two days before. One range query on
+    idx_food_items_user_expiry, grouped in SQL.
+    """
+    if horizon < 0 or past_days < 0 or bucket_days < 1:
+        raise ValueError("horizon and past_days must not be negative, bucket_days must be positive")
+    start = to_day_number(today or date.today()) - past_days
+    counts = [0] * ((past_days + horizon) // bucket_days + 1)
+    with connection(user) as conn:
+        for bucket, items in conn.execute("""
+            SELECT (expiration_day - :start) / :bucket_days, COUNT(*)
+            FROM food_items
+            WHERE user = :user AND expiration_day BETWEEN :start AND :start + :span
+            GROUP BY 1
+        """, {"user": user, "start": start, "span": past_days + horizon, "bucket_days": bucket_days}):
+            counts[bucket] = items
+    return [(i * bucket_days - past_days, items) for i, items in enumerate(counts)]
+
+# ------------------- PAGINATION & SEARCH -------------------
+_STATUS_RANGES = {
+    STATUS_EXPIRED: "expiration_day < :today",
+    STATUS_EXPIRING_SOON: "expiration_day BETWEEN :today AND :today + :soon_days",
+    STATUS_OK: "(expiration_day > :today + :soon_days OR expiration_day IS NULL)",
+}
+
+def _escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _item_filters(user, search, statuses, today, soon_days):
+    """WHERE clause and parameters shared by the paginated queries."""
+    params = _status_params(user, today, soon_days)
+    clauses = ["user = :user"]
+    if search:
+        clauses.append("name LIKE :search ESCAPE '\\'")
+        params["search"] = f"%{_escape_like(search.strip())}%"
+    if statuses:
+        clauses.append("(" + " OR ".join(_STATUS_RANGES[s] for s in statuses) + ")")
+    return " AND ".join(clauses), params
+
+def get_food_items_page(user, limit=20, after_id=None, search=None, statuses=None,
+                        today=None, soon_days=EXPIRING_SOON_DAYS):
+    """Return one page of a user's items (ITEM_COLUMNS + status), ordered by id.
+
+    Keyset pagination: pass the id of the last row of the previous page as
+    `after_id`. The cost of a page does not depend on how deep it is.
+    `search` matches names case-insensitively; `statuses` keeps only those.
+    """
+    where, params = _item_filters(user, search, statuses, today, soon_days)
+    if after_id is not None:
+        where += " AND id > :after_id"
+        params["after_id"] = after_id
+    params["limit"] = limit
+    with connection(user) as conn:
+        return conn.execute(f"""
+            SELECT {ITEM_COLUMNS}, {_STATUS_CASE} AS status FROM food_items
+            WHERE {where} ORDER BY id LIMIT :limit
+        """, params).fetchall()
+
+def count_food_items(user, search=None, statuses=None, today=None, soon_days=EXPIRING_SOON_DAYS):
+    """Number of a user's items matching the same filters as get_food_items_page."""
+    where, params = _item_filters(user, search, statuses, today, soon_days)
+    with connection(user) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM food_items WHERE {where}", params).fetchone()[0]
+
+# Up to this many items, scanning a user's rows (user index) beats the
+# food_items_fts trigram index, whose matches span every user
+SEARCH_SCAN_ITEMS = 2000
+SEARCH_FUZZY_CANDIDATES = 500
+_ITEM_COLUMNS_F = ", ".join(f"f.{column}" for column in ITEM_COLUMNS.split(", "))
+
+def _fts_phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+def _fuzzy_pieces(query):
+    """For each character of the query, the text before and after it (pieces under 3 characters dropped).
+
+    A name is a fuzzy match when it contains both pieces of one pair: the
+    query with one wrong, missing or extra character.
+    """
+    query = query.lower()
+    pairs = {tuple(p for p in (query[:i], query[i + 1:]) if len(p) >= 3) for i in range(len(query))}
+    return sorted(pair for pair in pairs if pair)
+
+def _trigrams(text):
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def search_food_items(user, query, limit=20, fuzzy=True, today=None, soon_days=EXPIRING_SOON_DAYS):
+    """Find a user's items whose name or category contains `query`, in any case.
+
+    Returns rows like get_food_items_page, ordered by id. With `fuzzy`, a query
+    of 4+ characters that matches nothing is retried allowing one wrong,
+    missing or extra character ("yoghurt" finds "Yogurt"); those rows come
+    best match first. Large inventories are searched through the
+    food_items_fts trigram index, small ones by scanning the user's rows.
+    """
+    query = query.strip()
+    if not query:
+        return []
+    params = _status_params(user, today, soon_days)
+    with connection(user) as conn:
+        indexed = len(query) >= 3 and conn.execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM food_items WHERE user = ? LIMIT ?)",
+            (user, SEARCH_SCAN_ITEMS + 1)).fetchone()[0] > SEARCH_SCAN_ITEMS
+        if indexed:
+            params.update(match=_fts_phrase(query), limit=limit)
+            rows = conn.execute(f"""
+                SELECT {_ITEM_COLUMNS_F}, {_STATUS_CASE} AS status
+                FROM food_items_fts JOIN food_items f ON f.id = food_items_fts.rowid
+                WHERE food_items_fts MATCH :match AND f.user = :user
+                ORDER BY food_items_fts.rowid LIMIT :limit
+            """, params).fetchall()
+        else:
+            params.update(search=f"%{_escape_like(query)}%", limit=limit)
+            rows = conn.execute(f"""
+                SELECT {ITEM_COLUMNS}, {_STATUS_CASE} AS status FROM food_items
+                WHERE user = :user AND (name LIKE :search ESCAPE '\\' OR category LIKE :search ESCAPE '\\')
+                ORDER BY id LIMIT :limit
+            """, params).fetchall()
+        if rows or not fuzzy or len(query) < 4:
+            return rows
+
+        pairs = _fuzzy_pieces(query)
+        if indexed:
+            params.update(match="name : (" + " OR ".join(
+                "(" + " AND ".join(map(_fts_phrase, pair)) + ")" for pair in pairs) + ")",
+                limit=SEARCH_FUZZY_CANDIDATES)
+            candidates = conn.execute(f"""
+                SELECT {_ITEM_COLUMNS_F}, {_STATUS_CASE} AS status
+                FROM food_items_fts JOIN food_items f ON f.id = food_items_fts.rowid
+                WHERE food_items_fts MATCH :match AND f.user = :user
+                ORDER BY food_items_fts.rowid LIMIT :limit
+            """, params).fetchall()
+        else:
+            candidates = [row for row in conn.execute(
+                f"SELECT {ITEM_COLUMNS}, {_STATUS_CASE} AS status FROM food_items WHERE user = :user ORDER BY id",
+                params) if any(all(p in row[2].lower() for p in pair) for pair in pairs)]
+    wanted = _trigrams(query)
+    candidates.sort(key=lambda row: (-len(wanted & _trigrams(row[2])), row[0]))
+    return candidates[:limit]
+
+def aggregate_food_items(user=None, today=None, soon_days=EXPIRING_SOON_DAYS):
+    """Per (user, category) statistics computed with one GROUP BY.
+
+    Returns rows of (user, category, total_items, expired_items,
+    expiring_soon_items, ok_items, lost_value, value_at_risk). Pass `user`
+    to restrict the result to a single user; without it, sharded storage
+    queries every shard in parallel.
+    """
+    params = _status_params(user, today, soon_days)
+    params.update(expired=STATUS_EXPIRED, soon=STATUS_EXPIRING_SOON, ok=STATUS_OK)
+    if user is None and shard_map is not None:
+        # A user lives in one shard, so the per-shard groups never overlap
+        return [row for rows in _map_shards(lambda shard: _aggregate(params, "", shard)) for row in rows]
+    return _aggregate(params, "WHERE user = :user" if user is not None else "", shard_of(user))
+
+def _aggregate(params, where, shard):
+    with connection(shard=shard) as conn:
+        return conn.execute(f"""
+            SELECT user, category,
+                   COUNT(*),
+                   SUM(status = :expired),
+                   SUM(status = :soon),
+                   SUM(status = :ok),
+                   COALESCE(SUM(CASE WHEN status = :expired THEN value END), 0.0),
+                   COALESCE(SUM(CASE WHEN status = :soon THEN value END), 0.0)
+            FROM (
+                SELECT user, category, quantity * price_per_unit AS value, {_STATUS_CASE} AS status
+                FROM food_items {where}
+            )
+            GROUP BY user, category
+        """, params).fetchall()
+
+# ------------------- NOTIFICATIONS -------------------
+NOTIFY_EXPIRING_SOON = "expiring_soon"
+NOTIFY_EXPIRED = "expired"
+
+def get_notifications(user, unread_only=True, limit=50):
+    """Precomputed expiry events for a user, newest first.
+
+    Rows are (id, item_id, item name, kind, expiration_date, created_at,
+    read_at). Events of items that have since been deleted are skipped, and
+    an item id is only resolved among the user's own items.
+    """
+    unread = "AND n.read_at IS NULL" if unread_only else ""
+    with connection(user) as conn:
+        return conn.execute(f"""
+            SELECT n.id, n.item_id, f.name, n.kind, f.expiration_date, n.created_at, n.read_at
+            FROM notifications n JOIN food_items f ON f.id = n.item_id AND f.user = n.user
+            WHERE n.user = ? {unread}
+            ORDER BY n.id DESC LIMIT ?
+        """, (user, limit)).fetchall()
+
+def mark_notifications_read(user, ids=None):
+    """Mark some (or all) of a user's notifications as read."""
+    with connection(user) as conn:
+        if ids is None:
+            conn.execute("UPDATE notifications SET read_at = CURRENT_TIMESTAMP WHERE user = ? AND read_at IS NULL",
+                         (user,))
+        else:
+            conn.executemany("UPDATE notifications SET read_at = CURRENT_TIMESTAMP WHERE user = ? AND id = ?",
+                             [(user, i) for i in ids])
 
 # ------------------- USER MANAGEMENT -------------------
 def add_user(username, password):
-    """Add a new user with a hashed password."""
-    conn = create_connection()
-    c = conn.cursor()
-    password_hash = hashlib.sha256(password.encode()).hexdigest()
+    """Add a new user with a salted, slow password hash."""
+    password_hash = passwords.hash_password(password)
+    with connection(username) as conn:
+        _insert_user(conn, username, password_hash)
+
+def _insert_user(conn, username, password_hash):
     try:
-        c.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, password_hash))
-        conn.commit()
+        conn.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, password_hash))
     except sqlite3.IntegrityError:
         pass  # Username already exists
-    conn.close()
 
 def check_user_credentials(username, password):
-    """Check if the provided username and password are correct."""
-    conn = create_connection()
-    c = conn.cursor()
-    c.execute("SELECT password_hash FROM users WHERE username = ?", (username,))
-    row = c.fetchone()
-    conn.close()
-    if row:
-        return row[0] == hashlib.sha256(password.encode()).hexdigest()
-    return False
\ No newline at end of file
+    """Check if the provided username and password are correct.
+
+    Legacy SHA-256 hashes (and hashes with outdated cost settings) are
+    replaced by a fresh scrypt hash after a successful login.
+    """
+    with connection(username) as conn:
+        row = conn.execute("SELECT password_hash FROM users WHERE username = ?", (username,)).fetchone()
+    if not row:
+        return False
+    stored = row[0]
+    if passwords.login_cache.check(username, password, stored):
+        return True
+    ok, needs_rehash = passwords.verify_password(password, stored)
+    if not ok:
+        return False
+    if needs_rehash:
+        new_hash = passwords.hash_password(password)
+        with connection(username) as conn:
+            # Only replace the hash we verified, in case it changed meanwhile
+            conn.execute("UPDATE users SET password_hash = ? WHERE username = ? AND password_hash = ?",
+                         (new_hash, username, stored))
+        stored = new_hash
+    passwords.login_cache.add(username, password, stored)
+    return True
+
+# ------------------- INSTRUMENTATION -------------------
+# Time every public function (no-op unless metrics are enabled). Plumbing and
+# tiny helpers are skipped; create_connection must stay unwrapped because the
+# tests replace it and connection() compares it with the default.
+metrics.instrument_module(globals(), "db_call_seconds", rows="db_rows_total", skip=(
+    "create_connection", "configure_shards", "shard_of", "shard_keys", "get_pool", "close_pool",
+    "connection", "create_schema", "to_iso_date", "to_day_number", "from_day_number",
+    "enable_write_behind", "disable_write_behind", "write_behind_stats",
+))
+
+if os.environ.get("WASTED_WRITE_BEHIND"):
+    enable_write_behind(float(os.environ.get("WASTED_WRITE_BEHIND_MS", BATCH_WINDOW * 1000)) / 1000,
+                        int(os.environ.get("WASTED_WRITE_BEHIND_BATCH", MAX_BATCH)))
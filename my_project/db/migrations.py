@@ -0,0 +1,181 @@
+"""Versioned schema migrations.
+
+The schema version lives in ``PRAGMA user_version``. Each migration is a
+function registered with ``@migration(n)``; ``migrate()`` applies the ones
+newer than the stored version, each inside its own transaction together with
+the version bump, so a crash never leaves a half-applied step behind. The
+transactions are IMMEDIATE and re-check the version, so processes or
+sessions initializing the same database at once apply each step only once.
+"""
+
+MIGRATIONS = {}
+
+
+def migration(version):
+    """Register a migration that brings the schema to ``version``."""
+    def decorator(func):
+        if version in MIGRATIONS:
+            raise ValueError(f"duplicate migration version {version}")
+        MIGRATIONS[version] = func
+        return func
+    return decorator
+
+
+def latest_version():
+    return max(MIGRATIONS, default=0)
+
+
+def current_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Apply pending migrations and return the resulting schema version."""
+    version = current_version(conn)
+    for target in sorted(v for v in MIGRATIONS if v > version):
+        if conn.in_transaction:
+            conn.commit()
+        # IMMEDIATE takes the write lock before the version is read again, so
+        # a concurrent migrate() waits here and then skips the applied step
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if current_version(conn) < target:
+                MIGRATIONS[target](conn)
+                conn.execute(f"PRAGMA user_version = {int(target)}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        version = target
+    return version
+
+
+# ------------------- MIGRATIONS -------------------
+# Dates are stored as ISO strings; day numbers (days since 1970-01-01) sort
+# and compare as integers, so range queries can use an index.
+_DAY_NUMBER = "CAST(julianday({column}) - 2440587.5 AS INTEGER)"
+
+
+@migration(1)
+def _add_day_numbers_and_indexes(conn):
+    for column in ("purchase_date", "expiration_date"):
+        day_column = column.replace("_date", "_day")
+        conn.execute(f"""
+            ALTER TABLE food_items ADD COLUMN {day_column} INTEGER
+            GENERATED ALWAYS AS ({_DAY_NUMBER.format(column=column)}) VIRTUAL
+        """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_food_items_user_expiry ON food_items (user, expiration_day)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_food_items_user_category ON food_items (user, category)")
+
+
+@migration(2)
+def _add_data_versions(conn):
+    # Per-user change counter, bumped in the same transaction as every write
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS data_versions (
+            user TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+
+
+@migration(3)
+def _add_user_index(conn):
+    # (user, rowid) order: keyset pagination by id without a sort step
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_food_items_user ON food_items (user)")
+
+
+@migration(4)
+def _add_notifications(conn):
+    # Events written by the background expiry scanner (my_project.scanner)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            expiration_day INTEGER,
+            scan_day INTEGER NOT NULL,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            read_at TEXT,
+            UNIQUE (item_id, kind)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications (user, read_at)")
+    # One row per scan day; the cursor makes an interrupted scan resumable
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scan_state (
+            scan_day INTEGER PRIMARY KEY,
+            cursor_day INTEGER,
+            cursor_id INTEGER NOT NULL DEFAULT 0,
+            events INTEGER NOT NULL DEFAULT 0,
+            finished_at TEXT
+        )
+    """)
+    # Date-range scans across all users
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_food_items_expiry ON food_items (expiration_day)")
+
+
+@migration(5)
+def _add_waste_ledger(conn):
+    # Append-only log of why items left the fridge
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS item_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            category TEXT,
+            reason TEXT NOT NULL,
+            quantity REAL,
+            unit TEXT,
+            value REAL NOT NULL,
+            expiration_day INTEGER,
+            event_day INTEGER NOT NULL,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_item_events_user_day ON item_events (user, event_day)")
+    # Per-user, per-month totals maintained in the same transaction as each event
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS monthly_waste (
+            user TEXT NOT NULL,
+            month TEXT NOT NULL,
+            consumed_items INTEGER NOT NULL DEFAULT 0,
+            consumed_value REAL NOT NULL DEFAULT 0,
+            wasted_items INTEGER NOT NULL DEFAULT 0,
+            wasted_value REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (user, month)
+        ) WITHOUT ROWID
+    """)
+
+
+@migration(6)
+def _add_item_search(conn):
+    # Trigram full-text index over item names and categories: substring and
+    # typo-tolerant search (database.search_food_items). External content, so
+    # the text is stored once, in food_items; triggers keep the index in sync.
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS food_items_fts USING fts5(
+            name, category, content='food_items', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS food_items_fts_insert AFTER INSERT ON food_items BEGIN
+            INSERT INTO food_items_fts (rowid, name, category) VALUES (new.id, new.name, new.category);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS food_items_fts_delete AFTER DELETE ON food_items BEGIN
+            INSERT INTO food_items_fts (food_items_fts, rowid, name, category)
+            VALUES ('delete', old.id, old.name, old.category);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS food_items_fts_update AFTER UPDATE OF name, category ON food_items BEGIN
+            INSERT INTO food_items_fts (food_items_fts, rowid, name, category)
+            VALUES ('delete', old.id, old.name, old.category);
+            INSERT INTO food_items_fts (rowid, name, category) VALUES (new.id, new.name, new.category);
+        END
+    """)
+    conn.execute("INSERT INTO food_items_fts (food_items_fts) VALUES ('rebuild')")
@@ -0,0 +1,127 @@
+"""Password hashing with a salted, slow KDF (scrypt) and a verified-login cache.
+
+Stored hashes are versioned strings::
+
+    scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>
+
+Hashes written by older releases are bare hex SHA-256 digests; they still
+verify, and `verify_password` reports that they need rehashing so callers
+can upgrade them transparently at the next successful login.
+"""
+import os
+import hmac
+import time
+import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# ------------------- KDF SETTINGS -------------------
+SCRYPT_N = 2 ** 14   # CPU/memory cost (16 MB with r=8)
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+# scrypt releases the GIL; the pool bounds how many run at once so a burst
+# of logins cannot take every core (and 16 MB each) from the other sessions.
+KDF_WORKERS = min(4, os.cpu_count() or 1)
+_kdf_pool = ThreadPoolExecutor(max_workers=KDF_WORKERS, thread_name_prefix="kdf")
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r, dklen=HASH_BYTES)
+
+
+def _run_kdf(*args):
+    return _kdf_pool.submit(_scrypt, *args).result()
+
+
+def hash_password(password, n=None):
+    """Return a new salted scrypt hash string for `password`."""
+    n = n or SCRYPT_N
+    salt = os.urandom(SALT_BYTES)
+    digest = _run_kdf(password, salt, n, SCRYPT_R, SCRYPT_P)
+    return f"scrypt${n}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+
+
+def is_legacy_hash(stored):
+    return "$" not in stored
+
+
+def verify_password(password, stored):
+    """Check `password` against a stored hash.
+
+    Returns (ok, needs_rehash): needs_rehash is True when the hash is a
+    legacy SHA-256 digest or uses other cost settings than the current ones.
+    """
+    if is_legacy_hash(stored):
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(candidate, stored), True
+    try:
+        scheme, n, r, p, salt, digest = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+        salt, digest = base64.b64decode(salt), base64.b64decode(digest)
+    except ValueError:
+        return False, False
+    if scheme != "scrypt":
+        return False, False
+    ok = hmac.compare_digest(_run_kdf(password, salt, n, r, p), digest)
+    return ok, (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+# ------------------- VERIFIED-LOGIN CACHE -------------------
+class LoginCache:
+    """Short-lived memory of successful verifications.
+
+    Streamlit reruns can re-check the same credentials many times in a few
+    seconds; a hit skips the KDF. Keys are HMACs under a per-process secret
+    over (username, password, stored hash), so no password is kept in memory
+    and a password change (new stored hash) never matches an old entry.
+    """
+
+    def __init__(self, ttl=300, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._secret = os.urandom(32)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _key(self, username, password, stored):
+        message = "\0".join((username, password, stored)).encode()
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+
+    def check(self, username, password, stored):
+        key = self._key(username, password, stored)
+        with self._lock:
+            expires = self._entries.get(key)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._entries[key]
+                return False
+            return True
+
+    def add(self, username, password, stored):
+        key = self._key(username, password, stored)
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.maxsize:
+                for k in [k for k, expires in self._entries.items() if expires < now]:
+                    del self._entries[k]
+                if len(self._entries) >= self.maxsize:
+                    # Still full: drop the oldest insertion
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = now + self.ttl
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+login_cache = LoginCache()
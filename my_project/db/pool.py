@@ -0,0 +1,117 @@
+import sqlite3
+import queue
+import threading
+from contextlib import contextmanager
+
+# ------------------- PRAGMAS -------------------
+# WAL lets readers run while a writer commits; NORMAL only fsyncs at checkpoints.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-8000",       # ~8 MB page cache per connection
+    "PRAGMA mmap_size=67108864",     # 64 MB memory-mapped I/O
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+class PoolClosedError(RuntimeError):
+    """Raised when a connection is requested from a pool that was shut down."""
+
+
+# ------------------- CONNECTION POOL -------------------
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections to a single database file.
+
+    Connections are checked out by one thread at a time and handed back
+    afterwards, so the page cache and the per-connection statement cache
+    survive between calls instead of being rebuilt on every query.
+    """
+
+    def __init__(self, path, max_size=8, timeout=10.0, cached_statements=256):
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._connections = set()
+        self._closed = False
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            check_same_thread=False,  # a connection may be used by any thread that checks it out
+            cached_statements=self.cached_statements,
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self._connections.add(conn)
+        return conn
+
+    def acquire(self):
+        """Check out a connection, opening a new one if none is idle."""
+        if self._closed:
+            raise PoolClosedError("connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"no connection available after {self.timeout}s")
+        try:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        """Return a checked-out connection to the pool."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed:
+                self._discard(conn)
+            else:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def _discard(self, conn):
+        with self._lock:
+            self._connections.discard(conn)
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        """Yield a pooled connection inside a transaction.
+
+        The transaction is committed when the block exits normally and
+        rolled back if it raises.
+        """
+        conn = self.acquire()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close idle connections; busy ones are closed when released."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def __len__(self):
+        with self._lock:
+            return len(self._connections)
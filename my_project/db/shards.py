@@ -0,0 +1,197 @@
+"""Sharding users across several SQLite files.
+
+SQLite has one writer per file, so with a single file every user's insert
+waits for everybody else's. In sharded mode a directory holds N files,
+``shard-000.db`` to ``shard-<N-1>.db``, plus a ``shards.json`` directory
+file. Each user lives entirely in one shard (items, account, ledger,
+notifications), chosen by a stable CRC-32 of the username or by an explicit
+pin in the directory file, so per-user queries touch exactly one file.
+
+`rebalance` moves users whenever the layout changes: it splits the single
+file into shards, or goes from N to M shards. Moved items get new ids in
+their new shard. Item ids are only unique within a shard and are always used
+together with the user.
+"""
+import os
+import json
+import sqlite3
+import zlib
+
+from my_project.db.migrations import migrate
+
+DIRECTORY_FILE = "shards.json"
+
+
+def shard_for(user, count):
+    """Stable shard index of a user (unlike hash(), the same in every process)."""
+    return zlib.crc32(user.encode("utf-8")) % count
+
+
+# ------------------- SHARD MAP -------------------
+class ShardMap:
+    """Routing table: which file of `directory` holds a given user."""
+
+    def __init__(self, directory, count, pins=None):
+        if count < 1:
+            raise ValueError("the number of shards must be at least 1")
+        self.directory = directory
+        self.count = count
+        self.pins = dict(pins or {})
+        for user, shard in self.pins.items():
+            if not 0 <= shard < count:
+                raise ValueError(f"user {user!r} is pinned to shard {shard}, which does not exist")
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, DIRECTORY_FILE), encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(directory, config["count"], config.get("pins"))
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, DIRECTORY_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"count": self.count, "pins": self.pins}, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def shard_for(self, user):
+        shard = self.pins.get(user)
+        return shard if shard is not None else shard_for(user, self.count)
+
+    def path(self, shard):
+        return os.path.join(self.directory, f"shard-{shard:03d}.db")
+
+    def paths(self):
+        return [self.path(shard) for shard in range(self.count)]
+
+
+# ------------------- REBALANCING -------------------
+# Per-user tables and the columns copied when a user moves (ids are reassigned)
+_USER_TABLES = {
+    "users": ("username", "username, password_hash"),
+    "food_items": ("user", "user, name, category, purchase_date, expiration_date, quantity, unit, price_per_unit"),
+    "notifications": ("user", "user, item_id, kind, expiration_day, scan_day, created_at, read_at"),
+    "item_events": ("user", "user, item_id, name, category, reason, quantity, unit, value, expiration_day, "
+                            "event_day, created_at"),
+    "monthly_waste": ("user", "user, month, consumed_items, consumed_value, wasted_items, wasted_value"),
+    "data_versions": ("user", "user, version"),
+}
+
+
+def _users_in(conn):
+    selects = " UNION ".join(f"SELECT {column} FROM {table}" for table, (column, _) in _USER_TABLES.items())
+    return [row[0] for row in conn.execute(selects)]
+
+
+def _move_user(conn, user):
+    """Move every row of `user` from the attached `src` database into main."""
+    ids = {}
+    for old_id, *values in conn.execute(f"SELECT id, {_USER_TABLES['food_items'][1]} FROM src.food_items "
+                                        "WHERE user = ? ORDER BY id", (user,)).fetchall():
+        cursor = conn.execute(f"INSERT INTO main.food_items ({_USER_TABLES['food_items'][1]}) "
+                              "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values)
+        ids[old_id] = cursor.lastrowid
+    # NULL for items that are gone: their old id may be another user's item here
+    conn.create_function("moved_id", 1, ids.get, deterministic=True)
+
+    conn.execute(f"INSERT OR IGNORE INTO main.users ({_USER_TABLES['users'][1]}) "
+                 f"SELECT {_USER_TABLES['users'][1]} FROM src.users WHERE username = ?", (user,))
+    # Notifications of deleted items are dropped, ledger rows keep their history with item_id 0
+    for table, item_id, condition in (("notifications", "moved_id(item_id)", "AND moved_id(item_id) IS NOT NULL"),
+                                      ("item_events", "COALESCE(moved_id(item_id), 0)", "")):
+        columns = _USER_TABLES[table][1]
+        selected = columns.replace("item_id", item_id)
+        conn.execute(f"INSERT OR IGNORE INTO main.{table} ({columns}) "
+                     f"SELECT {selected} FROM src.{table} WHERE user = ? {condition}", (user,))
+    conn.execute("""
+        INSERT INTO main.monthly_waste (user, month, consumed_items, consumed_value, wasted_items, wasted_value)
+        SELECT user, month, consumed_items, consumed_value, wasted_items, wasted_value
+        FROM src.monthly_waste WHERE user = ?
+        ON CONFLICT (user, month) DO UPDATE SET
+            consumed_items = consumed_items + excluded.consumed_items,
+            consumed_value = consumed_value + excluded.consumed_value,
+            wasted_items = wasted_items + excluded.wasted_items,
+            wasted_value = wasted_value + excluded.wasted_value
+    """, (user,))
+    # Bump the version so cached views of this user are rebuilt
+    conn.execute("""
+        INSERT INTO main.data_versions (user, version)
+        SELECT ?, COALESCE((SELECT version FROM src.data_versions WHERE user = ?), 0) + 1
+        ON CONFLICT (user) DO UPDATE SET version = MAX(version, excluded.version) + 1
+    """, (user, user))
+
+    for table, (column, _) in _USER_TABLES.items():
+        conn.execute(f"DELETE FROM src.{table} WHERE {column} = ?", (user,))
+    return len(ids)
+
+
+def _prepare(path):
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        from my_project.db import database
+        database.create_schema(conn)
+    finally:
+        conn.close()
+
+
+def rebalance(shard_map, sources=(), progress=None):
+    """Move users so that every user lives in the shard `shard_map` assigns.
+
+    Looks at the shard files already in the directory and at the extra
+    `sources` (e.g. the single-file database being split). Returns the
+    number of users moved. Each user moves in one transaction spanning both
+    files; the files use a rollback journal while this runs so that the
+    transaction is atomic across them. Stop the app and the API first.
+    """
+    shard_map.save()
+    targets = shard_map.paths()
+    for path in targets:
+        _prepare(path)
+    existing = sorted(os.path.join(shard_map.directory, name) for name in os.listdir(shard_map.directory)
+                      if name.startswith("shard-") and name.endswith(".db"))
+    candidates = [p for p in dict.fromkeys([*sources, *existing]) if os.path.exists(p)]
+
+    moved = 0
+    for source in candidates:
+        conn = sqlite3.connect(source, isolation_level=None)
+        try:
+            migrate(conn)
+            users = _users_in(conn)
+        finally:
+            conn.close()
+        by_target = {}
+        for user in users:
+            target = targets[shard_map.shard_for(user)]
+            if os.path.abspath(target) != os.path.abspath(source):
+                by_target.setdefault(target, []).append(user)
+
+        for target, group in by_target.items():
+            conn = sqlite3.connect(target, isolation_level=None)
+            try:
+                conn.execute("ATTACH DATABASE ? AS src", (source,))
+                # WAL transactions are only atomic per file; with a rollback
+                # journal the commit is atomic across main and src. The pool
+                # switches the files back to WAL when it next opens them.
+                conn.execute("PRAGMA main.journal_mode=DELETE")
+                conn.execute("PRAGMA src.journal_mode=DELETE")
+                for user in group:
+                    conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        items = _move_user(conn, user)
+                        conn.execute("COMMIT")
+                    except BaseException:
+                        conn.execute("ROLLBACK")
+                        raise
+                    moved += 1
+                    if progress:
+                        progress(user, source, target, items)
+            finally:
+                conn.close()
+
+    # Shards beyond the new count are empty now
+    for path in existing:
+        if path not in targets:
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+    return moved
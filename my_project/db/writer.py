@@ -0,0 +1,142 @@
+"""A dedicated writer thread that groups concurrent writes into one transaction.
+
+SQLite allows one writer at a time, and each commit pays for a WAL sync.
+Writes submitted within `batch_window` seconds of each other (up to
+`max_batch`) are applied by a single thread in one transaction. Each write
+runs inside its own SAVEPOINT, so a failing write is rolled back and reported
+to its caller without affecting the rest of the batch. Futures are resolved
+only after the batch has committed.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+BATCH_WINDOW = 0.002  # seconds to wait for more writes after the first one
+MAX_BATCH = 256
+
+_STOP = object()
+
+
+def _flush_marker(conn):
+    """Queued by flush(); resolved with its batch but not counted as a write."""
+
+
+class WriterClosedError(RuntimeError):
+    """Raised when submitting to a writer that has been closed."""
+
+
+class BatchWriter:
+    """Apply `op(conn, *args)` calls from any thread on a single writer thread.
+
+    `connect` is a context manager factory yielding a connection inside a
+    transaction, such as database.connection.
+    """
+
+    def __init__(self, connect, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH, name="db-writer"):
+        self.connect = connect
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.writes = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, op, *args, **kwargs):
+        """Queue a write and return a concurrent.futures.Future for its result."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise WriterClosedError("the writer has been closed")
+            self._queue.put((future, op, args, kwargs))
+        return future
+
+    def flush(self):
+        """Block until every write submitted so far has been committed."""
+        self.submit(_flush_marker).result()
+
+    def close(self):
+        """Commit the pending writes and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "writes": self.writes,
+            "mean_batch": self.writes / self.batches if self.batches else 0.0,
+        }
+
+    # ------------------- WRITER THREAD -------------------
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stop = self._collect(item)
+            self._execute(batch)
+
+    def _execute(self, batch):
+        outcomes = []
+        writes = 0
+        try:
+            with self.connect() as conn:
+                # Take the write lock up front instead of upgrading a read lock mid-batch
+                conn.execute("BEGIN IMMEDIATE")
+                for future, op, args, kwargs in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    if op is _flush_marker:
+                        outcomes.append((future, None, True))
+                        continue
+                    writes += 1
+                    conn.execute("SAVEPOINT write")
+                    try:
+                        result = op(conn, *args, **kwargs)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO write")
+                        conn.execute("RELEASE write")
+                        outcomes.append((future, e, False))
+                    else:
+                        conn.execute("RELEASE write")
+                        outcomes.append((future, result, True))
+        except Exception as e:
+            # BEGIN or COMMIT failed: nothing in this batch was written
+            for future, *_ in batch:
+                if not future.done() and (future.running() or future.set_running_or_notify_cancel()):
+                    future.set_exception(e)
+            return
+        if writes:
+            self.batches += 1
+            self.writes += writes
+        for future, value, ok in outcomes:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
@@ -0,0 +1,164 @@
+"""Inventory, expiry status and waste statistics logic behind the Streamlit app.
+
+Importing this module has no side effects and stays cheap: pandas and numpy
+are imported inside the functions that need them, and the database is only
+touched when a function is called. app.py is a thin UI on top of it.
+"""
+from datetime import datetime
+
+from my_project.db.database import (
+    get_food_items_with_status,
+    get_food_item_columns,
+    aggregate_food_items,
+    STATUS_OK,
+    STATUS_EXPIRING_SOON,
+    STATUS_EXPIRED,
+    STATUSES,
+    EXPIRING_SOON_DAYS,
+)
+
+# ------------------- STATISTICS -------------------
+STAT_COLUMNS = ["total_items", "expired_items", "expiring_soon_items", "ok_items", "lost_value", "value_at_risk"]
+FALLBACK_ITEM_VALUE = 2.5  # used when the data carries no prices
+# The UI frame and the tests use different names for the value columns
+_VALUE_COLUMNS = {"Quantity": "quantity", "Price per Unit": "price_per_unit"}
+
+
+def _partial_statistics(df, by):
+    """Aggregate one DataFrame into STAT_COLUMNS, grouped by the `by` columns."""
+    import pandas as pd
+
+    df = df.rename(columns=_VALUE_COLUMNS)
+    status = df["Status"]
+    expired = status == STATUS_EXPIRED
+    soon = status == STATUS_EXPIRING_SOON
+    if "price_per_unit" in df.columns:
+        # Sum in float64 even when the frame stores float32 (see load_typed_inventory)
+        value = df["quantity"].astype("float64") * df["price_per_unit"].astype("float64")
+    else:
+        value = pd.Series(FALLBACK_ITEM_VALUE, index=df.index)
+    frame = pd.DataFrame({
+        "total_items": 1,
+        "expired_items": expired.astype(int),
+        "expiring_soon_items": soon.astype(int),
+        "ok_items": (status == STATUS_OK).astype(int),
+        "lost_value": value.where(expired, 0.0),
+        "value_at_risk": value.where(soon, 0.0),
+    }, index=df.index)
+    if not by:
+        return frame.sum().to_frame().T
+    return frame.join(df[list(by)]).groupby(list(by), observed=True, dropna=False).sum()
+
+
+def grouped_statistics(source, by=None):
+    """Counts, lost value and value at risk (expiring soon) per group in one pass.
+
+    `source` is a DataFrame or an iterable of DataFrame chunks; chunk results
+    are combined without materializing the whole data set. `by` defaults to
+    whichever of "User" and "Category" are present. For the SQL-side GROUP BY
+    backend see `sql_statistics`.
+    """
+    import pandas as pd
+
+    chunks = [source] if isinstance(source, pd.DataFrame) else source
+    partials = []
+    for chunk in chunks:
+        keys = by if by is not None else [c for c in ("User", "Category") if c in chunk.columns]
+        partials.append(_partial_statistics(chunk, keys))
+        if len(partials) > 1:
+            # Keep memory bounded: fold every new chunk into the running total
+            combined = pd.concat(partials)
+            partials = [combined.groupby(level=list(range(combined.index.nlevels)), dropna=False).sum()
+                        if keys else combined.sum().to_frame().T]
+    if not partials:
+        return pd.DataFrame(columns=STAT_COLUMNS)
+    return partials[0][STAT_COLUMNS]
+
+
+def sql_statistics(user=None, today=None):
+    """Same result as grouped_statistics, computed by SQLite with GROUP BY."""
+    import pandas as pd
+
+    rows = aggregate_food_items(user, today)
+    return pd.DataFrame(rows, columns=["User", "Category"] + STAT_COLUMNS).set_index(["User", "Category"])
+
+
+def calculate_statistics(df):
+    """Return (total items, expired items, OK or expiring soon items, lost value)."""
+    totals = grouped_statistics(df, by=[]).iloc[0]
+    ok_items = totals["ok_items"] + totals["expiring_soon_items"]
+    return int(totals["total_items"]), int(totals["expired_items"]), int(ok_items), float(totals["lost_value"])
+
+
+# ------------------- EXPIRY STATUS -------------------
+def check_status(exp_date_str):
+    today = datetime.today().date()
+    exp = datetime.strptime(exp_date_str, "%Y-%m-%d").date()
+    if exp < today:
+        return "❌ Expired"
+    elif (exp - today).days <= 3:
+        return "⚠️ Expiring Soon"
+    else:
+        return "✅ OK"
+
+
+def compute_status(exp_dates, today=None, soon_days=EXPIRING_SOON_DAYS):
+    """Vectorized check_status over a Series of 'YYYY-MM-DD' strings."""
+    import numpy as np
+    import pandas as pd
+
+    today = pd.Timestamp(today or datetime.today().date())
+    days = (pd.to_datetime(exp_dates, format="%Y-%m-%d") - today).dt.days
+    status = np.select([days < 0, days <= soon_days], [STATUS_EXPIRED, STATUS_EXPIRING_SOON], STATUS_OK)
+    return pd.Series(status, index=exp_dates.index, dtype=object)
+
+
+# ------------------- INVENTORY -------------------
+ITEM_FRAME_COLUMNS = ["ID", "User", "Name", "Category", "Purchase Date", "Expiration Date",
+                      "Quantity", "Unit", "Price per Unit", "Status"]
+
+
+def load_inventory(user):
+    """Build the food list DataFrame for a user, with status computed in SQL."""
+    import pandas as pd
+
+    return pd.DataFrame(get_food_items_with_status(user), columns=ITEM_FRAME_COLUMNS)
+
+
+TYPED_FRAME_COLUMNS = [c for c in ITEM_FRAME_COLUMNS if c != "User"]
+
+
+def load_typed_inventory(user, today=None):
+    """Compact food list DataFrame for a user, built column by column.
+
+    Same columns as load_inventory without "User". Category, unit and status
+    are categoricals, dates datetime64 (NaT when missing), quantity and price
+    float32. Uses far less memory per item than load_inventory's object
+    columns; the frames are shared by every session through inventory_cache.
+    """
+    import numpy as np
+    import pandas as pd
+
+    columns = get_food_item_columns(user, today)
+
+    def dates(days):
+        days = np.array(days, dtype="float64")  # None -> NaN
+        nat = np.iinfo("int64").min
+        return np.where(np.isnan(days), nat, days).astype("int64").view("datetime64[D]").astype("datetime64[ns]")
+
+    def categorical(values):
+        # factorize + from_codes is several times faster than pd.Categorical(values)
+        codes, categories = pd.factorize(np.array(values, dtype=object))
+        return pd.Categorical.from_codes(codes, categories=categories)
+
+    return pd.DataFrame({
+        "ID": np.array(columns["id"], dtype="int64"),
+        "Name": np.array(columns["name"], dtype=object),
+        "Category": categorical(columns["category"]),
+        "Purchase Date": dates(columns["purchase_day"]),
+        "Expiration Date": dates(columns["expiration_day"]),
+        "Quantity": np.array(columns["quantity"], dtype="float32"),
+        "Unit": categorical(columns["unit"]),
+        "Price per Unit": np.array(columns["price_per_unit"], dtype="float32"),
+        "Status": pd.Categorical.from_codes(np.array(columns["status"], dtype="int8"), categories=list(STATUSES)),
+    }, columns=TYPED_FRAME_COLUMNS)
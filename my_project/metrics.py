@@ -0,0 +1,210 @@
+"""Lightweight in-process metrics: counters, latency histograms and a slow-run profiler.
+
+Disabled by default. Turn it on with WASTED_METRICS=1 or `enable()`. While
+disabled, an instrumented function costs one extra call and a flag check
+(see benchmarks/bench_metrics.py). Everything is exported as Prometheus text
+(`prometheus_text()`, also served at /metrics by the JSON API) or as a dict
+(`snapshot()`).
+
+Profiling is a separate opt-in: with WASTED_PROFILE_DIR set, sampled
+sections run under cProfile, and a .prof file is written for each one slower
+than WASTED_PROFILE_SLOW_MS (default 500 ms).
+"""
+import os
+import time
+import random
+import inspect
+import cProfile
+import functools
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds in seconds, as in Prometheus' default buckets plus a few fast ones
+BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+enabled = bool(os.environ.get("WASTED_METRICS"))
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+# ------------------- RECORDING -------------------
+def count(name, value=1, **labels):
+    """Add `value` to a counter (no-op while disabled)."""
+    if not enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, seconds, **labels):
+    """Record a duration in a histogram (no-op while disabled)."""
+    if not enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [[0] * len(BUCKETS), 0, 0.0]  # bucket counts, count, sum
+        i = bisect_left(BUCKETS, seconds)  # first bucket with seconds <= bound
+        if i < len(BUCKETS):
+            histogram[0][i] += 1
+        histogram[1] += 1
+        histogram[2] += seconds
+
+
+@contextmanager
+def timer(name, **labels):
+    """Time a block into the `name` histogram."""
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def timed(name, rows=None, **labels):
+    """Decorator: time every call into the `name` histogram.
+
+    With `rows`, the length of list results is added to that counter.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start, **labels)
+            if rows and isinstance(result, list):
+                count(rows, len(result), **labels)
+            return result
+        return wrapper
+    return decorator
+
+
+def instrument_module(namespace, name, rows=None, skip=()):
+    """Wrap the public functions defined in a module namespace with `timed`.
+
+    Generator functions (timing them would only time their creation) and
+    the names in `skip` are left alone. Meant to be called at the end of the
+    module: `instrument_module(globals(), "db_call_seconds", rows="db_rows_total")`.
+    """
+    module = namespace["__name__"]
+    for attr, func in list(namespace.items()):
+        if (attr.startswith("_") or attr in skip or not inspect.isfunction(func)
+                or func.__module__ != module or inspect.isgeneratorfunction(func)):
+            continue
+        namespace[attr] = timed(name, rows, function=attr)(func)
+
+
+# ------------------- EXPORT -------------------
+def snapshot():
+    """Counters and histograms as plain data, e.g. for json.dumps."""
+    with _lock:
+        counters = [{"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(_counters.items())]
+        histograms = [{"name": name, "labels": dict(labels), "count": h[1], "sum": h[2],
+                       "buckets": dict(zip(map(str, BUCKETS), h[0]))}
+                      for (name, labels), h in sorted(_histograms.items())]
+    return {"counters": counters, "histograms": histograms}
+
+
+def _labels(labels, **extra):
+    items = list(labels) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in items) + "}"
+
+
+def prometheus_text():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, (list(h[0]), h[1], h[2])) for key, h in _histograms.items())
+    typed = set()
+    for (name, labels), value in counters:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_labels(labels)} {value}")
+    for (name, labels), (buckets, total, seconds) in histograms:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, n in zip(BUCKETS, buckets):
+            cumulative += n
+            lines.append(f"{name}_bucket{_labels(labels, le=bound)} {cumulative}")
+        lines.append(f"{name}_bucket{_labels(labels, le='+Inf')} {total}")
+        lines.append(f"{name}_sum{_labels(labels)} {seconds}")
+        lines.append(f"{name}_count{_labels(labels)} {total}")
+    return "\n".join(lines) + "\n"
+
+
+# ------------------- SLOW-RUN PROFILER -------------------
+PROFILE_DIR = os.environ.get("WASTED_PROFILE_DIR")
+PROFILE_SLOW_MS = float(os.environ.get("WASTED_PROFILE_SLOW_MS", 500))
+PROFILE_SAMPLE = float(os.environ.get("WASTED_PROFILE_SAMPLE", 1.0))
+
+# Only one profiler can be active per process (sys.monitoring on 3.12+)
+_profile_lock = threading.Lock()
+
+
+@contextmanager
+def profiled(name, directory=None, slow_ms=None, sample=None):
+    """Run the block under cProfile (for a sample of calls); keep the profile if it was slow.
+
+    Does nothing unless a directory is given or WASTED_PROFILE_DIR is set.
+    Yields the path the profile would be written to, or None.
+    """
+    directory = directory or PROFILE_DIR
+    slow_ms = PROFILE_SLOW_MS if slow_ms is None else slow_ms
+    sample = PROFILE_SAMPLE if sample is None else sample
+    if not directory or random.random() >= sample or not _profile_lock.acquire(blocking=False):
+        yield None
+        return
+    path = os.path.join(directory, f"{name.replace(' ', '_')}-{time.strftime('%Y%m%d-%H%M%S')}"
+                                   f"-{time.perf_counter_ns() % 10 ** 6:06d}.prof")
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:  # another profiler or a debugger is active
+        _profile_lock.release()
+        yield None
+        return
+    start = time.perf_counter()
+    try:
+        try:
+            yield path
+        finally:
+            profile.disable()
+        if (time.perf_counter() - start) * 1000 >= slow_ms:
+            os.makedirs(directory, exist_ok=True)
+            profile.dump_stats(path)
+            count("slow_profiles_total", section=name)
+    finally:
+        _profile_lock.release()
@@ -0,0 +1,249 @@
+"""Local recipe index: offline meal suggestions from a JSON recipe dataset.
+
+Recipes come from the bundled ``my_project/data/recipes.json`` or from the
+file named by WASTED_RECIPES. The format is a list of objects like this::
+
+    {"id": 1, "title": "French Toast", "image": "",
+     "ingredients": ["bread", "eggs", "milk"], "steps": ["Whisk...", "Fry..."]}
+
+Ingredient names are normalized into tokens (lower case, singular, without
+words like "fresh" or "chopped"). Each distinct ingredient gets an id. The
+index keeps an inverted list of recipes per ingredient and, per recipe, its
+ingredient ids in CSR arrays (numpy), so a query only walks the postings of
+the items in the fridge. Recipes are ranked by how many expiring
+items they use, then by how few ingredients are missing, then by how many
+other fridge items they use.
+
+`suggest` answers from the index and only falls back to the Spoonacular
+client (my_project.recipes) when nothing matches locally.
+"""
+import os
+import re
+import json
+import threading
+
+DATASET = os.environ.get(
+    "WASTED_RECIPES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "recipes.json"))
+
+_STOPWORDS = {
+    "a", "an", "and", "of", "the", "with", "fresh", "chopped", "sliced", "diced", "minced", "grated",
+    "large", "small", "medium", "organic", "whole", "ripe", "frozen", "canned", "dried", "ground",
+    "free", "range", "pack", "bag", "box", "g", "kg", "ml", "l",
+}
+_WORD = re.compile(r"[^\W\d_]+")
+_MATCH_CACHE_SIZE = 4096
+
+
+def _singular(word):
+    if len(word) <= 3 or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "xes")):
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def tokenize(name):
+    """Normalized tokens of an ingredient or item name, in order."""
+    return tuple(_singular(w) for w in _WORD.findall(name.lower()) if w not in _STOPWORDS)
+
+
+# ------------------- INDEX -------------------
+class RecipeIndex:
+    """Inverted index from normalized ingredients to the recipes that use them."""
+
+    def __init__(self, recipes):
+        import numpy as np
+
+        self.recipes = []
+        self._vocab = {}          # "ingredient key" -> id
+        self._raw = {}            # ingredient name as written -> id (or None)
+        self._names = []          # id -> display name
+        self._by_token = {}       # token -> set of ingredient ids containing it
+        self._match_cache = {}
+        self._lock = threading.Lock()
+        indices, indptr = [], [0]
+        for position, recipe in enumerate(recipes):
+            if not recipe.get("title") or not recipe.get("ingredients"):
+                raise ValueError(f"recipe #{position} needs a title and a list of ingredients")
+            ids = sorted({i for i in map(self._add_ingredient, recipe["ingredients"]) if i is not None})
+            indices.extend(ids)
+            indptr.append(len(indices))
+            self.recipes.append(recipe)
+
+        self._indices = np.asarray(indices, dtype=np.int32)
+        self._indptr = np.asarray(indptr, dtype=np.int64)
+        self._lengths = np.diff(self._indptr)
+        # Postings: the CSR matrix transposed, i.e. recipe numbers grouped by ingredient id
+        owner = np.repeat(np.arange(len(self.recipes), dtype=np.int32), self._lengths)
+        order = np.argsort(self._indices, kind="stable")
+        self._postings = owner[order]
+        self._bounds = np.searchsorted(self._indices[order], np.arange(len(self._names) + 1))
+
+    @classmethod
+    def load(cls, path=DATASET):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.recipes)
+
+    def _add_ingredient(self, name):
+        if name in self._raw:
+            return self._raw[name]
+        ingredient_id = self._raw[name] = self._new_ingredient(name)
+        return ingredient_id
+
+    def _new_ingredient(self, name):
+        tokens = tokenize(name)
+        if not tokens:
+            return None
+        key = " ".join(tokens)
+        ingredient_id = self._vocab.get(key)
+        if ingredient_id is None:
+            ingredient_id = self._vocab[key] = len(self._names)
+            self._names.append(name.strip().lower())
+            for token in tokens:
+                self._by_token.setdefault(token, set()).add(ingredient_id)
+        return ingredient_id
+
+    def match(self, name):
+        """Ingredient ids an item name stands for.
+
+        "milk" matches every ingredient containing the token (e.g. "milk",
+        "whole milk"). A name with extra words falls back to its last word
+        when nothing else matches: "Greek yogurt" -> "yogurt".
+        """
+        cached = self._match_cache.get(name)
+        if cached is not None:
+            return cached
+        tokens = tokenize(name)
+        ids = set()
+        if tokens:
+            postings = [self._by_token.get(t) for t in set(tokens)]
+            if all(postings):
+                ids = set.intersection(*postings)
+            if not ids and tokens[-1] in self._vocab:
+                ids = {self._vocab[tokens[-1]]}
+        result = frozenset(ids)
+        with self._lock:
+            if len(self._match_cache) >= _MATCH_CACHE_SIZE:
+                self._match_cache.clear()
+            self._match_cache[name] = result
+        return result
+
+    def search(self, expiring, others=(), number=1):
+        """Best recipes for the `expiring` item names, also using `others` when possible.
+
+        Returns dicts shaped like the Spoonacular results (title, image, steps,
+        usedIngredients, missedIngredients, ...), best first. Empty when none
+        of the `expiring` names is known, even if `others` are.
+        """
+        import numpy as np
+
+        expiring_ids = set().union(*map(self.match, expiring)) if expiring else set()
+        other_ids = (set().union(*map(self.match, others)) if others else set()) - expiring_ids
+        if (expiring and not expiring_ids) or not (expiring_ids or other_ids):
+            return []
+
+        if expiring_ids:
+            # Expiring items dominate the ranking, so only recipes on the top
+            # levels of "expiring items used" can make the cut
+            used_expiring = self._hits(expiring_ids)
+            at_least = np.cumsum(np.bincount(used_expiring)[::-1])[::-1]
+            floor = max(1, int(np.flatnonzero(at_least >= number)[-1]) if at_least[0] >= number else 1)
+            candidates = np.flatnonzero(used_expiring >= floor)
+            used_expiring = used_expiring[candidates]
+            used_other = self._count(candidates, other_ids)
+        else:
+            used_other = self._hits(other_ids)
+            candidates = np.flatnonzero(used_other)
+            used_expiring, used_other = np.zeros(len(candidates), dtype=np.int64), used_other[candidates]
+        missed = self._lengths[candidates] - used_expiring - used_other
+        score = used_expiring * 1e6 - missed * 1e3 + used_other
+
+        if len(candidates) > number:
+            # Keep every candidate tied with the last place so ties go to the earlier recipe
+            cut = score[np.argpartition(-score, number - 1)[number - 1]]
+            top = np.flatnonzero(score >= cut)
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.lexsort((candidates[top], -score[top]))][:number]
+        return [self._result(int(candidates[i]), expiring_ids | other_ids) for i in top]
+
+    def _hits(self, ids):
+        """Per recipe, how many of the ingredient `ids` it uses (walks their postings)."""
+        import numpy as np
+
+        if not ids:
+            return np.zeros(len(self.recipes), dtype=np.int64)
+        return np.bincount(np.concatenate([self._postings[self._bounds[i]:self._bounds[i + 1]] for i in ids]),
+                           minlength=len(self.recipes))
+
+    def _count(self, candidates, ids):
+        """Like `_hits(ids)[candidates]`, reading the candidates' rows when that is cheaper."""
+        import numpy as np
+
+        if not ids or not len(candidates):
+            return np.zeros(len(candidates), dtype=np.int64)
+        lengths = self._lengths[candidates]
+        total = int(lengths.sum())
+        if total > sum(int(self._bounds[i + 1] - self._bounds[i]) for i in ids):
+            return self._hits(ids)[candidates]
+        wanted = np.zeros(len(self._names), dtype=np.int64)
+        wanted[list(ids)] = 1
+        offsets = np.cumsum(lengths) - lengths
+        rows = np.repeat(self._indptr[candidates] - offsets, lengths) + np.arange(total)
+        return np.add.reduceat(wanted[self._indices[rows]], offsets)
+
+    def _result(self, position, available):
+        recipe = self.recipes[position]
+        ids = self._indices[self._indptr[position]:self._indptr[position + 1]].tolist()
+        used = [self._names[i] for i in ids if i in available]
+        missed = [self._names[i] for i in ids if i not in available]
+        steps = [s if isinstance(s, dict) else {"number": n, "step": s}
+                 for n, s in enumerate(recipe.get("steps", []), start=1)]
+        return {
+            "id": recipe.get("id", position + 1),
+            "title": recipe["title"],
+            "image": recipe.get("image", ""),
+            "steps": steps,
+            "usedIngredients": used,
+            "missedIngredients": missed,
+            "usedIngredientCount": len(used),
+            "missedIngredientCount": len(missed),
+            "source": "local",
+        }
+
+
+# ------------------- SUGGESTIONS -------------------
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Shared index of the DATASET recipes, built on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = RecipeIndex.load(DATASET)
+        return _index
+
+
+def suggest(expiring, others=(), number=1, fallback=True):
+    """Recipes for the expiring items: local index first, Spoonacular if nothing matches."""
+    recipes = get_index().search(expiring, others, number)
+    if recipes or not fallback or not expiring:
+        return recipes
+    from my_project.recipes import get_client
+    return [dict(recipe, source="spoonacular",
+                 usedIngredients=_names(recipe.get("usedIngredients", [])),
+                 missedIngredients=_names(recipe.get("missedIngredients", [])))
+            for recipe in get_client().suggest(expiring, number)]
+
+
+def _names(ingredients):
+    return [i["name"] if isinstance(i, dict) else i for i in ingredients]
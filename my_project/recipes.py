@@ -0,0 +1,171 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ------------------- CONFIGURATION -------------------
+BASE_URL = "https://api.spoonacular.com"
+API_KEY = os.environ.get("SPOONACULAR_API_KEY", "f05378d894eb4eb8b187551e2a492c49")
+CACHE_DIR = os.environ.get(
+    "WASTED_RECIPE_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "wasted", "recipes"))
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+CACHE_TTL = 24 * 60 * 60  # recipes rarely change: keep them for a day
+
+
+class RecipeError(Exception):
+    """Raised when the recipe service cannot be reached or answers with an error."""
+
+
+def normalize_ingredients(ingredients):
+    """Lower-case, strip, de-duplicate and sort ingredient names."""
+    return sorted({i.strip().lower() for i in ingredients if i and i.strip()})
+
+
+# ------------------- DISK CACHE -------------------
+class DiskCache:
+    """JSON files on disk, one per key, that expire after `ttl` seconds."""
+
+    def __init__(self, directory, ttl=CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def get(self, key):
+        """Return the cached value, or None if it is missing or expired."""
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry["created"] > self.ttl:
+            return None
+        return entry["value"]
+
+    def set(self, key, value):
+        os.makedirs(self.directory, exist_ok=True)
+        # Write to a temp file and rename, so readers never see half a file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "value": value}, f)
+        os.replace(tmp, self._path(key))
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+
+
+# ------------------- RECIPE CLIENT -------------------
+class RecipeClient:
+    """Spoonacular client with a persistent session, timeouts and a TTL disk cache.
+
+    Searches are cached by the normalized, sorted ingredient set, so the same
+    expiring items (in any order or case) never hit the network twice within
+    the TTL. Instructions are cached per recipe id and fetched concurrently
+    for all candidates returned by a search.
+    """
+
+    def __init__(self, api_key=API_KEY, base_url=BASE_URL, cache_dir=CACHE_DIR, ttl=CACHE_TTL,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), max_workers=4):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache = DiskCache(cache_dir, ttl)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="recipes")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+        self.request_seconds = 0.0
+
+    def _get_json(self, path, **params):
+        params["apiKey"] = self.api_key
+        start = time.perf_counter()
+        try:
+            response = self.session.get(self.base_url + path, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise RecipeError(f"recipe service request failed: {e}") from e
+        finally:
+            with self._lock:
+                self.requests += 1
+                self.request_seconds += time.perf_counter() - start
+
+    def _cached(self, key, fetch):
+        value = self.cache.get(key)
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if value is None:
+            value = fetch()
+            self.cache.set(key, value)
+        return value
+
+    def find_by_ingredients(self, ingredients, number=1):
+        """Recipes that use the given ingredients, best match first."""
+        names = normalize_ingredients(ingredients)
+        if not names:
+            return []
+        return self._cached(
+            f"find:{number}:{','.join(names)}",
+            lambda: self._get_json("/recipes/findByIngredients",
+                                   ingredients=",".join(names), number=number, ranking=1),
+        )
+
+    def get_instructions(self, recipe_id):
+        """Analyzed instruction steps of a recipe (a list of step dicts)."""
+        def fetch():
+            sections = self._get_json(f"/recipes/{recipe_id}/analyzedInstructions")
+            return sections[0].get("steps", []) if sections else []
+        return self._cached(f"steps:{recipe_id}", fetch)
+
+    def suggest(self, ingredients, number=1):
+        """Return recipes for the ingredients, each with a "steps" list attached."""
+        recipes = self.find_by_ingredients(ingredients, number)
+        steps = self._executor.map(self.get_instructions, [r["id"] for r in recipes])
+        return [dict(recipe, steps=recipe_steps) for recipe, recipe_steps in zip(recipes, steps)]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "requests": self.requests,
+                "mean_latency_ms": 1000 * self.request_seconds / self.requests if self.requests else 0.0,
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """Shared client, so every Streamlit session reuses the same HTTP connections."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = RecipeClient()
+        return _default_client
@@ -0,0 +1,133 @@
+"""Offline waste report for every user, computed by a pool of worker processes.
+
+Users are split into chunks, one ProcessPoolExecutor task each. Workers open
+the database files read-only (one connection per file, kept for the life of
+the process) and compute their chunk's statistics with one GROUP BY, so the
+SQLite work runs in parallel. Rows stream to the output as chunks finish, in
+user order, as CSV, JSON Lines or Parquet (Parquet needs pyarrow).
+
+    python -m my_project report waste.csv --workers 4
+"""
+import os
+import csv
+import json
+import sqlite3
+import pathlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from my_project.db import database
+from my_project.inventory import STAT_COLUMNS
+
+REPORT_COLUMNS = ["user"] + STAT_COLUMNS
+FORMATS = ("csv", "jsonl", "parquet")
+CHUNK_SIZE = 500  # users per task
+
+
+# ------------------- WORKERS -------------------
+_connections = {}
+
+
+def _init_worker():
+    _connections.clear()
+
+
+def _read_only(path):
+    conn = _connections.get(path)
+    if conn is None:
+        conn = _connections[path] = sqlite3.connect(pathlib.Path(path).absolute().as_uri() + "?mode=ro", uri=True)
+        conn.execute("PRAGMA query_only = 1")
+    return conn
+
+
+def report_chunk(task):
+    """Statistics rows (REPORT_COLUMNS) for one (path, users, today, soon_days) task."""
+    path, users, today, soon_days = task
+    return _read_only(path).execute("""
+        SELECT user,
+               COUNT(*),
+               SUM(expiration_day < :today),
+               SUM(expiration_day BETWEEN :today AND :today + :soon_days),
+               SUM(expiration_day > :today + :soon_days OR expiration_day IS NULL),
+               COALESCE(SUM(CASE WHEN expiration_day < :today THEN quantity * price_per_unit END), 0.0),
+               COALESCE(SUM(CASE WHEN expiration_day BETWEEN :today AND :today + :soon_days
+                                 THEN quantity * price_per_unit END), 0.0)
+        FROM food_items
+        WHERE user IN (SELECT value FROM json_each(:users))
+        GROUP BY user
+        ORDER BY user
+    """, {"users": json.dumps(users), "today": today, "soon_days": soon_days}).fetchall()
+
+
+# ------------------- TASKS -------------------
+def report_tasks(chunk_size=CHUNK_SIZE, today=None, soon_days=database.EXPIRING_SOON_DAYS):
+    """Split every user with items into tasks, one database file per task."""
+    day = database.to_day_number(today or date.today())
+    tasks = []
+    for shard in database.shard_keys():
+        with database.connection(shard=shard) as conn:
+            users = [row[0] for row in conn.execute("SELECT DISTINCT user FROM food_items ORDER BY user")]
+        path = database._path_for(None, shard)
+        tasks += [(path, users[i:i + chunk_size], day, soon_days) for i in range(0, len(users), chunk_size)]
+    return tasks
+
+
+def generate_report(workers=None, chunk_size=CHUNK_SIZE, today=None, progress=None):
+    """Yield lists of report rows, chunk by chunk, computed by `workers` processes.
+
+    `progress(done_users, total_users)` is called after every chunk.
+    """
+    tasks = report_tasks(chunk_size, today)
+    total, done = sum(len(task[1]) for task in tasks), 0
+    if progress:
+        progress(done, total)
+    if not tasks:
+        return
+    # spawn: workers only get the task tuples, never a copy of our pools and threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers or os.cpu_count(), mp_context=context, initializer=_init_worker) as executor:
+        for task, rows in zip(tasks, executor.map(report_chunk, tasks)):
+            done += len(task[1])
+            if progress:
+                progress(done, total)
+            yield rows
+
+
+# ------------------- OUTPUT -------------------
+def write_report(f, fmt, chunks):
+    """Write report chunks to `f` (text for csv/jsonl, binary for parquet); return the row count."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown report format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    if fmt == "parquet":
+        return _write_parquet(f, chunks)
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(f)
+        writer.writerow(REPORT_COLUMNS)
+    for rows in chunks:
+        if fmt == "csv":
+            writer.writerows(rows)
+        else:
+            f.writelines(json.dumps(dict(zip(REPORT_COLUMNS, row))) + "\n" for row in rows)
+        count += len(rows)
+    return count
+
+
+def _write_parquet(f, chunks):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet output needs pyarrow (pip install pyarrow)") from None
+
+    schema = pa.schema([("user", pa.string())]
+                       + [(c, pa.float64() if c in ("lost_value", "value_at_risk") else pa.int64())
+                          for c in STAT_COLUMNS])
+    count = 0
+    with pq.ParquetWriter(f, schema) as writer:
+        for rows in chunks:
+            # one row group per chunk keeps memory flat however many users there are
+            writer.write_table(pa.Table.from_pylist([dict(zip(REPORT_COLUMNS, row)) for row in rows], schema))
+            count += len(rows)
+    return count
@@ -0,0 +1,104 @@
+"""Background expiry scanner.
+
+Once a day, finds the items that are expired or expiring soon with an
+indexed range query on expiration_day and records "expiring_soon" and
+"expired" events in the notifications table, so the UI and other consumers
+read precomputed results instead of scanning inventories.
+
+The scan walks the index in (expiration_day, id) order in small batches,
+each committed in its own short transaction together with a cursor in
+scan_state. Write locks are held only for one batch at a time, and a scan
+interrupted by a crash resumes from the last committed batch.
+
+Run it with ``python -m my_project scan`` (daily loop) or ``--once``.
+"""
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timedelta
+
+from my_project.db import database
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+LOOKBACK_DAYS = 30  # also catch items that expired while the scanner was down
+
+
+def scan(day=None, batch_size=BATCH_SIZE, lookback_days=LOOKBACK_DAYS,
+         soon_days=database.EXPIRING_SOON_DAYS, pause=0.0):
+    """Run (or resume) the scan for `day` and return the number of new events.
+
+    A scan that already finished for that day is not repeated. With sharded
+    storage each shard is scanned in turn and keeps its own cursor.
+    """
+    today = database.to_day_number(day or date.today())
+    new_events = sum(_scan_shard(shard, today, batch_size, lookback_days, soon_days, pause)
+                     for shard in database.shard_keys())
+    logger.info("expiry scan for %s: %d new events", database.from_day_number(today), new_events)
+    return new_events
+
+
+def _scan_shard(shard, today, batch_size, lookback_days, soon_days, pause):
+    horizon = today + soon_days
+
+    with database.connection(shard=shard) as conn:
+        # Start just before the first item of day today - lookback_days (ids are positive)
+        conn.execute("INSERT OR IGNORE INTO scan_state (scan_day, cursor_day, cursor_id) VALUES (?, ?, -1)",
+                     (today, today - lookback_days))
+        cursor_day, cursor_id, finished = conn.execute(
+            "SELECT cursor_day, cursor_id, finished_at FROM scan_state WHERE scan_day = ?", (today,)).fetchone()
+    if finished:
+        logger.info("expiry scan for %s already done", database.from_day_number(today))
+        return 0
+
+    new_events = 0
+    while True:
+        with database.connection(shard=shard) as conn:
+            rows = conn.execute("""
+                SELECT id, user, expiration_day FROM food_items
+                WHERE (expiration_day, id) > (:cursor_day, :cursor_id) AND expiration_day <= :horizon
+                ORDER BY expiration_day, id
+                LIMIT :limit
+            """, {"cursor_day": cursor_day, "cursor_id": cursor_id, "horizon": horizon,
+                  "limit": batch_size}).fetchall()
+            if not rows:
+                conn.execute("UPDATE scan_state SET finished_at = CURRENT_TIMESTAMP WHERE scan_day = ?", (today,))
+                break
+            before = conn.total_changes
+            conn.executemany("""
+                INSERT OR IGNORE INTO notifications (user, item_id, kind, expiration_day, scan_day)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(user, item_id,
+                   database.NOTIFY_EXPIRED if exp_day < today else database.NOTIFY_EXPIRING_SOON,
+                   exp_day, today)
+                  for item_id, user, exp_day in rows])
+            added = conn.total_changes - before
+            cursor_id, cursor_day = rows[-1][0], rows[-1][2]
+            conn.execute("UPDATE scan_state SET cursor_day = ?, cursor_id = ?, events = events + ? WHERE scan_day = ?",
+                         (cursor_day, cursor_id, added, today))
+        new_events += added
+        if pause:
+            time.sleep(pause)  # let other writers in between batches
+
+    return new_events
+
+
+def seconds_until(hour=6, now=None):
+    """Seconds from `now` until the next `hour`:00 local time."""
+    now = now or datetime.now()
+    target = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+async def run_forever(hour=6, **scan_options):
+    """Scan now, then every day at `hour`:00. The scan itself runs in a worker thread."""
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, lambda: scan(**scan_options))
+        except Exception:
+            logger.exception("expiry scan failed; retrying at the next run")
+        await asyncio.sleep(seconds_until(hour))
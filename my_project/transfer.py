@@ -0,0 +1,217 @@
+"""Streaming bulk import and export of food items (CSV, JSON, JSON Lines).
+
+Rows flow through generators end to end: files are read lazily, validated
+and inserted `batch_size` rows at a time, and exports are written while the
+rows are fetched, so inputs and outputs larger than memory are fine.
+"""
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+
+from my_project.db import database
+
+FIELDS = ["user", "name", "category", "purchase_date", "expiration_date", "quantity", "unit", "price_per_unit"]
+FORMATS = ("csv", "json", "jsonl")
+BATCH_SIZE = 1000
+
+
+@dataclass
+class TransferReport:
+    rows: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)  # first few (line, message) pairs
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.rows} rows in {self.seconds:.2f}s ({self.rows_per_sec:,.0f} rows/sec), "
+                f"{self.rejected} rejected")
+
+
+def detect_format(path):
+    """Guess the format from a file name: .csv, .json, or .jsonl/.ndjson."""
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        return "csv"
+    if lower.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if lower.endswith(".json"):
+        return "json"
+    raise ValueError(f"cannot guess the format of {path!r}; pass one of {', '.join(FORMATS)}")
+
+
+def batched(iterable, size):
+    """Yield lists of up to `size` items (itertools.batched needs Python 3.12)."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+# ------------------- READERS -------------------
+def _iter_json_array(f, chunk_size=65536):
+    """Yield the objects of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("expected a JSON array of objects")
+    buffer = buffer[1:]
+    eof = False
+    while True:
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            obj, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield obj
+        buffer = buffer[end:]
+
+
+def read_rows(f, fmt):
+    """Yield one dict per record of an open text file."""
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+    elif fmt == "jsonl":
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == "json":
+        yield from _iter_json_array(f)
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+
+
+# ------------------- VALIDATION -------------------
+def _parse_date(value, column):
+    value = (value or "").strip()
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise ValueError(f"{column} must be a YYYY-MM-DD date, got {value!r}") from None
+
+
+def _parse_number(value, column):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{column} must be a number, got {value!r}") from None
+    if number < 0:
+        raise ValueError(f"{column} must not be negative")
+    return number
+
+
+def validate_row(row, user=None):
+    """Turn a record into an insert_food_items tuple, raising ValueError if invalid."""
+    owner = user or (row.get("user") or "").strip()
+    name = (row.get("name") or "").strip()
+    if not owner:
+        raise ValueError("user is missing")
+    if not name:
+        raise ValueError("name is missing")
+    return (
+        owner,
+        name,
+        (row.get("category") or "Other").strip(),
+        _parse_date(row.get("purchase_date"), "purchase_date"),
+        _parse_date(row.get("expiration_date"), "expiration_date"),
+        _parse_number(row.get("quantity"), "quantity"),
+        (row.get("unit") or "").strip(),
+        _parse_number(row.get("price_per_unit"), "price_per_unit"),
+    )
+
+
+def validate_batch(rows, user=None, first_line=1, report=None):
+    """Validate a batch of records; return the valid tuples, counting rejects in `report`."""
+    valid = []
+    for line, row in enumerate(rows, start=first_line):
+        try:
+            valid.append(validate_row(row, user))
+        except (ValueError, AttributeError) as e:
+            if report is not None:
+                report.rejected += 1
+                if len(report.errors) < 20:
+                    report.errors.append((line, str(e)))
+    return valid
+
+
+# ------------------- IMPORT / EXPORT -------------------
+def import_items(f, fmt, user=None, batch_size=BATCH_SIZE, strict=False):
+    """Stream records from an open file into the database.
+
+    Each batch is validated and inserted in one transaction. `user` forces
+    the owner of every row (the column may then be omitted). With `strict`,
+    every row is validated before anything is inserted, and the first
+    invalid one aborts the import with ValueError.
+    """
+    report = TransferReport()
+    start = time.perf_counter()
+    rows = read_rows(f, fmt)
+    if strict:
+        rows = _validate_all(f, fmt, rows, user)
+    line = 1
+    for batch in batched(rows, batch_size):
+        report.rows += database.insert_food_items(validate_batch(batch, user, line, report))
+        line += len(batch)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def _validate_all(f, fmt, rows, user):
+    """Validate every record, then return them again for inserting.
+
+    Seekable files are read twice; anything else (a pipe) is kept in memory.
+    """
+    position = f.tell() if f.seekable() else None
+    if position is None:
+        rows = list(rows)
+    for line, row in enumerate(rows, start=1):
+        try:
+            validate_row(row, user)
+        except (ValueError, AttributeError) as e:
+            raise ValueError(f"invalid row {line}: {e}") from None
+    if position is None:
+        return rows
+    f.seek(position)
+    return read_rows(f, fmt)
+
+
+def export_items(f, fmt, user=None):
+    """Stream the food items (of one user, or everyone) into an open text file."""
+    report = TransferReport()
+    start = time.perf_counter()
+    records = (dict(zip(FIELDS, row[1:])) for row in database.iter_food_items(user))
+    if fmt == "csv":
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            report.rows += 1
+    elif fmt == "jsonl":
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+            report.rows += 1
+    elif fmt == "json":
+        f.write("[")
+        for record in records:
+            f.write((",\n" if report.rows else "\n") + json.dumps(record))
+            report.rows += 1
+        f.write("\n]\n")
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,67 @@
+import json
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class StubRecipeServer:
+    """Local stand-in for the Spoonacular endpoints used by RecipeClient.
+
+    `delay` adds artificial latency to every response; `calls` records the
+    requested paths so tests can check what actually reached the network.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                stub.calls.append(url.path)
+                time.sleep(stub.delay)
+                query = parse_qs(url.query)
+                steps = re.match(r"^/recipes/(\d+)/analyzedInstructions$", url.path)
+                if url.path == "/recipes/findByIngredients":
+                    names = query["ingredients"][0].split(",")
+                    number = int(query.get("number", ["1"])[0])
+                    base = 1000 * (zlib.crc32(",".join(names).encode()) % 1000)
+                    body = [{"id": base + i, "title": f"{' & '.join(names)} #{i}", "image": ""}
+                            for i in range(number)]
+                elif steps:
+                    body = [{"steps": [{"number": 1, "step": f"Cook recipe {steps.group(1)}"}]}]
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                payload = json.dumps(body).encode()
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client gave up (timeout tests)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,96 @@
+import unittest
+import asyncio
+import os
+import sqlite3
+from my_project.db import database
+from my_project.db.aio import AsyncDatabase
+from my_project.db.writer import BatchWriter, WriterClosedError
+
+
+class TestAsyncDatabase(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_aio.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        self.saved = database.create_connection
+        database.create_connection = test_create_connection
+        database.initialize_db()
+
+    def tearDown(self):
+        database.create_connection = self.saved
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_concurrent_inserts_are_batched(self):
+        async def scenario():
+            async with AsyncDatabase(batch_window=0.01) as db:
+                await asyncio.gather(*[
+                    db.insert_food_item("anna", f"Item {i}", "Dairy", "2025-08-01", "2025-08-10", 1.0, "pcs", 1.0)
+                    for i in range(50)])
+                items = await db.get_all_food_items("anna")
+                return items, db.stats()
+
+        items, stats = self.run_async(scenario())
+        self.assertEqual(len(items), 50)
+        self.assertEqual(stats["writes"], 50)
+        self.assertLess(stats["batches"], 50)
+        self.assertGreater(database.get_data_version("anna"), 0)
+
+    def test_failing_write_does_not_affect_batch(self):
+        database.insert_food_item("anna", "Milk", "Dairy", "2025-08-01", "2025-08-10", 1.0, "l", 1.0)
+        item_id = database.get_all_food_items("anna")[0][0]
+
+        async def scenario():
+            async with AsyncDatabase(batch_window=0.01) as db:
+                return await asyncio.gather(
+                    db.delete_food_item(item_id, "anna", reason="lost"),
+                    db.insert_food_item("anna", "Eggs", "Dairy", "2025-08-01", "2025-08-10", 6.0, "pcs", 0.3),
+                    return_exceptions=True)
+
+        bad, good = self.run_async(scenario())
+        self.assertIsInstance(bad, ValueError)
+        self.assertIsNone(good)
+        self.assertEqual(sorted(row[2] for row in database.get_all_food_items("anna")), ["Eggs", "Milk"])
+        self.assertEqual(database.get_item_events("anna"), [])
+
+    def test_delete_and_status_counts(self):
+        async def scenario():
+            async with AsyncDatabase() as db:
+                await db.insert_food_item("anna", "Milk", "Dairy", "2025-08-01", "2025-08-02", 1.0, "l", 1.0)
+                item_id = (await db.get_all_food_items("anna"))[0][0]
+                before = await db.count_food_items_by_status("anna")
+                deleted = await db.delete_food_item(item_id, "anna")
+                missing = await db.delete_food_item(item_id, "anna")
+                return before, deleted, missing
+
+        before, deleted, missing = self.run_async(scenario())
+        self.assertEqual(before[database.STATUS_EXPIRED], 1)
+        self.assertTrue(deleted)
+        self.assertFalse(missing)
+
+    def test_users(self):
+        async def scenario():
+            async with AsyncDatabase() as db:
+                await db.add_user("anna", "secret")
+                return (await db.check_user_credentials("anna", "secret"),
+                        await db.check_user_credentials("anna", "wrong"))
+
+        self.assertEqual(self.run_async(scenario()), (True, False))
+
+    def test_closed_writer_rejects_writes(self):
+        writer = BatchWriter(database.connection)
+        writer.submit(database._insert_user, "anna", "hash")
+        writer.close()
+        with database.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM users").fetchone()[0], 1)
+        with self.assertRaises(WriterClosedError):
+            writer.submit(database._insert_user, "bob", "hash")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import os
+import gzip
+import json
+import base64
+import sqlite3
+import threading
+import http.client
+from my_project import api
+from my_project.db import database
+
+
+class TestApi(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_api.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        self.saved = database.create_connection
+        database.create_connection = test_create_connection
+        database.initialize_db()
+        database.add_user("anna", "secret")
+        database.insert_food_items([
+            ("anna", f"Item {i}", "Dairy" if i % 2 else "Fruit", "2020-01-01",
+             "2020-01-10" if i < 5 else "2999-01-01", 1.0, "pcs", 2.0)
+            for i in range(30)])
+        database.insert_food_item("bob", "Secret", "Meat", "2020-01-01", "2999-01-01", 1.0, "kg", 9.0)
+
+        self.server = api.ApiServer("127.0.0.1", 0)
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05})
+        self.thread.start()
+        self.auth = "Basic " + base64.b64encode(b"anna:secret").decode()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        database.create_connection = self.saved
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def request(self, path, auth=True, **headers):
+        conn = http.client.HTTPConnection(*self.server.server_address[:2], timeout=5)
+        if auth:
+            headers["Authorization"] = self.auth
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        finally:
+            conn.close()
+        if response.getheader("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return response, json.loads(body) if body else None
+
+    def test_requires_credentials(self):
+        response, body = self.request("/api/status", auth=False)
+        self.assertEqual(response.status, 401)
+        self.assertIn("Basic", response.getheader("WWW-Authenticate"))
+        self.auth = "Basic " + base64.b64encode(b"anna:wrong").decode()
+        self.assertEqual(self.request("/api/status")[0].status, 401)
+        self.assertEqual(self.request("/api/health", auth=False)[0].status, 200)
+
+    def test_status_and_stats(self):
+        _, status = self.request("/api/status")
+        self.assertEqual(status, {"ok": 25, "expiring_soon": 0, "expired": 5})
+        _, stats = self.request("/api/stats")
+        self.assertEqual(stats["totals"]["total_items"], 30)
+        self.assertEqual(stats["totals"]["lost_value"], 10.0)
+        self.assertEqual({c["category"] for c in stats["categories"]}, {"Dairy", "Fruit"})
+
+    def test_status_and_forecast_on_other_dates(self):
+        _, status = self.request("/api/status?day=2019-12-30&soon_days=14")
+        self.assertEqual(status, {"ok": 25, "expiring_soon": 5, "expired": 0})
+        _, forecast = self.request("/api/forecast?day=2020-01-08&horizon=4&bucket=2&past=2")
+        self.assertEqual(forecast, {"day": "2020-01-08", "bucket_days": 2, "buckets": [
+            {"days": -2, "items": 0}, {"days": 0, "items": 0}, {"days": 2, "items": 5}, {"days": 4, "items": 0}]})
+        response, body = self.request("/api/forecast?day=tomorrow")
+        self.assertEqual(response.status, 400)
+        self.assertIn("day", body["error"])
+
+    def test_cursor_pagination(self):
+        names, cursor = [], ""
+        while cursor is not None:
+            response, page = self.request(f"/api/items?limit=7&cursor={cursor}")
+            self.assertEqual(response.status, 200)
+            names += [item["name"] for item in page["items"]]
+            cursor = page["next_cursor"]
+        self.assertEqual(names, [f"Item {i}" for i in range(30)])
+        _, page = self.request("/api/items?status=expired")
+        self.assertEqual(len(page["items"]), 5)
+        self.assertEqual(self.request("/api/items?limit=abc")[0].status, 400)
+        self.assertEqual(self.request("/api/items?status=stale")[0].status, 400)
+        response, body = self.request("/api/items?cursor=-3")
+        self.assertEqual((response.status, body["error"]), (400, "cursor must be >= 0"))
+        response, body = self.request("/api/items?limit=0")
+        self.assertEqual(body["error"], "limit must be between 1 and 500")
+
+    def test_etag_and_not_modified(self):
+        response, _ = self.request("/api/status")
+        etag = response.getheader("ETag")
+        response, body = self.request("/api/status", **{"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        self.assertIsNone(body)
+        database.insert_food_item("anna", "Milk", "Dairy", "2020-01-01", "2999-01-01", 1.0, "l", 1.0)
+        response, body = self.request("/api/status", **{"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.getheader("ETag"), etag)
+        self.assertEqual(body["ok"], 26)
+
+    def test_gzip(self):
+        response, page = self.request("/api/items?limit=30", **{"Accept-Encoding": "gzip"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(len(page["items"]), 30)
+        response, _ = self.request("/api/status", **{"Accept-Encoding": "gzip"})
+        self.assertIsNone(response.getheader("Content-Encoding"))  # too small to be worth it
+
+    def test_metrics_endpoint(self):
+        conn = http.client.HTTPConnection(*self.server.server_address[:2], timeout=5)
+        try:
+            conn.request("GET", "/metrics")
+            response = conn.getresponse()
+            response.read()
+        finally:
+            conn.close()
+        self.assertEqual(response.status, 200)
+        self.assertTrue(response.getheader("Content-Type").startswith("text/plain"))
+
+
+if __name__ == "__main__":
+    unittest.main()
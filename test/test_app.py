@@ -1,6 +1,12 @@
 import unittest
+import os
+import sqlite3
 import pandas as pd
-from app import calculate_statistics
+from datetime import date, timedelta
+from my_project.db import database
+from my_project.inventory import (
+    calculate_statistics, check_status, compute_status, grouped_statistics, load_inventory, load_typed_inventory,
+)
 
 class TestAppLogic(unittest.TestCase):
     def test_calculate_statistics(self):
@@ -19,5 +25,97 @@ class TestAppLogic(unittest.TestCase):
         self.assertEqual(ok_items, 3)
         self.assertAlmostEqual(lost_value, 2.5)  # 2 * 1.25 = 2.5 €
 
+    def test_calculate_statistics_ui_columns(self):
+        df = pd.DataFrame({
+            "Status": ["❌ Expired", "❌ Expired", "✅ OK"],
+            "Quantity": [2, 1, 5],
+            "Price per Unit": [1.5, 4.0, 1.0],
+        })
+        self.assertEqual(calculate_statistics(df)[:3], (3, 2, 1))
+        self.assertAlmostEqual(calculate_statistics(df)[3], 7.0)
+
+    def test_calculate_statistics_empty(self):
+        df = pd.DataFrame(columns=["Status", "quantity", "price_per_unit"])
+        self.assertEqual(calculate_statistics(df), (0, 0, 0, 0.0))
+
+    def test_grouped_statistics_chunks_match_single_pass(self):
+        df = pd.DataFrame({
+            "User": ["carlo", "carlo", "anna", "carlo", "anna"],
+            "Category": ["Dairy", "Dairy", "Fruit", "Meat", "Fruit"],
+            "Status": ["❌ Expired", "⚠️ Expiring Soon", "❌ Expired", "✅ OK", "⚠️ Expiring Soon"],
+            "quantity": [1, 2, 3, 1, 2],
+            "price_per_unit": [2.0, 1.0, 0.5, 9.0, 1.5],
+        })
+        stats = grouped_statistics(df)
+        self.assertEqual(stats.loc[("carlo", "Dairy"), "expired_items"], 1)
+        self.assertAlmostEqual(stats.loc[("carlo", "Dairy"), "lost_value"], 2.0)
+        self.assertAlmostEqual(stats.loc[("carlo", "Dairy"), "value_at_risk"], 2.0)
+        self.assertAlmostEqual(stats.loc[("anna", "Fruit"), "value_at_risk"], 3.0)
+
+        chunked = grouped_statistics(df.iloc[i:i + 2] for i in range(0, len(df), 2))
+        pd.testing.assert_frame_equal(chunked.sort_index(), stats.sort_index(), check_dtype=False)
+
+    def test_compute_status_matches_check_status(self):
+        today = date.today()
+        dates = pd.Series([(today + timedelta(days=d)).isoformat() for d in range(-5, 8)])
+        expected = dates.apply(check_status)
+        pd.testing.assert_series_equal(compute_status(dates), expected)
+
+    def test_compute_status_reference_date(self):
+        dates = pd.Series(["2025-08-09", "2025-08-10", "2025-08-13", "2025-08-14"])
+        self.assertEqual(
+            compute_status(dates, today=date(2025, 8, 10)).tolist(),
+            ["❌ Expired", "⚠️ Expiring Soon", "⚠️ Expiring Soon", "✅ OK"],
+        )
+
+class TestTypedInventory(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_typed_inventory.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        self.saved = database.create_connection
+        database.create_connection = test_create_connection
+        database.initialize_db()
+        database.insert_food_items([
+            ("carlo", "Milk", "Dairy", "2025-08-01", "2025-08-09", 2.0, "L", 1.25),
+            ("carlo", "Yogurt", "Dairy", "2025-08-01", "2025-08-12", 4.0, "pcs", 0.5),
+            ("carlo", "Rice", "Other", "2025-07-01", "2026-01-01", 1.0, "kg", 2.0),
+            ("anna", "Apples", "Fruit", "2025-08-01", "2025-08-09", 6.0, "pcs", 0.4),
+        ])
+
+    def tearDown(self):
+        database.create_connection = self.saved
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def test_dtypes(self):
+        df = load_typed_inventory("carlo", today=date(2025, 8, 10))
+        self.assertNotIn("User", df.columns)
+        self.assertEqual(df["Name"].tolist(), ["Milk", "Yogurt", "Rice"])
+        for column in ("Category", "Unit", "Status"):
+            self.assertEqual(df[column].dtype, "category", column)
+        self.assertEqual(df["Status"].tolist(), ["❌ Expired", "⚠️ Expiring Soon", "✅ OK"])
+        self.assertEqual(df["Expiration Date"].iloc[0], pd.Timestamp("2025-08-09"))
+        self.assertEqual(df["Quantity"].dtype, "float32")
+        self.assertEqual(df["Price per Unit"].dtype, "float32")
+
+    def test_matches_load_inventory(self):
+        typed = load_typed_inventory("carlo")
+        plain = load_inventory("carlo")
+        self.assertEqual(typed["Status"].astype(str).tolist(), plain["Status"].tolist())
+        self.assertEqual(typed["Expiration Date"].dt.strftime("%Y-%m-%d").tolist(), plain["Expiration Date"].tolist())
+        self.assertEqual(calculate_statistics(typed)[:3], calculate_statistics(plain)[:3])
+        self.assertAlmostEqual(calculate_statistics(typed)[3], calculate_statistics(plain)[3], places=5)
+        self.assertLess(typed.memory_usage(deep=True).sum(), plain.memory_usage(deep=True).sum())
+
+    def test_empty_and_missing_values(self):
+        self.assertTrue(load_typed_inventory("nobody").empty)
+        database.insert_food_item("bob", "Salt", "Other", None, None, None, "kg", None)
+        df = load_typed_inventory("bob")
+        self.assertTrue(pd.isna(df["Expiration Date"].iloc[0]))
+        self.assertEqual(df["Status"].iloc[0], "✅ OK")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import io
+import os
+import sys
+import tempfile
+from unittest import mock
+from my_project import assets
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        try:
+            from PIL import Image
+        except ImportError:
+            self.skipTest("Pillow is not installed")
+        self.Image = Image
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = assets.ASSET_CACHE
+        assets.ASSET_CACHE = os.path.join(self.tmp.name, "cache")
+        self.source = os.path.join(self.tmp.name, "banner.jpg")
+        Image.new("RGB", (400, 300), "orange").save(self.source, quality=95)
+
+    def tearDown(self):
+        assets.ASSET_CACHE = self.saved
+        self.tmp.cleanup()
+
+    def test_resized_cropped_and_cached(self):
+        data = assets.optimize_image(self.source, 200, 80, aspect=2.0)
+        self.assertEqual(self.Image.open(io.BytesIO(data)).size, (200, 100))
+        self.assertEqual(len(os.listdir(assets.ASSET_CACHE)), 1)
+        with mock.patch.object(assets, "_recompress") as recompress:
+            self.assertEqual(assets.optimize_image(self.source, 200, 80, aspect=2.0), data)
+        recompress.assert_not_called()
+        # Other settings or a new source get their own file
+        assets.optimize_image(self.source, 100, 80)
+        self.Image.new("RGB", (300, 300), "green").save(self.source)
+        self.assertEqual(self.Image.open(io.BytesIO(assets.optimize_image(self.source, 200, 80))).size, (200, 200))
+        self.assertEqual(len(os.listdir(assets.ASSET_CACHE)), 3)
+
+    def test_without_pillow_the_source_is_used(self):
+        with mock.patch.dict(sys.modules, {"PIL": None}):
+            data = assets.optimize_image(self.source, 200, 80)
+        with open(self.source, "rb") as f:
+            self.assertEqual(data, f.read())
+        self.assertFalse(os.path.exists(assets.ASSET_CACHE))
+
+    def test_missing_banner(self):
+        with mock.patch.object(assets, "BANNER_SOURCE", os.path.join(self.tmp.name, "missing.jpg")):
+            assets.banner.cache_clear()
+            with self.assertLogs("my_project.assets", "WARNING"):
+                self.assertIsNone(assets.banner())
+        assets.banner.cache_clear()
+
+    def test_page_style(self):
+        style = assets.page_style()
+        self.assertEqual(style.count("<style>"), 1)
+        self.assertIn(".st-key-banner img", style)
+        self.assertNotIn("/*", style)
+        self.assertNotIn("data:image", style)
+
+    def test_background_is_an_image_not_css(self):
+        with mock.patch.object(assets, "BANNER_SOURCE", self.source):
+            assets.background.cache_clear()
+            data = assets.background()
+        assets.background.cache_clear()
+        self.assertEqual(self.Image.open(io.BytesIO(data)).size, (400, 300))  # not cropped like the banner
+        self.assertLess(len(assets.page_style()), 4096)
+
+
+if __name__ == "__main__":
+    unittest.main()
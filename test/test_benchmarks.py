@@ -0,0 +1,34 @@
+import unittest
+from datetime import date
+from benchmarks import datagen
+from benchmarks.suite import compare, measure
+from benchmarks.bench_async import percentile
+
+
+class TestBenchmarkTools(unittest.TestCase):
+    def test_generate_items(self):
+        items = list(datagen.generate_items(30, 4, seed=1, today=date(2025, 8, 10)))
+        self.assertEqual(len(items), 30)
+        self.assertEqual({item[0] for item in items}, set(datagen.user_names(4)))
+        self.assertEqual(items, list(datagen.generate_items(30, 4, seed=1, today=date(2025, 8, 10))))
+
+    def test_measure(self):
+        result = measure(lambda x: x, 3, setup=lambda i: (i,))
+        self.assertEqual(result["repeat"], 3)
+        self.assertLessEqual(result["min_s"], result["median_s"])
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": {"a": {"median_s": 1.0}, "b": {"median_s": 1.0}, "gone": {"median_s": 1.0}}}
+        current = {"results": {"a": {"median_s": 1.05}, "b": {"median_s": 1.5}}}
+        rows = {name: regressed for name, _, _, _, regressed in compare(baseline, current, 0.1)}
+        self.assertEqual(rows, {"a": False, "b": True})
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import os
+import sqlite3
+from my_project.db import database
+from my_project.cache import InventoryCache
+
+
+class TestInventoryCache(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_cache.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        self.saved = database.create_connection
+        database.create_connection = test_create_connection
+        database.initialize_db()
+
+        self.cache = InventoryCache(maxsize=2)
+        self.loads = []
+
+    def tearDown(self):
+        database.create_connection = self.saved
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def loader(self, user):
+        self.loads.append(user)
+        return database.get_all_food_items(user)
+
+    def insert(self, user, name):
+        database.insert_food_item(user, name, "Dairy", "2025-08-01", "2025-08-10", 1.0, "L", 1.5)
+
+    def test_hit_until_user_data_changes(self):
+        self.insert("carlo", "Milk")
+        self.assertEqual(len(self.cache.get("carlo", self.loader)), 1)
+        self.cache.get("carlo", self.loader)
+        self.assertEqual(self.loads, ["carlo"])
+
+        self.insert("carlo", "Butter")
+        self.assertEqual(len(self.cache.get("carlo", self.loader)), 2)
+        self.assertEqual(self.loads, ["carlo", "carlo"])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_other_users_stay_cached(self):
+        self.cache.get("carlo", self.loader)
+        self.cache.get("anna", self.loader)
+        self.insert("anna", "Tea")
+        self.cache.get("carlo", self.loader)
+        self.cache.get("anna", self.loader)
+        self.assertEqual(self.loads, ["carlo", "anna", "anna"])
+
+    def test_delete_bumps_version(self):
+        self.insert("carlo", "Milk")
+        item_id = self.cache.get("carlo", self.loader)[0][0]
+        database.delete_food_item(item_id, "anna")  # not anna's item: nothing changes
+        self.cache.get("carlo", self.loader)
+        database.delete_food_item(item_id, "carlo")
+        self.assertEqual(self.cache.get("carlo", self.loader), [])
+        self.assertEqual(self.loads, ["carlo", "carlo"])
+
+    def test_lru_eviction(self):
+        for user in ("a", "b", "a", "c", "a", "b"):
+            self.cache.get(user, self.loader)
+        self.assertEqual(self.loads, ["a", "b", "c", "b"])
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+
+    def test_invalidate(self):
+        self.cache.get("carlo", self.loader)
+        self.cache.invalidate("carlo")
+        self.cache.get("carlo", self.loader)
+        self.assertEqual(self.loads, ["carlo", "carlo"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import os
 import sqlite3
+from datetime import date
 from my_project.db import database
 
 class TestFoodItems(unittest.TestCase):
@@ -35,6 +36,173 @@ class TestFoodItems(unittest.TestCase):
         self.assertEqual(items[0][2], "Yogurt")
 
 
+class TestExpiryStatus(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_status.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        database.create_connection = test_create_connection
+        database.initialize_db()
+
+        for name, exp in [("Milk", "2025-08-09"), ("Eggs", "2025-08-10"),
+                          ("Ham", "2025-08-13"), ("Rice", "2025-08-14")]:
+            database.insert_food_item("carlo", name, "Other", "2025-08-01", exp, 1.0, "pcs", 1.0)
+        database.insert_food_item("anna", "Tea", "Drinks", "2025-08-01", "2025-01-01", 1.0, "pcs", 1.0)
+
+    def tearDown(self):
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def test_status_computed_in_sql(self):
+        rows = database.get_food_items_with_status("carlo", today=date(2025, 8, 10))
+        statuses = {row[2]: row[-1] for row in rows}
+        self.assertEqual(statuses, {
+            "Milk": "❌ Expired",
+            "Eggs": "⚠️ Expiring Soon",
+            "Ham": "⚠️ Expiring Soon",
+            "Rice": "✅ OK",
+        })
+
+    def test_status_counts(self):
+        counts = database.count_food_items_by_status("carlo", today="2025-08-10")
+        self.assertEqual(counts, {"✅ OK": 1, "⚠️ Expiring Soon": 2, "❌ Expired": 1})
+        self.assertEqual(database.count_food_items_by_status("nobody"),
+                         {"✅ OK": 0, "⚠️ Expiring Soon": 0, "❌ Expired": 0})
+
+    def test_status_counts_on_other_dates(self):
+        counts = database.count_food_items_by_status("carlo", today=date(2025, 8, 13), soon_days=7)
+        self.assertEqual(counts, {"✅ OK": 0, "⚠️ Expiring Soon": 2, "❌ Expired": 2})
+        counts = database.count_food_items_by_status("carlo", today="2025-08-01", soon_days=0)
+        self.assertEqual(counts, {"✅ OK": 4, "⚠️ Expiring Soon": 0, "❌ Expired": 0})
+        with self.assertRaises(ValueError):
+            database.count_food_items_by_status("carlo", soon_days=-1)
+
+    def test_expiry_histogram(self):
+        histogram = database.get_expiry_histogram("carlo", today="2025-08-10", horizon=4)
+        self.assertEqual(histogram, [(0, 1), (1, 0), (2, 0), (3, 1), (4, 1)])
+        histogram = database.get_expiry_histogram("carlo", today="2025-08-10", horizon=5, bucket_days=3, past_days=1)
+        self.assertEqual(histogram, [(-1, 2), (2, 2), (5, 0)])
+        self.assertEqual(database.get_expiry_histogram("anna", today="2025-08-10", horizon=1), [(0, 0), (1, 0)])
+
+    def test_aggregate_food_items(self):
+        rows = database.aggregate_food_items(today=date(2025, 8, 10))
+        by_user = {row[0]: row[2:] for row in rows}
+        self.assertEqual(by_user["anna"], (1, 1, 0, 0, 1.0, 0.0))
+        carlo = [row for row in rows if row[0] == "carlo"]
+        self.assertEqual(carlo, [("carlo", "Other", 4, 1, 2, 1, 1.0, 2.0)])
+        self.assertEqual(len(database.aggregate_food_items("anna")), 1)
+
+
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_pagination.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        database.create_connection = test_create_connection
+        database.initialize_db()
+        database.insert_food_items(
+            ("carlo", f"{'Milk' if i % 3 == 0 else 'Bread'} {i}", "Other", "2025-08-01",
+             "2025-08-09" if i % 2 else "2025-08-20", 1.0, "pcs", 1.0)
+            for i in range(25)
+        )
+        database.insert_food_item("carlo", "100%_juice", "Drinks", "2025-08-01", "2025-08-20", 1.0, "L", 1.0)
+
+    def tearDown(self):
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def test_keyset_pages_cover_all_items(self):
+        seen, after_id = [], None
+        while True:
+            page = database.get_food_items_page("carlo", limit=10, after_id=after_id)
+            if not page:
+                break
+            seen.extend(row[0] for row in page)
+            after_id = page[-1][0]
+        self.assertEqual(seen, sorted(row[0] for row in database.get_all_food_items("carlo")))
+        self.assertEqual(database.count_food_items("carlo"), 26)
+
+    def test_search_and_status_filters(self):
+        self.assertEqual(database.count_food_items("carlo", search="milk"), 9)
+        self.assertEqual(database.count_food_items("carlo", search="0%_"), 1)
+        self.assertEqual(database.count_food_items("carlo", search="0%"), 1)
+        expired = database.get_food_items_page("carlo", limit=100, statuses=["❌ Expired"], today=date(2025, 8, 10))
+        self.assertEqual(len(expired), 12)
+        self.assertTrue(all(row[-1] == "❌ Expired" for row in expired))
+        self.assertEqual(database.count_food_items("carlo", search="milk", today=date(2025, 8, 10),
+                                                   statuses=["✅ OK", "⚠️ Expiring Soon"]), 5)
+
+    def test_keyset_query_avoids_sort(self):
+        conn = sqlite3.connect(self.test_db_path)
+        plan = " | ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM food_items WHERE user = ? AND id > ? ORDER BY id LIMIT 20",
+            ("carlo", 0)))
+        conn.close()
+        self.assertIn("idx_food_items_user ", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_search.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        self.saved = (database.create_connection, database.SEARCH_SCAN_ITEMS)
+        database.create_connection = test_create_connection
+        database.initialize_db()
+        database.insert_food_items([
+            ("carlo", "Greek Yogurt", "Dairy", "2025-08-01", "2025-08-20", 1.0, "pcs", 1.0),
+            ("carlo", "Bananas", "Fruit", "2025-08-01", "2025-08-09", 6.0, "pcs", 0.3),
+            ("carlo", 'Say "cheese"', "Dairy", "2025-08-01", "2025-08-20", 1.0, "pcs", 1.0),
+            ("carlo", "Banana bread", "Other", "2025-08-01", "2025-08-20", 1.0, "pcs", 1.0),
+            ("anna", "Yogurt", "Dairy", "2025-08-01", "2025-08-20", 1.0, "pcs", 1.0),
+        ])
+
+    def tearDown(self):
+        database.create_connection, database.SEARCH_SCAN_ITEMS = self.saved
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def names(self, query, **kwargs):
+        return [row[2] for row in database.search_food_items("carlo", query, **kwargs)]
+
+    def check_searches(self):
+        self.assertEqual(self.names("YOG"), ["Greek Yogurt"])
+        self.assertEqual(self.names("dairy"), ["Greek Yogurt", 'Say "cheese"'])
+        self.assertEqual(self.names('"chee'), ['Say "cheese"'])
+        self.assertEqual(self.names("ba"), ["Bananas", "Banana bread"])
+        # Fuzzy: one wrong, missing or extra character; closest first
+        self.assertEqual(self.names("yoghurt"), ["Greek Yogurt"])
+        self.assertEqual(self.names("bananna"), ["Bananas", "Banana bread"])
+        self.assertEqual(self.names("yoghurt", fuzzy=False), [])
+        self.assertEqual(self.names("lemonade"), [])
+        row = database.search_food_items("carlo", "bananas", today=date(2025, 8, 10))[0]
+        self.assertEqual(row[-1], "❌ Expired")
+
+    def test_scan(self):
+        self.check_searches()
+
+    def test_fts_index(self):
+        database.SEARCH_SCAN_ITEMS = 0  # every inventory counts as large
+        self.check_searches()
+
+    def test_index_follows_writes(self):
+        database.SEARCH_SCAN_ITEMS = 0
+        database.delete_food_item(database.search_food_items("carlo", "greek")[0][0], "carlo")
+        self.assertEqual(self.names("yog"), [])
+        database.insert_food_item("carlo", "Frozen yogurt", "Dairy", "2025-08-01", "2025-08-20", 1.0, "pcs", 1.0)
+        self.assertEqual(self.names("yog"), ["Frozen yogurt"])
+        conn = sqlite3.connect(self.test_db_path)
+        conn.execute("INSERT INTO food_items_fts (food_items_fts) VALUES ('integrity-check')")
+        conn.close()
+
+
 class TestUsers(unittest.TestCase):
     def setUp(self):
         # Usa un database temporaneo per gli utenti
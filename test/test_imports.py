@@ -0,0 +1,39 @@
+import unittest
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pandas", "numpy", "streamlit", "plotly", "requests")
+IMPORT_BUDGET_US = 500_000  # generous for slow CI machines; locally it is ~40 ms
+
+
+def run_python(*args):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+class TestImportCost(unittest.TestCase):
+    def test_logic_modules_skip_heavy_imports(self):
+        code = ("import sys, my_project.inventory, my_project.cache; "
+                f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+        self.assertEqual(run_python("-c", code).stdout.strip(), "")
+
+    def test_import_time_budget(self):
+        # -X importtime lines: "import time: self [us] | cumulative | name"
+        stderr = run_python("-X", "importtime", "-c", "import my_project.inventory").stderr
+        cumulative = {}
+        for line in stderr.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                _, total, name = line.split("|")
+                if total.strip().isdigit():
+                    cumulative[name.strip()] = int(total)
+        self.assertIn("my_project.inventory", cumulative)
+        self.assertLess(cumulative["my_project.inventory"], IMPORT_BUDGET_US)
+
+    def test_import_does_not_configure_logging(self):
+        code = "import logging, my_project.db.database; print(len(logging.getLogger().handlers))"
+        self.assertEqual(run_python("-c", code).stdout.strip(), "0")
+
+
+if __name__ == "__main__":
+    unittest.main()
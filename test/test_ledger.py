@@ -0,0 +1,60 @@
+import unittest
+import os
+import sqlite3
+from datetime import date
+from my_project.db import database
+
+
+class TestWasteLedger(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_ledger.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        self.saved = database.create_connection
+        database.create_connection = test_create_connection
+        database.initialize_db()
+
+    def tearDown(self):
+        database.create_connection = self.saved
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def add(self, name, expiration_date, quantity=2.0, price=1.5):
+        database.insert_food_item("carlo", name, "Dairy", "2025-01-01", expiration_date, quantity, "pcs", price)
+        return database.get_all_food_items("carlo")[-1][0]
+
+    def test_default_reason_depends_on_expiry(self):
+        fresh, old = self.add("Milk", "2025-08-20"), self.add("Cream", "2025-08-01")
+        self.assertTrue(database.delete_food_item(fresh, "carlo", today=date(2025, 8, 10)))
+        self.assertTrue(database.delete_food_item(old, "carlo", today=date(2025, 8, 10)))
+        events = database.get_item_events("carlo")
+        self.assertEqual([(e[1], e[3]) for e in events], [("Cream", "wasted"), ("Milk", "consumed")])
+        self.assertEqual(events[0][5], date(2025, 8, 10))
+
+    def test_monthly_aggregates(self):
+        for day, reason in [(date(2025, 7, 3), "wasted"), (date(2025, 7, 30), "consumed"),
+                            (date(2025, 8, 1), "wasted"), (date(2025, 8, 2), "wasted")]:
+            database.delete_food_item(self.add("Milk", "2025-12-01"), "carlo", reason=reason, today=day)
+        self.assertEqual(database.get_waste_trend("carlo"), [
+            ("2025-07", 1, 3.0, 1, 3.0),
+            ("2025-08", 0, 0.0, 2, 6.0),
+        ])
+        self.assertEqual(len(database.get_waste_trend("carlo", since_month="2025-08")), 1)
+        self.assertEqual(database.get_waste_trend("anna"), [])
+
+    def test_missing_item_is_not_logged(self):
+        item_id = self.add("Milk", "2025-12-01")
+        self.assertFalse(database.delete_food_item(item_id, "anna"))
+        self.assertEqual(database.get_item_events("carlo"), [])
+
+    def test_invalid_reason_rolls_back(self):
+        item_id = self.add("Milk", "2025-12-01")
+        with self.assertRaises(ValueError):
+            database.delete_food_item(item_id, "carlo", reason="lost")
+        self.assertEqual(len(database.get_all_food_items("carlo")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
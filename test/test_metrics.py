@@ -0,0 +1,99 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+from my_project import metrics
+from my_project.db import database
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.saved = metrics.enabled
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.enable(self.saved)
+        metrics.reset()
+
+    def test_disabled_records_nothing(self):
+        metrics.enable(False)
+        metrics.count("calls_total")
+        metrics.observe("call_seconds", 0.01)
+        with metrics.timer("block_seconds"):
+            pass
+        self.assertEqual(metrics.snapshot(), {"counters": [], "histograms": []})
+
+    def test_timed_and_prometheus_export(self):
+        metrics.enable()
+
+        @metrics.timed("lookup_seconds", rows="lookup_rows_total", kind="test")
+        def lookup(n):
+            return list(range(n))
+
+        self.assertEqual(lookup(3), [0, 1, 2])
+        lookup(2)
+        metrics.observe("lookup_seconds", 60.0, kind="test")  # beyond the last bucket
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["counters"], [{"name": "lookup_rows_total", "labels": {"kind": "test"}, "value": 5}])
+        self.assertEqual(snapshot["histograms"][0]["count"], 3)
+
+        text = metrics.prometheus_text()
+        self.assertIn("# TYPE lookup_seconds histogram", text)
+        self.assertIn('lookup_seconds_bucket{kind="test",le="10.0"} 2', text)
+        self.assertIn('lookup_seconds_bucket{kind="test",le="+Inf"} 3', text)
+        self.assertIn('lookup_seconds_count{kind="test"} 3', text)
+        self.assertIn('lookup_rows_total{kind="test"} 5', text)
+
+    def test_profiled_keeps_only_slow_runs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with metrics.profiled("fast", directory, slow_ms=10_000) as path:
+                sum(range(1000))
+            self.assertFalse(os.path.exists(path))
+            with metrics.profiled("slow section", directory, slow_ms=0) as path:
+                sum(range(1000))
+            self.assertTrue(os.path.exists(path))
+            with metrics.profiled("never", directory, sample=0.0) as path:
+                self.assertIsNone(path)
+            with metrics.profiled("off") as path:
+                self.assertIsNone(path)
+
+
+class TestDatabaseInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_metrics.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        self.saved = (database.create_connection, metrics.enabled)
+        database.create_connection = test_create_connection
+        database.initialize_db()
+        metrics.reset()
+        metrics.enable()
+
+    def tearDown(self):
+        database.create_connection, enabled = self.saved
+        metrics.enable(enabled)
+        metrics.reset()
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def test_calls_rows_and_statements(self):
+        database.insert_food_item("anna", "Milk", "Dairy", "2025-08-01", "2025-08-10", 1.0, "l", 1.0)
+        database.insert_food_item("anna", "Eggs", "Dairy", "2025-08-01", "2025-08-10", 6.0, "pcs", 0.3)
+        self.assertEqual(len(database.get_all_food_items("anna")), 2)
+        snapshot = metrics.snapshot()
+        calls = {h["labels"]["function"]: h["count"] for h in snapshot["histograms"] if h["name"] == "db_call_seconds"}
+        self.assertEqual(calls, {"insert_food_item": 2, "get_all_food_items": 1})
+        counters = {(c["name"], c["labels"].get("function")): c["value"] for c in snapshot["counters"]}
+        self.assertEqual(counters[("db_rows_total", "get_all_food_items")], 2)
+        self.assertGreaterEqual(counters[("db_statements_total", None)], 5)
+
+    def test_plumbing_is_not_wrapped(self):
+        self.assertEqual(database.get_all_food_items.__name__, "get_all_food_items")
+        self.assertTrue(hasattr(database.get_all_food_items, "__wrapped__"))
+        for name in ("iter_food_items", "_default_create_connection", "to_day_number"):
+            self.assertFalse(hasattr(getattr(database, name), "__wrapped__"), name)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import os
+import sqlite3
+import threading
+from my_project.db import database
+from my_project.db.migrations import current_version, latest_version, migrate
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_migrations.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        self.saved = database.create_connection
+        database.create_connection = test_create_connection
+
+    def tearDown(self):
+        database.create_connection = self.saved
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def query_plan(self, sql, params):
+        conn = sqlite3.connect(self.test_db_path)
+        plan = " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+        conn.close()
+        return plan
+
+    def test_fresh_db_is_at_latest_version(self):
+        database.initialize_db()
+        conn = sqlite3.connect(self.test_db_path)
+        self.assertEqual(current_version(conn), latest_version())
+        # Running again is a no-op
+        self.assertEqual(migrate(conn), latest_version())
+        conn.close()
+
+    def test_concurrent_initialization_applies_each_step_once(self):
+        errors = []
+        barrier = threading.Barrier(4)
+
+        def initialize():
+            conn = sqlite3.connect(self.test_db_path, timeout=10)
+            barrier.wait()
+            try:
+                database.create_schema(conn)
+            except sqlite3.Error as e:
+                errors.append(e)
+            finally:
+                conn.close()
+
+        for _ in range(5):
+            if os.path.exists(self.test_db_path):
+                os.remove(self.test_db_path)
+            threads = [threading.Thread(target=initialize) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(errors, [])
+        conn = sqlite3.connect(self.test_db_path)
+        self.assertEqual(current_version(conn), latest_version())
+        conn.close()
+
+    def test_upgrade_legacy_db_keeps_rows(self):
+        conn = sqlite3.connect(self.test_db_path)
+        conn.execute("""
+            CREATE TABLE food_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, user TEXT NOT NULL, name TEXT NOT NULL,
+                category TEXT, purchase_date TEXT, expiration_date TEXT,
+                quantity REAL, unit TEXT, price_per_unit REAL)
+        """)
+        conn.execute("INSERT INTO food_items (user, name, expiration_date) VALUES ('carlo', 'Milk', '1970-01-11')")
+        conn.commit()
+        conn.close()
+
+        database.initialize_db()
+
+        conn = sqlite3.connect(self.test_db_path)
+        self.assertEqual(conn.execute("SELECT expiration_day FROM food_items").fetchone()[0], 10)
+        conn.close()
+        self.assertEqual(database.get_all_food_items("carlo")[0][2], "Milk")
+        # Rows that existed before the search index are indexed by the migration
+        self.assertEqual(database.search_food_items("carlo", "mil")[0][2], "Milk")
+
+    def test_day_number_matches_python(self):
+        database.initialize_db()
+        database.insert_food_item("carlo", "Milk", "Dairy", "2025-08-01", "2025-08-10", 1.0, "L", 1.5)
+        conn = sqlite3.connect(self.test_db_path)
+        day = conn.execute("SELECT expiration_day FROM food_items").fetchone()[0]
+        conn.close()
+        self.assertEqual(day, database.to_day_number("2025-08-10"))
+
+    def test_hot_queries_use_indexes(self):
+        database.initialize_db()
+        plan = self.query_plan(f"SELECT {database.ITEM_COLUMNS} FROM food_items WHERE user = ?", ("carlo",))
+        self.assertIn("USING INDEX", plan)
+        self.assertNotIn("SCAN food_items", plan)
+
+        plan = self.query_plan(
+            "SELECT id FROM food_items WHERE user = ? AND expiration_day BETWEEN ? AND ?", ("carlo", 0, 10))
+        self.assertIn("idx_food_items_user_expiry", plan)
+
+        plan = self.query_plan("SELECT id FROM food_items WHERE user = ? AND category = ?", ("carlo", "Dairy"))
+        self.assertIn("idx_food_items_user_category", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import hashlib
+import os
+import sqlite3
+from unittest import mock
+from my_project.db import database, passwords
+
+
+class TestPasswordHashing(unittest.TestCase):
+    def test_hash_format_and_verify(self):
+        stored = passwords.hash_password("secret", n=2 ** 10)
+        self.assertTrue(stored.startswith("scrypt$1024$8$1$"))
+        self.assertEqual(passwords.verify_password("secret", stored), (True, True))  # cheaper than default
+        self.assertFalse(passwords.verify_password("wrong", stored)[0])
+
+    def test_hashes_are_salted(self):
+        self.assertNotEqual(passwords.hash_password("secret"), passwords.hash_password("secret"))
+
+    def test_legacy_hash_needs_rehash(self):
+        legacy = hashlib.sha256(b"secret").hexdigest()
+        self.assertEqual(passwords.verify_password("secret", legacy), (True, True))
+        self.assertEqual(passwords.verify_password("wrong", legacy), (False, True))
+
+    def test_malformed_hash_is_rejected(self):
+        self.assertEqual(passwords.verify_password("secret", "scrypt$x$y"), (False, False))
+
+    def test_login_cache_expires(self):
+        cache = passwords.LoginCache(ttl=-1)
+        cache.add("carlo", "secret", "hash")
+        self.assertFalse(cache.check("carlo", "secret", "hash"))
+
+        cache = passwords.LoginCache(ttl=60, maxsize=2)
+        for user in ("a", "b", "c"):
+            cache.add(user, "pw", "hash")
+        self.assertFalse(cache.check("a", "pw", "hash"))
+        self.assertTrue(cache.check("c", "pw", "hash"))
+        self.assertFalse(cache.check("c", "other", "hash"))
+
+
+class TestCredentialStore(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_passwords.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        self.saved = database.create_connection
+        database.create_connection = test_create_connection
+        database.initialize_db()
+        passwords.login_cache.clear()
+
+    def tearDown(self):
+        database.create_connection = self.saved
+        passwords.login_cache.clear()
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def stored_hash(self, username):
+        conn = sqlite3.connect(self.test_db_path)
+        row = conn.execute("SELECT password_hash FROM users WHERE username = ?", (username,)).fetchone()
+        conn.close()
+        return row[0]
+
+    def test_legacy_hash_upgraded_on_login(self):
+        conn = sqlite3.connect(self.test_db_path)
+        conn.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)",
+                     ("alice", hashlib.sha256(b"password123").hexdigest()))
+        conn.commit()
+        conn.close()
+
+        self.assertFalse(database.check_user_credentials("alice", "wrong"))
+        self.assertTrue(passwords.is_legacy_hash(self.stored_hash("alice")))
+        self.assertTrue(database.check_user_credentials("alice", "password123"))
+        self.assertTrue(self.stored_hash("alice").startswith("scrypt$"))
+        self.assertTrue(database.check_user_credentials("alice", "password123"))
+
+    def test_reruns_skip_the_kdf(self):
+        database.add_user("carlo", "secret")
+        with mock.patch.object(passwords, "_run_kdf", wraps=passwords._run_kdf) as kdf:
+            for _ in range(5):
+                self.assertTrue(database.check_user_credentials("carlo", "secret"))
+            self.assertFalse(database.check_user_credentials("carlo", "wrong"))
+        self.assertEqual(kdf.call_count, 2)  # first login and the wrong password
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import tempfile
+import threading
+from my_project.db import database
+from my_project.db.pool import ConnectionPool, PoolClosedError
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pool = ConnectionPool(os.path.join(self.tmp.name, "pool.db"), max_size=4)
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmp.cleanup()
+
+    def test_connection_is_reused(self):
+        with self.pool.connection() as first:
+            pass
+        with self.pool.connection() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(len(self.pool), 1)
+
+    def test_wal_mode_enabled(self):
+        with self.pool.connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_rollback_on_error(self):
+        with self.assertRaises(ValueError):
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO t VALUES (1)")
+                raise ValueError("boom")
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+
+    def test_concurrent_writers(self):
+        def worker():
+            for i in range(50):
+                with self.pool.connection() as conn:
+                    conn.execute("INSERT INTO t VALUES (?)", (i,))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 400)
+        self.assertLessEqual(len(self.pool), 4)
+
+    def test_closed_pool_rejects_checkout(self):
+        self.pool.close()
+        with self.assertRaises(PoolClosedError):
+            self.pool.acquire()
+
+
+class TestPooledDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (database.db_path, database.create_connection)
+        database.db_path = os.path.join(self.tmp.name, "food_items.db")
+        database.create_connection = database._default_create_connection
+        database.initialize_db()
+
+    def tearDown(self):
+        database.close_pool()
+        database.db_path, database.create_connection = self.saved
+        self.tmp.cleanup()
+
+    def test_crud_through_pool(self):
+        database.insert_food_item("carlo", "Milk", "Dairy", "2025-08-01", "2025-08-10", 1.0, "L", 1.5)
+        items = database.get_all_food_items("carlo")
+        self.assertEqual(len(items), 1)
+        database.delete_food_item(items[0][0], "carlo")
+        self.assertEqual(database.get_all_food_items("carlo"), [])
+        self.assertIs(database.get_pool().path, database.db_path)
+
+    def test_pool_follows_db_path(self):
+        old_pool = database.get_pool()
+        database.db_path = os.path.join(self.tmp.name, "other.db")
+        self.assertIsNot(database.get_pool(), old_pool)
+        self.assertTrue(old_pool.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
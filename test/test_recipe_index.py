@@ -0,0 +1,90 @@
+import unittest
+import tempfile
+from my_project import recipes, recipe_index
+from my_project.recipe_index import RecipeIndex, tokenize
+from test.stubs import StubRecipeServer
+
+RECIPES = [
+    {"id": 1, "title": "Omelette", "ingredients": ["eggs", "butter", "salt"], "steps": ["Whisk.", "Fry."]},
+    {"id": 2, "title": "Pancakes", "ingredients": ["eggs", "whole milk", "flour", "sugar"], "steps": ["Mix."]},
+    {"id": 3, "title": "Fruit Salad", "ingredients": ["bananas", "apples", "greek yogurt"], "steps": []},
+    {"id": 4, "title": "Banana Bread", "ingredients": ["ripe bananas", "eggs", "flour", "butter", "sugar"]},
+]
+
+
+class TestRecipeIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = RecipeIndex(RECIPES)
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("2 Fresh Tomatoes, chopped"), ("tomato",))
+        self.assertEqual(tokenize("Cherries"), ("cherry",))
+        self.assertEqual(tokenize("Swiss cheese"), ("swiss", "cheese"))
+        self.assertEqual(tokenize("500 g"), ())
+
+    def test_match(self):
+        milk = self.index.match("Milk")
+        self.assertEqual(len(milk), 1)
+        self.assertEqual(self.index.match("whole milk"), milk)
+        self.assertEqual(self.index.match("Banana"), self.index.match("bananas"))
+        self.assertEqual(len(self.index.match("Greek yogurt")), 1)
+        self.assertEqual(self.index.match("Lemon"), frozenset())
+
+    def test_ranking(self):
+        titles = [r["title"] for r in self.index.search(["Eggs", "Bananas"], ["flour", "butter", "sugar"], 4)]
+        self.assertEqual(titles, ["Banana Bread", "Pancakes", "Omelette", "Fruit Salad"])
+        best = self.index.search(["Eggs"], ["Butter", "Salt"])[0]
+        self.assertEqual(best["title"], "Omelette")
+        self.assertEqual(best["missedIngredients"], [])
+        self.assertEqual(best["steps"], [{"number": 1, "step": "Whisk."}, {"number": 2, "step": "Fry."}])
+        self.assertEqual(best["source"], "local")
+
+    def test_no_match(self):
+        self.assertEqual(self.index.search(["Lemon"]), [])
+        self.assertEqual(self.index.search([]), [])
+        self.assertEqual(self.index.search(["Lemon"], ["Milk", "Eggs"]), [])
+        self.assertEqual(self.index.search([], ["Milk"])[0]["title"], "Pancakes")
+
+    def test_invalid_recipe(self):
+        with self.assertRaises(ValueError):
+            RecipeIndex([{"title": "Water"}])
+
+    def test_bundled_dataset(self):
+        index = RecipeIndex.load(recipe_index.DATASET)
+        self.assertGreater(len(index), 20)
+        self.assertTrue(index.search(["Eggs"]))
+
+
+class TestSuggestFallback(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = StubRecipeServer().__enter__()
+        self.saved = (recipes._default_client, recipe_index._index)
+        recipes._default_client = recipes.RecipeClient(
+            api_key="test", base_url=self.server.url, cache_dir=self.tmp.name)
+        recipe_index._index = RecipeIndex(RECIPES)
+
+    def tearDown(self):
+        recipes._default_client.close()
+        recipes._default_client, recipe_index._index = self.saved
+        self.server.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def test_local_match_skips_network(self):
+        self.assertEqual(recipe_index.suggest(["Eggs"])[0]["source"], "local")
+        self.assertEqual(self.server.calls, [])
+
+    def test_falls_back_to_remote(self):
+        suggestions = recipe_index.suggest(["Lemon"])
+        self.assertEqual(suggestions[0]["source"], "spoonacular")
+        self.assertEqual(suggestions[0]["steps"][0]["number"], 1)
+        self.assertEqual(recipe_index.suggest(["Lemon"], fallback=False), [])
+
+    def test_unknown_expiring_items_fall_back_despite_other_matches(self):
+        suggestions = recipe_index.suggest(["Dragonfruit"], ["Milk", "Eggs"])
+        self.assertEqual(suggestions[0]["source"], "spoonacular")
+        self.assertTrue(self.server.calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import tempfile
+from my_project.recipes import RecipeClient, RecipeError, normalize_ingredients
+from test.stubs import StubRecipeServer
+
+
+class TestRecipeClient(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = StubRecipeServer().__enter__()
+        self.client = RecipeClient(api_key="test", base_url=self.server.url, cache_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def test_normalize_ingredients(self):
+        self.assertEqual(normalize_ingredients([" Milk", "eggs", "milk ", ""]), ["eggs", "milk"])
+
+    def test_suggest_attaches_steps(self):
+        recipes = self.client.suggest(["Milk", "Eggs"], number=2)
+        self.assertEqual(len(recipes), 2)
+        self.assertEqual(recipes[1]["steps"][0]["step"], f"Cook recipe {recipes[1]['id']}")
+
+    def test_same_ingredient_set_is_cached(self):
+        self.client.suggest(["Milk", "Eggs"])
+        self.client.suggest(["eggs", "milk"])
+        self.assertEqual(len(self.server.calls), 2)  # one search + one instructions call
+        stats = self.client.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_cache_survives_new_client(self):
+        self.client.suggest(["Milk"])
+        other = RecipeClient(api_key="test", base_url=self.server.url, cache_dir=self.tmp.name)
+        other.suggest(["milk"])
+        other.close()
+        self.assertEqual(len(self.server.calls), 2)
+
+    def test_expired_entries_are_refetched(self):
+        client = RecipeClient(api_key="test", base_url=self.server.url, cache_dir=self.tmp.name, ttl=-1)
+        client.find_by_ingredients(["Milk"])
+        client.find_by_ingredients(["Milk"])
+        client.close()
+        self.assertEqual(len(self.server.calls), 2)
+
+    def test_timeout_raises_recipe_error(self):
+        self.server.delay = 0.5
+        client = RecipeClient(api_key="test", base_url=self.server.url, cache_dir=self.tmp.name,
+                              timeout=(1, 0.1))
+        with self.assertRaises(RecipeError):
+            client.find_by_ingredients(["Milk"])
+        client.close()
+
+    def test_no_ingredients_skips_network(self):
+        self.assertEqual(self.client.suggest([]), [])
+        self.assertEqual(self.server.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
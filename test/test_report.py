@@ -0,0 +1,86 @@
+import unittest
+import os
+import io
+import csv
+import json
+import sqlite3
+import tempfile
+from datetime import date
+from my_project import report
+from my_project.db import database, shards
+
+USERS = [f"user{i:02d}" for i in range(7)]
+TODAY = date(2025, 8, 10)
+
+
+class TestReport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (database.db_path, database.create_connection)
+        database.db_path = os.path.join(self.tmp.name, "food_items.db")
+        database.create_connection = database._default_create_connection
+        database.initialize_db()
+        database.insert_food_items([
+            (user, f"Item {i}", "Dairy", "2025-08-01", "2025-08-05" if i < u else "2025-08-30", 2.0, "pcs", 1.5)
+            for u, user in enumerate(USERS) for i in range(u + 1)])
+
+    def tearDown(self):
+        for conn in report._connections.values():
+            conn.close()
+        report._connections.clear()
+        database.configure_shards(None)
+        database.close_pool()
+        database.db_path, database.create_connection = self.saved
+        self.tmp.cleanup()
+
+    def test_chunk_matches_sql_statistics(self):
+        task = report.report_tasks(chunk_size=3, today=TODAY)[1]
+        self.assertEqual(task[1], USERS[3:6])
+        rows = report.report_chunk(task)
+        for user, total, expired, soon, ok, lost, risk in rows:
+            [expected] = database.aggregate_food_items(user, TODAY)
+            self.assertEqual((user, total, expired, soon, ok, lost, risk), expected[:1] + expected[2:])
+        with self.assertRaises(sqlite3.OperationalError):  # workers connect read-only
+            report._read_only(database.db_path).execute("DELETE FROM food_items")
+
+    def test_csv_with_workers_and_progress(self):
+        calls = []
+        f = io.StringIO()
+        chunks = report.generate_report(workers=2, chunk_size=2, today=TODAY,
+                                        progress=lambda done, total: calls.append((done, total)))
+        self.assertEqual(report.write_report(f, "csv", chunks), len(USERS))
+        rows = list(csv.DictReader(io.StringIO(f.getvalue())))
+        self.assertEqual([r["user"] for r in rows], USERS)
+        self.assertEqual(rows[3]["expired_items"], "3")
+        self.assertEqual(float(rows[3]["lost_value"]), 9.0)
+        self.assertEqual(calls, [(0, 7), (2, 7), (4, 7), (6, 7), (7, 7)])
+
+    def test_jsonl_across_shards(self):
+        database.close_pool()
+        shards.rebalance(shards.ShardMap(os.path.join(self.tmp.name, "shards"), 3), sources=[database.db_path])
+        database.configure_shards(os.path.join(self.tmp.name, "shards"))
+        f = io.StringIO()
+        report.write_report(f, "jsonl", report.generate_report(workers=1, today=TODAY))
+        rows = [json.loads(line) for line in f.getvalue().splitlines()]
+        self.assertEqual(sorted(r["user"] for r in rows), USERS)
+        self.assertEqual(sum(r["total_items"] for r in rows), 28)
+
+    def test_parquet(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        path = os.path.join(self.tmp.name, "report.parquet")
+        with open(path, "wb") as f:
+            report.write_report(f, "parquet", [report.report_chunk(t) for t in report.report_tasks(3, TODAY)])
+        table = pq.read_table(path)
+        self.assertEqual(table.column_names, report.REPORT_COLUMNS)
+        self.assertEqual(table.column("user").to_pylist(), USERS)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            report.write_report(io.StringIO(), "xml", [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import sqlite3
+from datetime import date
+from my_project import scanner
+from my_project.db import database
+
+
+class TestExpiryScanner(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_scanner.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        self.saved = database.create_connection
+        database.create_connection = test_create_connection
+        database.initialize_db()
+        database.insert_food_items([
+            ("carlo", "Milk", "Dairy", "2025-08-01", "2025-08-09", 1.0, "L", 1.5),    # expired
+            ("carlo", "Ham", "Meat", "2025-08-01", "2025-08-12", 1.0, "pcs", 3.0),    # expiring soon
+            ("carlo", "Rice", "Other", "2025-08-01", "2025-12-01", 1.0, "kg", 2.0),   # OK
+            ("anna", "Fish", "Fish", "2025-08-01", "2025-08-10", 1.0, "pcs", 9.0),    # expiring soon (today)
+            ("anna", "Jam", "Other", "2024-01-01", "2024-02-01", 1.0, "jar", 2.0),    # older than the lookback
+        ])
+
+    def tearDown(self):
+        database.create_connection = self.saved
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def kinds(self, user):
+        return {row[2]: row[3] for row in database.get_notifications(user)}
+
+    def test_scan_writes_events(self):
+        self.assertEqual(scanner.scan(date(2025, 8, 10), batch_size=2), 3)
+        self.assertEqual(self.kinds("carlo"), {"Milk": "expired", "Ham": "expiring_soon"})
+        self.assertEqual(self.kinds("anna"), {"Fish": "expiring_soon"})
+
+    def test_scan_looks_back_exactly_lookback_days(self):
+        database.insert_food_items([
+            ("carlo", "Bread", "Other", "2025-07-01", "2025-07-11", 1.0, "pcs", 1.0),  # 30 days ago
+            ("carlo", "Cake", "Other", "2025-07-01", "2025-07-10", 1.0, "pcs", 1.0),   # 31 days ago
+        ])
+        scanner.scan(date(2025, 8, 10), lookback_days=30)
+        self.assertEqual(self.kinds("carlo"), {"Milk": "expired", "Ham": "expiring_soon", "Bread": "expired"})
+
+    def test_scan_runs_once_per_day_and_escalates(self):
+        scanner.scan(date(2025, 8, 10))
+        self.assertEqual(scanner.scan(date(2025, 8, 10)), 0)
+        # Two days later the fish has expired: a new event, the old ones stay unique
+        self.assertEqual(scanner.scan(date(2025, 8, 12)), 1)
+        self.assertEqual(len(database.get_notifications("anna")), 2)
+
+    def test_scan_resumes_after_interruption(self):
+        original = database.connection
+        batches = []
+
+        def failing_connection(*args, **kwargs):
+            batches.append(1)
+            if len(batches) == 3:  # state row, first batch, then crash
+                raise RuntimeError("crash")
+            return original(*args, **kwargs)
+
+        database.connection = failing_connection
+        try:
+            with self.assertRaises(RuntimeError):
+                scanner.scan(date(2025, 8, 10), batch_size=1)
+        finally:
+            database.connection = original
+        self.assertEqual(len(database.get_notifications("carlo")), 1)
+        self.assertEqual(scanner.scan(date(2025, 8, 10), batch_size=1), 2)
+
+    def test_mark_read_and_deleted_items(self):
+        scanner.scan(date(2025, 8, 10))
+        database.mark_notifications_read("carlo")
+        self.assertEqual(database.get_notifications("carlo"), [])
+        self.assertEqual(len(database.get_notifications("carlo", unread_only=False)), 2)
+        fish_id = database.get_all_food_items("anna")[0][0]
+        database.delete_food_item(fish_id, "anna")
+        self.assertEqual(database.get_notifications("anna"), [])
+
+    def test_notifications_only_show_own_items(self):
+        fish_id = database.get_all_food_items("anna")[0][0]
+        with database.connection("carlo") as conn:
+            # e.g. left behind by a deleted item whose id now belongs to someone else
+            conn.execute("INSERT INTO notifications (user, item_id, kind, expiration_day, scan_day) "
+                         "VALUES ('carlo', ?, 'expired', 0, 0)", (fish_id,))
+        self.assertEqual(database.get_notifications("carlo"), [])
+
+    def test_scan_uses_expiry_index(self):
+        conn = sqlite3.connect(self.test_db_path)
+        plan = " | ".join(row[3] for row in conn.execute("""
+            EXPLAIN QUERY PLAN SELECT id, user, expiration_day FROM food_items
+            WHERE (expiration_day, id) > (?, ?) AND expiration_day <= ? ORDER BY expiration_day, id LIMIT 10
+        """, (0, 0, 100)))
+        conn.close()
+        self.assertIn("idx_food_items_expiry", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_seconds_until(self):
+        from datetime import datetime
+        self.assertEqual(scanner.seconds_until(6, datetime(2025, 8, 10, 5, 0)), 3600)
+        self.assertEqual(scanner.seconds_until(6, datetime(2025, 8, 10, 6, 0)), 86400)
+
+
+if __name__ == "__main__":
+    unittest.main()
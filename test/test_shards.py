@@ -0,0 +1,113 @@
+import unittest
+import os
+import tempfile
+import zlib
+from datetime import date
+from my_project import scanner
+from my_project.db import database, shards
+
+
+USERS = ["anna", "bob", "carlo", "dora", "emil", "fatima", "gus"]
+
+
+class TestSharding(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (database.db_path, database.create_connection)
+        database.db_path = os.path.join(self.tmp.name, "single.db")
+        database.create_connection = database._default_create_connection
+        self.shard_dir = os.path.join(self.tmp.name, "shards")
+
+        database.initialize_db()
+        for user in USERS:
+            database.add_user(user, "secret")
+            database.insert_food_items([
+                (user, f"{user} item {i}", "Dairy" if i % 2 else "Fruit", "2025-08-01",
+                 "2025-08-05" if i < 2 else "2025-08-12", 1.0, "pcs", 2.0)
+                for i in range(5)])
+        first = database.get_all_food_items("anna")[0][0]
+        database.delete_food_item(first, "anna", reason=database.REASON_WASTED, today=date(2025, 8, 10))
+        scanner.scan(date(2025, 8, 10))
+        self.before = self.snapshot()
+
+    def tearDown(self):
+        database.configure_shards(None)
+        database.close_pool()
+        database.db_path, database.create_connection = self.saved
+        self.tmp.cleanup()
+
+    def snapshot(self):
+        return {
+            "items": {u: sorted(row[2] for row in database.get_all_food_items(u)) for u in USERS},
+            "aggregate": sorted(database.aggregate_food_items(today=date(2025, 8, 10))),
+            "notifications": {u: sorted((n[2], n[3]) for n in database.get_notifications(u)) for u in USERS},
+            "trend": database.get_waste_trend("anna"),
+        }
+
+    def split(self, count, pins=None):
+        database.close_pool()  # the tool runs with the app stopped
+        shard_map = shards.ShardMap(self.shard_dir, count, pins)
+        moved = shards.rebalance(shard_map, sources=[database.db_path])
+        database.configure_shards(self.shard_dir)
+        return moved
+
+    def test_stable_hash(self):
+        self.assertEqual(shards.shard_for("anna", 4), zlib.crc32(b"anna") % 4)
+        self.assertEqual(shards.ShardMap("x", 4, {"anna": 3}).shard_for("anna"), 3)
+        with self.assertRaises(ValueError):
+            shards.ShardMap("x", 2, {"anna": 5})
+
+    def test_split_keeps_every_user_in_one_shard(self):
+        self.assertEqual(self.split(3), len(USERS))
+        self.assertEqual(self.snapshot(), self.before)
+        for user in USERS:
+            shard = database.shard_of(user)
+            for other in range(3):
+                with database.connection(shard=other) as conn:
+                    count = conn.execute("SELECT COUNT(*) FROM food_items WHERE user = ?", (user,)).fetchone()[0]
+                self.assertEqual(count > 0, other == shard)
+        self.assertTrue(database.check_user_credentials("bob", "secret"))
+        with self.assertRaises(ValueError):
+            with database.connection():
+                pass
+
+    def test_writes_and_cross_shard_reads(self):
+        self.split(3)
+        database.insert_food_items([("anna", "Milk", "Dairy", "2025-08-01", "2025-08-20", 1.0, "l", 1.0),
+                                    ("gus", "Eggs", "Dairy", "2025-08-01", "2025-08-20", 6.0, "pcs", 0.3)])
+        self.assertIn("Milk", [row[2] for row in database.get_all_food_items("anna")])
+        exported = list(database.iter_food_items())
+        self.assertEqual(len(exported), sum(len(v) for v in self.before["items"].values()) + 2)
+        self.assertGreater(scanner.scan(date(2025, 8, 19)), 0)
+
+    def test_rebalance_to_fewer_shards(self):
+        self.split(4, pins={"anna": 0})
+        self.assertEqual(database.shard_of("anna"), 0)
+        database.configure_shards(None)  # the tool runs with the app stopped
+        moved = shards.rebalance(shards.ShardMap(self.shard_dir, 2))
+        database.configure_shards(self.shard_dir)
+        self.assertGreater(moved, 0)
+        self.assertFalse(os.path.exists(os.path.join(self.shard_dir, "shard-003.db")))
+        self.assertEqual(self.snapshot(), self.before)
+
+    def test_rows_of_deleted_items_do_not_point_at_other_items(self):
+        notified = database.get_notifications("bob")[0][1]
+        database.delete_food_item(notified, "bob", today=date(2025, 8, 10))
+        self.split(3)
+        for shard in range(3):
+            with database.connection(shard=shard) as conn:
+                stale = conn.execute("""
+                    SELECT COUNT(*) FROM notifications n
+                    LEFT JOIN food_items f ON f.id = n.item_id AND f.user = n.user WHERE f.id IS NULL
+                """).fetchone()[0]
+                foreign = conn.execute("""
+                    SELECT COUNT(*) FROM item_events e JOIN food_items f ON f.id = e.item_id
+                    WHERE f.user != e.user
+                """).fetchone()[0]
+            self.assertEqual((stale, foreign), (0, 0))
+        self.assertEqual([e[0] for e in database.get_item_events("bob")], [0])
+        self.assertEqual(len(database.get_item_events("anna")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
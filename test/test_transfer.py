@@ -0,0 +1,93 @@
+import unittest
+import io
+import os
+import sqlite3
+import tempfile
+from contextlib import redirect_stderr
+from my_project import cli, transfer
+from my_project.db import database
+
+CSV_DATA = """user,name,category,purchase_date,expiration_date,quantity,unit,price_per_unit
+carlo,Milk,Dairy,2025-08-01,2025-08-10,1,L,1.5
+carlo,Eggs,Other,2025-08-01,2025-08-20,6,pcs,0.3
+anna,,Fruit,2025-08-01,2025-08-05,1,kg,2
+anna,Apple,Fruit,2025-08-01,08/05/2025,1,kg,2
+anna,Pear,Fruit,2025-08-01,2025-08-05,-1,kg,2
+"""
+
+
+class TestTransfer(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_transfer.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path)
+
+        self.saved = database.create_connection
+        database.create_connection = test_create_connection
+        database.initialize_db()
+
+    def tearDown(self):
+        database.create_connection = self.saved
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def test_bulk_insert(self):
+        rows = (("carlo", f"item{i}", "Other", "2025-08-01", "2025-08-10", 1.0, "pcs", 1.0) for i in range(500))
+        self.assertEqual(database.insert_food_items(rows), 500)
+        self.assertEqual(len(database.get_all_food_items("carlo")), 500)
+        self.assertEqual(database.get_data_version("carlo"), 1)
+
+    def test_import_csv_rejects_invalid_rows(self):
+        report = transfer.import_items(io.StringIO(CSV_DATA), "csv", batch_size=2)
+        self.assertEqual((report.rows, report.rejected), (2, 3))
+        self.assertEqual([line for line, _ in report.errors], [3, 4, 5])
+        self.assertEqual(len(database.get_all_food_items("carlo")), 2)
+
+    def test_strict_import_aborts(self):
+        with self.assertRaisesRegex(ValueError, "invalid row 3: name is missing"):
+            transfer.import_items(io.StringIO(CSV_DATA), "csv", batch_size=2, strict=True)
+        # Nothing was inserted, not even the valid batch before the first bad row
+        self.assertEqual(database.get_all_food_items("carlo"), [])
+        valid = "".join(CSV_DATA.splitlines(keepends=True)[:3])
+        report = transfer.import_items(io.StringIO(valid), "csv", batch_size=1, strict=True)
+        self.assertEqual(report.rows, 2)
+
+    def test_user_override(self):
+        data = '{"name": "Tea", "purchase_date": "2025-08-01", "expiration_date": "2026-01-01", ' \
+               '"quantity": 1, "unit": "box", "price_per_unit": 3}\n'
+        transfer.import_items(io.StringIO(data), "jsonl", user="anna")
+        self.assertEqual(database.get_all_food_items("anna")[0][2], "Tea")
+
+    def test_round_trip_all_formats(self):
+        transfer.import_items(io.StringIO(CSV_DATA), "csv")
+        expected = [row[1:] for row in database.get_all_food_items("carlo")]
+        for fmt in transfer.FORMATS:
+            out = io.StringIO()
+            self.assertEqual(transfer.export_items(out, fmt, user="carlo").rows, 2)
+            database.delete_food_item(database.get_all_food_items("carlo")[0][0], "carlo")
+            database.delete_food_item(database.get_all_food_items("carlo")[0][0], "carlo")
+            transfer.import_items(io.StringIO(out.getvalue()), fmt)
+            self.assertEqual([row[1:] for row in database.get_all_food_items("carlo")], expected, fmt)
+
+    def test_json_array_is_read_incrementally(self):
+        records = [{"user": "u", "name": f"n{i}"} for i in range(50)]
+        text = "[\n" + ",\n".join(str(r).replace("'", '"') for r in records) + "\n]"
+        self.assertEqual(list(transfer._iter_json_array(io.StringIO(text), chunk_size=7)), records)
+
+    def test_cli_import_and_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src, dst = os.path.join(tmp, "in.csv"), os.path.join(tmp, "out.jsonl")
+            with open(src, "w") as f:
+                f.write(CSV_DATA)
+            with redirect_stderr(io.StringIO()) as err:
+                self.assertEqual(cli.main(["import", src]), 0)
+                self.assertEqual(cli.main(["export", dst, "--user", "carlo"]), 0)
+                self.assertEqual(cli.main(["import", os.path.join(tmp, "in.txt")]), 2)
+            self.assertIn("rows/sec", err.getvalue())
+            with open(dst) as f:
+                self.assertEqual(len(f.readlines()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future
+from my_project.db import database
+
+
+def _insert(user, name):
+    return database.insert_food_item(user, name, "Dairy", "2025-08-01", "2025-08-10", 1.0, "pcs", 1.0)
+
+
+class TestWriteBehind(unittest.TestCase):
+    def setUp(self):
+        self.test_db_path = "test_write_behind.db"
+
+        def test_create_connection():
+            return sqlite3.connect(self.test_db_path, timeout=10)
+
+        self.saved = database.create_connection
+        database.create_connection = test_create_connection
+        database.initialize_db()
+
+    def tearDown(self):
+        database.disable_write_behind()
+        database.create_connection = self.saved
+        if os.path.exists(self.test_db_path):
+            os.remove(self.test_db_path)
+
+    def test_concurrent_writes_share_transactions(self):
+        database.enable_write_behind(batch_window=0.05, max_batch=100)
+        threads = [threading.Thread(target=lambda t=t: [_insert(f"user{t}", f"Item {i}") for i in range(10)])
+                   for t in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        database.flush_write_behind()
+        self.assertEqual(sum(database.count_food_items(f"user{t}") for t in range(8)), 80)
+        stats = database.write_behind_stats()
+        self.assertEqual(stats["writes"], 80)
+        self.assertLess(stats["batches"], 20)
+
+    def test_reads_see_own_queued_writes(self):
+        database.enable_write_behind(batch_window=0.3)
+        future = _insert("carlo", "Milk")
+        self.assertIsInstance(future, Future)
+        self.assertFalse(future.done())
+        items = database.get_all_food_items("carlo")  # waits for carlo's queued write
+        self.assertEqual([row[2] for row in items], ["Milk"])
+        self.assertTrue(database.delete_food_item(items[0][0], "carlo").result())
+        self.assertEqual(database.count_food_items("carlo"), 0)
+
+    def test_disable_commits_queued_writes(self):
+        database.enable_write_behind(batch_window=5.0, max_batch=1000)
+        futures = [_insert("carlo", f"Item {i}") for i in range(5)]
+        database.disable_write_behind()
+        self.assertTrue(all(f.done() for f in futures))
+        conn = sqlite3.connect(self.test_db_path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM food_items").fetchone()[0], 5)
+        conn.close()
+        self.assertIsNone(_insert("carlo", "Sync"))  # back to synchronous writes
+
+    def test_failed_write_is_reported_on_its_future(self):
+        database.enable_write_behind(batch_window=0.01)
+        with self.assertLogs("my_project.db.database", "ERROR"):
+            bad = database.insert_food_item("carlo", None, "Dairy", None, None, 1.0, "pcs", 1.0)
+            good = _insert("carlo", "Milk")
+            # Futures resolve in order, after each one's callbacks: once good is done, bad was logged
+            self.assertIsNone(good.result(timeout=5))
+        self.assertIsInstance(bad.exception(), sqlite3.IntegrityError)
+        self.assertEqual([row[2] for row in database.get_all_food_items("carlo")], ["Milk"])
+
+
+if __name__ == "__main__":
+    unittest.main()